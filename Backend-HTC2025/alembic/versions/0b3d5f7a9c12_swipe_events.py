@@ -0,0 +1,62 @@
+"""Create the partitioned swipe_events log
+
+Revision ID: 0b3d5f7a9c12
+Revises: f1c6a2b8d459
+Create Date: 2026-10-17 17:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "0b3d5f7a9c12"
+down_revision: Union[str, Sequence[str], None] = "f1c6a2b8d459"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create swipe_events with a default partition.
+
+    Monthly partitions are created by the swipe event writer at startup; the
+    default partition catches anything outside them.
+    """
+    swipe_direction_enum = postgresql.ENUM("left", "right", name="swipe_direction")
+    swipe_direction_enum.create(op.get_bind(), checkfirst=True)
+
+    op.create_table(
+        "swipe_events",
+        sa.Column("id", sa.BigInteger(), sa.Identity(), nullable=False),
+        sa.Column("user_id", sa.BigInteger(), nullable=False),
+        sa.Column("opportunity_id", sa.BigInteger(), nullable=False),
+        sa.Column(
+            "direction",
+            postgresql.ENUM(name="swipe_direction", create_type=False),
+            nullable=False,
+        ),
+        sa.Column("swiped_at", sa.DateTime(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("id", "created_at"),
+        postgresql_partition_by="RANGE (created_at)",
+    )
+    op.create_index(
+        "ix_swipe_events_user_id_created_at",
+        "swipe_events",
+        ["user_id", "created_at"],
+    )
+    op.execute("CREATE TABLE swipe_events_default PARTITION OF swipe_events DEFAULT")
+
+
+def downgrade() -> None:
+    """Drop swipe_events and its partitions."""
+    op.drop_table("swipe_events")
+    op.execute("DROP TYPE IF EXISTS swipe_direction")
@@ -0,0 +1,66 @@
+"""Add denormalized opportunity save counts
+
+Revision ID: 1c4e6a8b0d23
+Revises: 0b3d5f7a9c12
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "1c4e6a8b0d23"
+down_revision: Union[str, Sequence[str], None] = "0b3d5f7a9c12"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add save_count, backfill it, and create the counter shards table."""
+    op.add_column(
+        "opportunities",
+        sa.Column("save_count", sa.Integer(), server_default="0", nullable=False),
+    )
+    op.execute(
+        """
+        UPDATE opportunities
+        SET save_count = saves.total
+        FROM (
+            SELECT opportunity_id, count(*) AS total
+            FROM saved_opportunities
+            GROUP BY opportunity_id
+        ) AS saves
+        WHERE opportunities.id = saves.opportunity_id
+        """
+    )
+    op.create_table(
+        "opportunity_save_count_shards",
+        sa.Column("opportunity_id", sa.BigInteger(), nullable=False),
+        sa.Column("shard", sa.SmallInteger(), nullable=False),
+        sa.Column("delta", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("opportunity_id", "shard"),
+    )
+    op.drop_index("ix_opportunities_geohash", table_name="opportunities")
+    op.create_index(
+        "ix_opportunities_geohash",
+        "opportunities",
+        ["geohash"],
+        postgresql_include=["latitude", "longitude", "save_count"],
+    )
+    op.create_index(
+        "ix_opportunities_save_count_id",
+        "opportunities",
+        [sa.text("save_count DESC"), "id"],
+    )
+
+
+def downgrade() -> None:
+    """Drop save counts and restore the plain geohash index."""
+    op.drop_index("ix_opportunities_save_count_id", table_name="opportunities")
+    op.drop_index("ix_opportunities_geohash", table_name="opportunities")
+    op.create_index("ix_opportunities_geohash", "opportunities", ["geohash"])
+    op.drop_table("opportunity_save_count_shards")
+    op.drop_column("opportunities", "save_count")
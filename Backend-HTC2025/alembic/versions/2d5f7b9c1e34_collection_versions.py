@@ -0,0 +1,34 @@
+"""Create collection_versions table
+
+Revision ID: 2d5f7b9c1e34
+Revises: 1c4e6a8b0d23
+Create Date: 2026-10-17 19:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "2d5f7b9c1e34"
+down_revision: Union[str, Sequence[str], None] = "1c4e6a8b0d23"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create the per-user collection version stamps."""
+    op.create_table(
+        "collection_versions",
+        sa.Column("user_id", sa.BigInteger(), nullable=False),
+        sa.Column("collection", sa.String(length=32), nullable=False),
+        sa.Column("version", sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint("user_id", "collection"),
+    )
+
+
+def downgrade() -> None:
+    """Drop collection_versions."""
+    op.drop_table("collection_versions")
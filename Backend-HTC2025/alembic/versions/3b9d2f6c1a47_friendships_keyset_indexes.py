@@ -0,0 +1,53 @@
+"""Composite friendship indexes for keyset-paginated friend lists
+
+Revision ID: 3b9d2f6c1a47
+Revises: 01f90ea05cc1
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3b9d2f6c1a47"
+down_revision: Union[str, Sequence[str], None] = "01f90ea05cc1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Replace single-column friendship indexes with (user, created_at, id)."""
+    op.create_index(
+        "ix_friendships_user_id1_created_at_id",
+        "friendships",
+        ["user_id1", "created_at", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_friendships_user_id2_created_at_id",
+        "friendships",
+        ["user_id2", "created_at", "id"],
+        unique=False,
+    )
+    op.drop_index(op.f("ix_friendships_user_id1"), table_name="friendships")
+    op.drop_index(op.f("ix_friendships_user_id2"), table_name="friendships")
+
+
+def downgrade() -> None:
+    """Restore the single-column friendship indexes."""
+    op.create_index(
+        op.f("ix_friendships_user_id1"),
+        "friendships",
+        ["user_id1"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_friendships_user_id2"),
+        "friendships",
+        ["user_id2"],
+        unique=False,
+    )
+    op.drop_index("ix_friendships_user_id2_created_at_id", table_name="friendships")
+    op.drop_index("ix_friendships_user_id1_created_at_id", table_name="friendships")
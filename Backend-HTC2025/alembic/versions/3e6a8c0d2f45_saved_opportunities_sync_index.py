@@ -0,0 +1,35 @@
+"""Add a covering index for saved opportunities delta sync
+
+Revision ID: 3e6a8c0d2f45
+Revises: 2d5f7b9c1e34
+Create Date: 2026-10-17 20:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3e6a8c0d2f45"
+down_revision: Union[str, Sequence[str], None] = "2d5f7b9c1e34"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Index a user's saves in (created_at, id) order."""
+    op.create_index(
+        "ix_saved_opportunities_user_id_created_at_id",
+        "saved_opportunities",
+        ["user_id", "created_at", "id"],
+        postgresql_include=["opportunity_id"],
+    )
+
+
+def downgrade() -> None:
+    """Drop the delta sync index."""
+    op.drop_index(
+        "ix_saved_opportunities_user_id_created_at_id",
+        table_name="saved_opportunities",
+    )
@@ -0,0 +1,57 @@
+"""Add keyset pagination indexes for savers and pending friend requests
+
+Revision ID: 4f7a9c1e3b56
+Revises: 3e6a8c0d2f45
+Create Date: 2026-10-17 21:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "4f7a9c1e3b56"
+down_revision: Union[str, Sequence[str], None] = "3e6a8c0d2f45"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Index savers and pending requests in (created_at, id) order."""
+    op.create_index(
+        "ix_saved_opportunities_opportunity_id_created_at_id",
+        "saved_opportunities",
+        ["opportunity_id", "created_at", "id"],
+        postgresql_include=["user_id"],
+    )
+    # The composite index leads with opportunity_id, so it covers these lookups.
+    op.drop_index(
+        op.f("ix_saved_opportunities_opportunity_id"),
+        table_name="saved_opportunities",
+    )
+    op.create_index(
+        "ix_friendrequests_pending_receiver_id_created_at_id",
+        "friendrequests",
+        ["receiver_id", "created_at", "id"],
+        postgresql_where=sa.text("status = 'pending'"),
+    )
+
+
+def downgrade() -> None:
+    """Restore the single-column saver index and drop the keyset indexes."""
+    op.drop_index(
+        "ix_friendrequests_pending_receiver_id_created_at_id",
+        table_name="friendrequests",
+    )
+    op.create_index(
+        op.f("ix_saved_opportunities_opportunity_id"),
+        "saved_opportunities",
+        ["opportunity_id"],
+        unique=False,
+    )
+    op.drop_index(
+        "ix_saved_opportunities_opportunity_id_created_at_id",
+        table_name="saved_opportunities",
+    )
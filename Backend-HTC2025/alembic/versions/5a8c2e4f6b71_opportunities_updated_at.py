@@ -0,0 +1,37 @@
+"""Add updated_at to opportunities for incremental cluster reloads
+
+Revision ID: 5a8c2e4f6b71
+Revises: 4f7a9c1e3b56
+Create Date: 2026-10-17 22:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5a8c2e4f6b71"
+down_revision: Union[str, Sequence[str], None] = "4f7a9c1e3b56"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add and index opportunities.updated_at."""
+    op.add_column(
+        "opportunities",
+        sa.Column(
+            "updated_at", sa.DateTime(), server_default=sa.func.now(), nullable=False
+        ),
+    )
+    op.create_index(
+        op.f("ix_opportunities_updated_at"), "opportunities", ["updated_at"]
+    )
+
+
+def downgrade() -> None:
+    """Drop opportunities.updated_at."""
+    op.drop_index(op.f("ix_opportunities_updated_at"), table_name="opportunities")
+    op.drop_column("opportunities", "updated_at")
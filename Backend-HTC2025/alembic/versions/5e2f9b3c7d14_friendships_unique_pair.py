@@ -0,0 +1,40 @@
+"""Unique friendship per user pair
+
+Revision ID: 5e2f9b3c7d14
+Revises: 8c4e1a7d2b90
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5e2f9b3c7d14"
+down_revision: Union[str, Sequence[str], None] = "8c4e1a7d2b90"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Drop duplicate friendships and enforce one row per (user_id1, user_id2)."""
+    op.execute(
+        """
+        DELETE FROM friendships AS newer
+        USING friendships AS older
+        WHERE newer.user_id1 = older.user_id1
+          AND newer.user_id2 = older.user_id2
+          AND newer.id > older.id
+        """
+    )
+    op.create_unique_constraint(
+        "friendships_user_id1_user_id2_key", "friendships", ["user_id1", "user_id2"]
+    )
+
+
+def downgrade() -> None:
+    """Allow duplicate friendships again."""
+    op.drop_constraint(
+        "friendships_user_id1_user_id2_key", "friendships", type_="unique"
+    )
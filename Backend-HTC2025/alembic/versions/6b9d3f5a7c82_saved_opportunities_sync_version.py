@@ -0,0 +1,56 @@
+"""Stamp saved opportunities with a commit-ordered sync version
+
+Revision ID: 6b9d3f5a7c82
+Revises: 5a8c2e4f6b71
+Create Date: 2026-10-17 23:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "6b9d3f5a7c82"
+down_revision: Union[str, Sequence[str], None] = "5a8c2e4f6b71"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add saved_opportunities.sync_version and index delta sync on it."""
+    # Existing saves predate every version a new save can get, so 0 keeps
+    # them first; the default is dropped so writers must stamp new rows.
+    op.add_column(
+        "saved_opportunities",
+        sa.Column(
+            "sync_version", sa.BigInteger(), server_default="0", nullable=False
+        ),
+    )
+    op.alter_column("saved_opportunities", "sync_version", server_default=None)
+    op.create_index(
+        "ix_saved_opportunities_user_id_sync_version_id",
+        "saved_opportunities",
+        ["user_id", "sync_version", "id"],
+        postgresql_include=["opportunity_id"],
+    )
+    op.drop_index(
+        "ix_saved_opportunities_user_id_created_at_id",
+        table_name="saved_opportunities",
+    )
+
+
+def downgrade() -> None:
+    """Restore the (created_at, id) sync index and drop sync_version."""
+    op.create_index(
+        "ix_saved_opportunities_user_id_created_at_id",
+        "saved_opportunities",
+        ["user_id", "created_at", "id"],
+        postgresql_include=["opportunity_id"],
+    )
+    op.drop_index(
+        "ix_saved_opportunities_user_id_sync_version_id",
+        table_name="saved_opportunities",
+    )
+    op.drop_column("saved_opportunities", "sync_version")
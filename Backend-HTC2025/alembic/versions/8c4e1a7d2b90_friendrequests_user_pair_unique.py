@@ -0,0 +1,39 @@
+"""Unique friend request per user pair in either direction
+
+Revision ID: 8c4e1a7d2b90
+Revises: 3b9d2f6c1a47
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8c4e1a7d2b90"
+down_revision: Union[str, Sequence[str], None] = "3b9d2f6c1a47"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Drop crossed duplicate requests and enforce one request per pair."""
+    op.execute(
+        """
+        DELETE FROM friendrequests AS newer
+        USING friendrequests AS older
+        WHERE newer.sender_id = older.receiver_id
+          AND newer.receiver_id = older.sender_id
+          AND newer.id > older.id
+        """
+    )
+    op.execute(
+        "CREATE UNIQUE INDEX ux_friendrequests_user_pair ON friendrequests "
+        "(LEAST(sender_id, receiver_id), GREATEST(sender_id, receiver_id))"
+    )
+
+
+def downgrade() -> None:
+    """Drop the direction-independent unique index."""
+    op.drop_index("ux_friendrequests_user_pair", table_name="friendrequests")
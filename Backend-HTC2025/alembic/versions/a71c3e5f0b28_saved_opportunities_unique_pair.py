@@ -0,0 +1,53 @@
+"""Unique saved opportunity per user
+
+Revision ID: a71c3e5f0b28
+Revises: 5e2f9b3c7d14
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a71c3e5f0b28"
+down_revision: Union[str, Sequence[str], None] = "5e2f9b3c7d14"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Drop duplicate saves and enforce one row per (user_id, opportunity_id)."""
+    op.execute(
+        """
+        DELETE FROM saved_opportunities AS newer
+        USING saved_opportunities AS older
+        WHERE newer.user_id = older.user_id
+          AND newer.opportunity_id = older.opportunity_id
+          AND newer.id > older.id
+        """
+    )
+    op.create_unique_constraint(
+        "saved_opportunities_user_id_opportunity_id_key",
+        "saved_opportunities",
+        ["user_id", "opportunity_id"],
+    )
+    op.drop_index(
+        op.f("ix_saved_opportunities_user_id"), table_name="saved_opportunities"
+    )
+
+
+def downgrade() -> None:
+    """Restore the user_id index and allow duplicate saves again."""
+    op.create_index(
+        op.f("ix_saved_opportunities_user_id"),
+        "saved_opportunities",
+        ["user_id"],
+        unique=False,
+    )
+    op.drop_constraint(
+        "saved_opportunities_user_id_opportunity_id_key",
+        "saved_opportunities",
+        type_="unique",
+    )
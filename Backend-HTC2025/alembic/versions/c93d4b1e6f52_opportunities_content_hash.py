@@ -0,0 +1,30 @@
+"""Add content hash to opportunities for ingestion
+
+Revision ID: c93d4b1e6f52
+Revises: a71c3e5f0b28
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c93d4b1e6f52"
+down_revision: Union[str, Sequence[str], None] = "a71c3e5f0b28"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add opportunities.content_hash."""
+    op.add_column(
+        "opportunities", sa.Column("content_hash", sa.LargeBinary(), nullable=True)
+    )
+
+
+def downgrade() -> None:
+    """Drop opportunities.content_hash."""
+    op.drop_column("opportunities", "content_hash")
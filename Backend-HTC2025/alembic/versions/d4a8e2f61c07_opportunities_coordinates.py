@@ -0,0 +1,42 @@
+"""Add coordinates and geohash index to opportunities
+
+Revision ID: d4a8e2f61c07
+Revises: c93d4b1e6f52
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d4a8e2f61c07"
+down_revision: Union[str, Sequence[str], None] = "c93d4b1e6f52"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add latitude, longitude and an indexed geohash to opportunities."""
+    op.add_column("opportunities", sa.Column("latitude", sa.Float(), nullable=True))
+    op.add_column("opportunities", sa.Column("longitude", sa.Float(), nullable=True))
+    op.add_column(
+        "opportunities",
+        sa.Column("geohash", sa.String(length=12, collation="C"), nullable=True),
+    )
+    op.create_index(
+        op.f("ix_opportunities_geohash"),
+        "opportunities",
+        ["geohash"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Drop the coordinate columns."""
+    op.drop_index(op.f("ix_opportunities_geohash"), table_name="opportunities")
+    op.drop_column("opportunities", "geohash")
+    op.drop_column("opportunities", "longitude")
+    op.drop_column("opportunities", "latitude")
@@ -0,0 +1,54 @@
+"""Add full-text search vector to opportunities
+
+Revision ID: e5b7c9d3a218
+Revises: d4a8e2f61c07
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "e5b7c9d3a218"
+down_revision: Union[str, Sequence[str], None] = "d4a8e2f61c07"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add a generated, GIN-indexed tsvector over title/organization/description."""
+    op.add_column(
+        "opportunities",
+        sa.Column(
+            "search_vector",
+            postgresql.TSVECTOR(),
+            sa.Computed(
+                "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+                "setweight(to_tsvector('english', coalesce(organization, '')), 'B') || "
+                "setweight(to_tsvector('english', coalesce(description, '')), 'C')",
+                persisted=True,
+            ),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        "ix_opportunities_search_vector",
+        "opportunities",
+        ["search_vector"],
+        unique=False,
+        postgresql_using="gin",
+    )
+
+
+def downgrade() -> None:
+    """Drop the search vector."""
+    op.drop_index(
+        "ix_opportunities_search_vector",
+        table_name="opportunities",
+        postgresql_using="gin",
+    )
+    op.drop_column("opportunities", "search_vector")
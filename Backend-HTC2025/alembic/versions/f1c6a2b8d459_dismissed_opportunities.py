@@ -0,0 +1,41 @@
+"""Create dismissed_opportunities table
+
+Revision ID: f1c6a2b8d459
+Revises: e5b7c9d3a218
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f1c6a2b8d459"
+down_revision: Union[str, Sequence[str], None] = "e5b7c9d3a218"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create the table of swiped-left opportunities."""
+    op.create_table(
+        "dismissed_opportunities",
+        sa.Column("id", sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column("user_id", sa.BigInteger(), nullable=False),
+        sa.Column("opportunity_id", sa.BigInteger(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("user_id", "opportunity_id"),
+    )
+
+
+def downgrade() -> None:
+    """Drop dismissed_opportunities."""
+    op.drop_table("dismissed_opportunities")
@@ -1,4 +1,6 @@
 import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
@@ -6,7 +8,20 @@ from fastapi.responses import JSONResponse
 from fastapi.requests import Request
 
 from app.config import Environment, settings
+from app.database.postgres import (
+    ReadYourWritesMiddleware,
+    connection_hold_metrics,
+    read_your_writes,
+)
+from app.integrations.firebase import get_firebase_public_key_store
+from app.integrations.volunteerconnector import get_volunteer_connector_client
 from app.routes import auth_router, friends_router, opportunity_router
+from app.services.auth import get_verified_claims_cache
+from app.services.clusters import get_cluster_index_refresher
+from app.services.counters import get_save_count_merger
+from app.services.ingestion import get_opportunity_ingestion_worker
+from app.services.opportunity_search import get_opportunity_search_cache
+from app.services.swipes import get_swipe_event_writer
 
 logger = logging.getLogger(__name__)
 
@@ -64,6 +79,38 @@ def configure_logging() -> None:
 configure_logging()
 
 
+@asynccontextmanager
+async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    """Start and stop background workers tied to the application lifetime.
+
+    Loads the Firebase token signing keys before the first request is served
+    and keeps them refreshed in the background, builds the marker cluster
+    index in the background and reloads changed rows into it, runs the
+    opportunity ingestion worker when enabled (an advisory lock lets only one
+    process crawl at a time), the swipe event writer and the save counter
+    merger, and closes the pooled upstream HTTP client on shutdown after
+    draining buffered swipes.
+    """
+    key_store = get_firebase_public_key_store()
+    await key_store.start()
+    cluster_refresher = get_cluster_index_refresher()
+    cluster_refresher.start()
+    swipe_writer = get_swipe_event_writer()
+    swipe_writer.start()
+    get_save_count_merger().start()
+    if settings.ingestion_enabled:
+        get_opportunity_ingestion_worker().start()
+    try:
+        yield
+    finally:
+        await cluster_refresher.stop()
+        await swipe_writer.stop()
+        await get_save_count_merger().stop()
+        await get_opportunity_ingestion_worker().stop()
+        await key_store.stop()
+        await get_volunteer_connector_client().aclose()
+
+
 def create_application() -> FastAPI:
     """Create and configure FastAPI application.
 
@@ -79,6 +126,7 @@ def create_application() -> FastAPI:
         debug=settings.environment == Environment.DEVELOPMENT,
         version="0.0.1",
         description="Voluntr API main backend",
+        lifespan=lifespan,
     )
 
     app.add_middleware(
@@ -88,12 +136,28 @@ def create_application() -> FastAPI:
         allow_methods=["*"],
         allow_headers=["*"],
     )
+    app.add_middleware(ReadYourWritesMiddleware, guard=read_your_writes)
 
     def health_check():
         return {"status": "ok"}
 
+    def health_metrics():
+        return {
+            "auth_claims_cache": get_verified_claims_cache().stats(),
+            "db_connection_hold": connection_hold_metrics.snapshot(),
+            "opportunity_search_cache": get_opportunity_search_cache().stats(),
+            "opportunity_ingestion": (
+                stats.as_dict()
+                if (stats := get_opportunity_ingestion_worker().last_stats)
+                else None
+            ),
+            "swipe_events": get_swipe_event_writer().stats(),
+            "save_counts_merged": get_save_count_merger().merged,
+        }
+
     _configure_exception_handlers(app)
     app.get("/health", tags=["Health"])(health_check)
+    app.get("/health/metrics", tags=["Health"])(health_metrics)
     app.include_router(auth_router)
     app.include_router(friends_router)
     app.include_router(opportunity_router)
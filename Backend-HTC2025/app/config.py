@@ -29,10 +29,85 @@ class Settings(BaseSettings):
     sqlalchemy_echo: bool = False
     postgres_pool_size: int = 5
     postgres_max_overflow: int = 10
+    database_replica_urls: list[str] = Field(
+        default_factory=list,
+        description="Optional read-replica URLs; read-only queries are spread across them.",
+    )
+    read_your_writes_window_seconds: float = 5.0
     firebase_service_account_json: str = Field(
         ...,
         description="Raw Firebase service account JSON used to initialize firebase_admin.",
     )
+    firebase_public_keys_url: str = Field(
+        default="https://www.googleapis.com/robot/v1/metadata/x509/securetoken@system.gserviceaccount.com",
+        description="Endpoint serving the x509 certificates that sign Firebase ID tokens.",
+    )
+    firebase_public_keys_refresh_margin_seconds: int = 300
+    firebase_public_keys_retry_seconds: int = 30
+    firebase_verify_max_workers: int = 4
+    auth_claims_cache_size: int = Field(
+        default=4096,
+        description="Max verified Firebase ID tokens whose claims are cached per worker.",
+    )
+    user_identity_cache_size: int = 10000
+    user_identity_cache_ttl_seconds: int = 60
+    session_token_secret: str | None = Field(
+        default=None,
+        description="HMAC key for backend session tokens; session mode is off when unset.",
+    )
+    session_token_ttl_seconds: int = 900
+    pagination_cursor_secret: str | None = Field(
+        default=None,
+        description="HMAC key for pagination cursors; derived from the Firebase credentials when unset.",
+    )
+    volunteer_connector_search_url: str = (
+        "https://www.volunteerconnector.org/api/search/"
+    )
+    volunteer_connector_max_concurrency: int = 8
+    volunteer_connector_timeout_seconds: float = 10.0
+    opportunity_search_cache_size: int = 1024
+    opportunity_search_cache_ttl_seconds: int = 300
+    opportunity_search_stale_seconds: int = Field(
+        default=1800,
+        description="How long past its TTL a search result may be served while refreshing.",
+    )
+    ingestion_enabled: bool = False
+    ingestion_postal_codes: list[str] = Field(
+        default_factory=list,
+        description="Postal codes whose surroundings the ingestion worker mirrors.",
+    )
+    ingestion_distance_km: int = 50
+    ingestion_interval_seconds: int = 3600
+    cluster_max_zoom: int = 14
+    cluster_max_cells: int = 1024
+    cluster_refresh_interval_seconds: int = Field(
+        default=60,
+        description="How often each worker reloads changed opportunities into its cluster index.",
+    )
+    deck_chunk_size: int = 200
+    deck_cache_size: int = 10000
+    deck_cache_ttl_seconds: int = 900
+    swipe_buffer_capacity: int = 10000
+    swipe_flush_batch_size: int = 500
+    swipe_flush_interval_ms: int = 200
+    swipe_enqueue_timeout_seconds: float = Field(
+        default=1.0,
+        description="How long a swipe request waits for buffer room before a 503.",
+    )
+    swipe_drain_timeout_seconds: float = 10.0
+    swipe_flush_max_attempts: int = Field(
+        default=3,
+        description="Failed writes of a swipe batch before it is split, down to dropping single events.",
+    )
+    save_count_shards: int = Field(
+        default=8,
+        description="Counter rows per opportunity that concurrent saves are spread over.",
+    )
+    save_count_merge_interval_seconds: int = 30
+    stream_batch_size: int = Field(
+        default=500,
+        description="Rows fetched per server-side cursor round trip for NDJSON lists.",
+    )
 
     class Config:
         env_file = ".env"
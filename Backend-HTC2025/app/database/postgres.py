@@ -1,23 +1,201 @@
 """PostgreSQL engine + session dependency for FastAPI."""
 
-from collections.abc import AsyncIterator
+import base64
+import hashlib
+import hmac
+import itertools
+import math
+import time
+from collections import defaultdict
+from collections.abc import AsyncGenerator, AsyncIterator, Iterable, Sequence
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from http.cookies import SimpleCookie
+from typing import Any
 
+from fastapi import Request
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from sqlalchemy import Executable, event
+from sqlalchemy.engine import Connection
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
+from sqlalchemy.orm import Session, SessionTransaction
 
-from app.config import settings
+from app.config import Environment, settings
 import logging
 
 logger = logging.getLogger(__name__)
 
+_ROUTE_KEY = "route"
+_HOLD_STARTED_KEY = "connection_hold_started"
 
-def _build_async_engine() -> AsyncEngine:
+# User ids the current request wrote for; set by ReadYourWritesMiddleware.
+_marked_user_ids: ContextVar[set[int] | None] = ContextVar(
+    "read_your_writes_marked", default=None
+)
+
+
+class ConnectionHoldMetrics:
+    """Aggregate how long each route keeps a pooled connection checked out."""
+
+    def __init__(self) -> None:
+        self._holds: dict[str, list[float]] = defaultdict(lambda: [0, 0.0, 0.0])
+
+    def record(self, route: str, seconds: float) -> None:
+        stats = self._holds[route]
+        stats[0] += 1
+        stats[1] += seconds
+        stats[2] = max(stats[2], seconds)
+
+    def snapshot(self) -> dict[str, dict[str, float]]:
+        return {
+            route: {
+                "checkouts": count,
+                "avg_hold_ms": total / count * 1000,
+                "max_hold_ms": longest * 1000,
+            }
+            for route, (count, total, longest) in self._holds.items()
+        }
+
+
+connection_hold_metrics = ConnectionHoldMetrics()
+
+
+class _PostgresSession(Session):
+    """Sync session class backing our AsyncSessions, scoped for event hooks."""
+
+
+@event.listens_for(_PostgresSession, "after_begin")
+def _mark_connection_checkout(
+    session: Session, _transaction: SessionTransaction, _connection: Connection
+) -> None:
+    session.info.setdefault(_HOLD_STARTED_KEY, time.perf_counter())
+
+
+@event.listens_for(_PostgresSession, "after_transaction_end")
+def _record_connection_release(
+    session: Session, transaction: SessionTransaction
+) -> None:
+    if transaction.parent is not None:
+        return
+
+    started = session.info.pop(_HOLD_STARTED_KEY, None)
+    if started is not None:
+        connection_hold_metrics.record(
+            session.info.get(_ROUTE_KEY, "unknown"), time.perf_counter() - started
+        )
+
+
+class ReadYourWritesGuard:
+    """Pin a user's reads to the primary for a short window after they write.
+
+    Replicas lag the primary slightly, so without this a user who just saved
+    an opportunity or accepted a friend could read a list without it. Their
+    next read may land on any worker, so the window travels with the client:
+    ``ReadYourWritesMiddleware`` answers a request that wrote with a short-lived
+    signed cookie naming the users it wrote for, and ``requires_primary``
+    honours that cookie wherever the read is served.
+    """
+
+    cookie_name = "rw_primary"
+
+    def __init__(self, window_seconds: float, secret: str) -> None:
+        self._window_seconds = window_seconds
+        self._key = hmac.new(
+            b"read-your-writes", secret.encode(), hashlib.sha256
+        ).digest()
+
+    def mark_write(self, *user_ids: int) -> None:
+        """Pin user_ids to the primary for the rest of the current request's window.
+
+        A no-op outside a request handled by ``ReadYourWritesMiddleware``.
+        """
+
+        marked = _marked_user_ids.get()
+        if marked is not None:
+            marked.update(user_ids)
+
+    def requires_primary(self, request: Request, user_id: int) -> bool:
+        cookie = request.cookies.get(self.cookie_name)
+        if not cookie:
+            return False
+
+        body, _, signature = cookie.rpartition(".")
+        if not hmac.compare_digest(signature, self._sign(body)):
+            return False
+        expires, *user_ids = body.split("-")
+        try:
+            return time.time() < int(expires) and str(user_id) in user_ids
+        except ValueError:
+            return False
+
+    def cookie_header(self, user_ids: Iterable[int]) -> str:
+        """Return the Set-Cookie value pinning user_ids for the window."""
+
+        expires = math.ceil(time.time() + self._window_seconds)
+        body = "-".join([str(expires), *map(str, sorted(user_ids))])
+        cookie = SimpleCookie()
+        cookie[self.cookie_name] = f"{body}.{self._sign(body)}"
+        morsel = cookie[self.cookie_name]
+        morsel["max-age"] = math.ceil(self._window_seconds)
+        morsel["path"] = "/"
+        morsel["httponly"] = True
+        # The frontend is served from another site outside development.
+        if settings.environment == Environment.DEVELOPMENT:
+            morsel["samesite"] = "Lax"
+        else:
+            morsel["samesite"] = "None"
+            morsel["secure"] = True
+        return morsel.OutputString()
+
+    def _sign(self, body: str) -> str:
+        digest = hmac.new(self._key, body.encode(), hashlib.sha256).digest()
+        return base64.urlsafe_b64encode(digest[:16]).rstrip(b"=").decode("ascii")
+
+
+class ReadYourWritesMiddleware:
+    """Collect ``mark_write`` calls per request and set the guard's cookie."""
+
+    def __init__(self, app: ASGIApp, guard: ReadYourWritesGuard) -> None:
+        self.app = app
+        self.guard = guard
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        marked: set[int] = set()
+        token = _marked_user_ids.set(marked)
+
+        async def send_with_cookie(message: Message) -> None:
+            if message["type"] == "http.response.start" and marked:
+                MutableHeaders(scope=message).append(
+                    "set-cookie", self.guard.cookie_header(marked)
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_cookie)
+        finally:
+            _marked_user_ids.reset(token)
+
+
+# Every worker must share the key; derive it from the (required) Firebase
+# credentials rather than a per-process key.
+read_your_writes = ReadYourWritesGuard(
+    settings.read_your_writes_window_seconds, settings.firebase_service_account_json
+)
+
+
+def _build_async_engine(database_url: str) -> AsyncEngine:
     return create_async_engine(
-        settings.database_url.replace("postgresql://", "postgresql+asyncpg://"),
+        database_url.replace("postgresql://", "postgresql+asyncpg://"),
         echo=settings.sqlalchemy_echo,
         pool_pre_ping=True,
         pool_size=settings.postgres_pool_size,
@@ -25,18 +203,45 @@ def _build_async_engine() -> AsyncEngine:
     )
 
 
-engine: AsyncEngine = _build_async_engine()
-async_session_factory: async_sessionmaker[AsyncSession] = async_sessionmaker(
-    bind=engine,
-    expire_on_commit=False,
-    autoflush=False,
+def _build_session_factory(bind: AsyncEngine) -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(
+        bind=bind,
+        expire_on_commit=False,
+        autoflush=False,
+        sync_session_class=_PostgresSession,
+    )
+
+
+engine: AsyncEngine = _build_async_engine(settings.database_url)
+async_session_factory: async_sessionmaker[AsyncSession] = _build_session_factory(
+    engine
 )
 
+replica_engines: list[AsyncEngine] = [
+    _build_async_engine(url) for url in settings.database_replica_urls
+]
+_replica_session_factories = itertools.cycle(
+    [_build_session_factory(replica) for replica in replica_engines]
+)
+
+
+def has_read_replicas() -> bool:
+    return bool(replica_engines)
+
 
-async def get_postgres_session() -> AsyncIterator[AsyncSession]:
-    """Yield a scoped async session for FastAPI dependencies."""
+def _route_label(request: Request) -> str:
+    route: Any = request.scope.get("route")
+    path = getattr(route, "path", request.url.path)
+    return f"{request.method} {path}"
 
-    session = async_session_factory()
+
+@asynccontextmanager
+async def session_scope(
+    factory: async_sessionmaker[AsyncSession], request: Request
+) -> AsyncIterator[AsyncSession]:
+    """Open a session for a request, rolling back on errors and always closing it."""
+
+    session = factory(info={_ROUTE_KEY: _route_label(request)})
     logger.debug("Postgres session created.")
 
     try:
@@ -52,6 +257,71 @@ async def get_postgres_session() -> AsyncIterator[AsyncSession]:
         logger.debug("Postgres session closed.")
 
 
+async def get_postgres_session(request: Request) -> AsyncIterator[AsyncSession]:
+    """Yield a scoped async session for FastAPI dependencies.
+
+    Creating the session is free: a pooled connection is only checked out when
+    the first statement runs, and it goes back to the pool as soon as the
+    transaction ends (commit, rollback or ``release_connection``), not when the
+    dependency is torn down after the response has been serialized.
+    """
+
+    async with session_scope(async_session_factory, request) as session:
+        yield session
+
+
+def replica_session_factory() -> async_sessionmaker[AsyncSession]:
+    """Return the next read replica's session factory (round-robin).
+
+    Only use it for read-only queries; callers decide when a replica is
+    acceptable (see ``read_your_writes``). Falls back to the primary when no
+    replicas are configured.
+    """
+
+    if not has_read_replicas():
+        return async_session_factory
+    return next(_replica_session_factories)
+
+
+async def release_connection(session: AsyncSession) -> None:
+    """Return the session's connection to the pool once a read path is done.
+
+    Ends the open transaction with a COMMIT. Loaded objects stay attached and
+    are not expired (``expire_on_commit=False``), so callers can keep using them
+    and the session transparently checks out a connection again if needed.
+    """
+
+    if session.in_transaction():
+        await session.commit()
+
+
+async def stream_scalar_partitions(
+    session: AsyncSession, stmt: Executable, size: int
+) -> AsyncGenerator[Sequence[Any], None]:
+    """Yield stmt's scalars in lists of up to size rows from a server-side cursor.
+
+    Only one partition is held in memory at a time, so callers can emit rows
+    as they arrive however many the query matches. The connection goes back
+    to the pool once the cursor is exhausted or the consumer stops early.
+    """
+
+    result = await session.stream_scalars(stmt.execution_options(yield_per=size))
+    try:
+        async for partition in result.partitions():
+            yield partition
+    finally:
+        await result.close()
+        await release_connection(session)
+
+
 __all__ = [
+    "ReadYourWritesMiddleware",
+    "connection_hold_metrics",
     "get_postgres_session",
+    "has_read_replicas",
+    "read_your_writes",
+    "release_connection",
+    "replica_session_factory",
+    "session_scope",
+    "stream_scalar_partitions",
 ]
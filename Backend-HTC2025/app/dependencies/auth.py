@@ -10,11 +10,15 @@ from app.integrations.firebase import FirebaseAuthClient
 from app.models.user import User
 from app.services.auth import (
     AuthService,
+    AuthUnavailableError,
     InvalidCredentialsError,
+    InvalidSessionError,
     MissingEmailClaimError,
     UserNotFoundError,
+    get_verified_claims_cache,
 )
-from app.services.users import UserLookupService
+from app.services.session_tokens import get_session_token_signer
+from app.services.users import UserIdentity, UserLookupService
 
 BEARER_PREFIX = "Bearer "
 
@@ -30,14 +34,16 @@ def get_auth_service(
         session=session,
         firebase_auth=firebase_auth,
         user_lookup=user_lookup,
+        claims_cache=get_verified_claims_cache(),
+        session_tokens=get_session_token_signer(),
     )
 
 
-async def get_current_user(
+async def get_current_identity(
     authorization: str | None = Header(default=None, alias="Authorization"),
     auth_service: AuthService = Depends(get_auth_service),
-) -> User:
-    """Resolve and return the current user from a Firebase bearer token."""
+) -> UserIdentity:
+    """Resolve the caller's identity from a Firebase or session bearer token."""
 
     if not authorization:
         raise HTTPException(
@@ -59,7 +65,12 @@ async def get_current_user(
         )
 
     try:
-        user = await auth_service.sign_in(token=token)
+        identity = await auth_service.authenticate(token=token)
+    except InvalidSessionError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=str(exc),
+        ) from exc
     except InvalidCredentialsError as exc:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -75,14 +86,30 @@ async def get_current_user(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User account not found.",
         ) from exc
+    except AuthUnavailableError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(exc),
+        ) from exc
 
-    if not user.is_active:
+    if not identity.is_active:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="User account is inactive.",
         )
 
-    return user
+    return identity
+
+
+async def get_current_user(
+    identity: UserIdentity = Depends(get_current_identity),
+) -> User:
+    """Return the current user as a transient User built from its identity.
+
+    The object is not attached to a session; services only read its columns.
+    """
+
+    return identity.to_user()
 
 
-__all__ = ["get_current_user", "get_auth_service"]
+__all__ = ["get_current_identity", "get_current_user", "get_auth_service"]
@@ -0,0 +1,41 @@
+"""FastAPI dependencies for choosing a database session."""
+
+from collections.abc import AsyncIterator
+
+from fastapi import Depends, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.postgres import (
+    get_postgres_session,
+    has_read_replicas,
+    read_your_writes,
+    replica_session_factory,
+    session_scope,
+)
+from app.dependencies.auth import get_current_identity
+from app.services.users import UserIdentity
+
+
+async def get_read_session(
+    request: Request,
+    identity: UserIdentity = Depends(get_current_identity),
+    primary_session: AsyncSession = Depends(get_postgres_session),
+) -> AsyncIterator[AsyncSession]:
+    """Yield a session for read-only queries made on behalf of the caller.
+
+    Uses a read replica unless none is configured or the caller wrote
+    recently (the read-your-writes cookie is still valid), in which case the
+    request's primary session is reused.
+    """
+
+    if not has_read_replicas() or read_your_writes.requires_primary(
+        request, identity.id
+    ):
+        yield primary_session
+        return
+
+    async with session_scope(replica_session_factory(), request) as session:
+        yield session
+
+
+__all__ = ["get_read_session"]
@@ -4,15 +4,46 @@ from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database.postgres import get_postgres_session
+from app.dependencies.database import get_read_session
+from app.integrations.volunteerconnector import get_volunteer_connector_client
+from app.config import settings
+from app.services.deck import SwipeDeckService, get_deck_cache
 from app.services.opportunity import OpportunityService
+from app.services.opportunity_search import (
+    OpportunitySearchService,
+    get_opportunity_search_cache,
+)
 
 
 def opportunity_service_dependency(
     session: AsyncSession = Depends(get_postgres_session),
+    read_session: AsyncSession = Depends(get_read_session),
 ) -> OpportunityService:
     """Provide an OpportunityService backed by a DB session."""
 
-    return OpportunityService(session=session)
+    return OpportunityService(session=session, read_session=read_session)
 
 
-__all__ = ["opportunity_service_dependency"]
+def opportunity_search_service_dependency() -> OpportunitySearchService:
+    """Provide the cached volunteerconnector search service."""
+
+    return OpportunitySearchService(
+        get_volunteer_connector_client(), get_opportunity_search_cache()
+    )
+
+
+def swipe_deck_service_dependency(
+    read_session: AsyncSession = Depends(get_read_session),
+) -> SwipeDeckService:
+    """Provide the swipe deck service backed by the read session."""
+
+    return SwipeDeckService(
+        read_session, get_deck_cache(), chunk_size=settings.deck_chunk_size
+    )
+
+
+__all__ = [
+    "opportunity_search_service_dependency",
+    "opportunity_service_dependency",
+    "swipe_deck_service_dependency",
+]
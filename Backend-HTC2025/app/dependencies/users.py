@@ -4,7 +4,7 @@ from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database.postgres import get_postgres_session
-from app.services.users import UserLookupService
+from app.services.users import UserLookupService, get_user_identity_cache
 
 
 def user_lookup_service_dependency(
@@ -12,7 +12,9 @@ def user_lookup_service_dependency(
 ) -> UserLookupService:
     """Provide a UserLookupService instance backed by a DB session."""
 
-    return UserLookupService(session=session)
+    return UserLookupService(
+        session=session, identity_cache=get_user_identity_cache()
+    )
 
 
 __all__ = ["user_lookup_service_dependency"]
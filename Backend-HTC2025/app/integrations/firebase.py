@@ -2,23 +2,42 @@
 
 from __future__ import annotations
 
+import asyncio
+import contextlib
 import json
 import logging
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
 from functools import lru_cache
 from typing import Any
 
 import firebase_admin
+import requests
 from firebase_admin import auth, credentials
+from google.auth import jwt
 
 from app.config import settings
 
 logger = logging.getLogger(__name__)
 
+ID_TOKEN_ISSUER_PREFIX = "https://securetoken.google.com/"
+_MAX_AGE_PATTERN = re.compile(r"max-age=(\d+)")
+_DEFAULT_KEYS_MAX_AGE_SECONDS = 3600
+
 
 class FirebaseInitializationError(RuntimeError):
     """Raised when Firebase Admin cannot be initialized."""
 
 
+class FirebasePublicKeysUnavailableError(RuntimeError):
+    """Raised when no Firebase signing keys have been loaded yet."""
+
+
+class FirebaseTokenVerificationError(ValueError):
+    """Raised when a Firebase ID token fails local verification."""
+
+
 def _load_service_account() -> dict[str, Any]:
     """Parse the raw JSON payload into a Python dict."""
 
@@ -50,11 +69,162 @@ def get_firebase_app() -> firebase_admin.App:
         return app
 
 
+@lru_cache(maxsize=1)
+def get_firebase_executor() -> ThreadPoolExecutor:
+    """Return the bounded thread pool used for blocking Firebase work."""
+
+    return ThreadPoolExecutor(
+        max_workers=settings.firebase_verify_max_workers,
+        thread_name_prefix="firebase-auth",
+    )
+
+
+class FirebasePublicKeyStore:
+    """Keeps the Google certificates that sign Firebase ID tokens in memory.
+
+    Keys are fetched once at startup and refreshed by a background task shortly
+    before their Cache-Control max-age runs out, so request handlers only ever
+    read the in-memory copy and never wait on a download.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        *,
+        executor: ThreadPoolExecutor,
+        refresh_margin_seconds: int,
+        retry_seconds: int,
+    ) -> None:
+        self._url = url
+        self._executor = executor
+        self._refresh_margin_seconds = refresh_margin_seconds
+        self._retry_seconds = retry_seconds
+        self._certs: dict[str, str] = {}
+        self._expires_at = 0.0
+        self._refresh_task: asyncio.Task[None] | None = None
+        self._pending_refresh: asyncio.Task[None] | None = None
+
+    @property
+    def certs(self) -> dict[str, str]:
+        """Return the currently loaded key id -> PEM certificate mapping."""
+
+        if not self._certs:
+            raise FirebasePublicKeysUnavailableError(
+                "Firebase public keys have not been loaded yet."
+            )
+        return self._certs
+
+    async def start(self) -> None:
+        """Load the keys and schedule background refreshes."""
+
+        try:
+            await self.refresh()
+        except Exception:
+            logger.error("Initial Firebase public key fetch failed.", exc_info=True)
+        if self._refresh_task is None:
+            self._refresh_task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self) -> None:
+        """Cancel the background refresh tasks and wait for them to finish."""
+
+        tasks = [
+            task
+            for task in (self._refresh_task, self._pending_refresh)
+            if task is not None
+        ]
+        self._refresh_task = None
+        self._pending_refresh = None
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+
+    async def refresh(self) -> None:
+        """Download the current keys on the Firebase thread pool."""
+
+        loop = asyncio.get_running_loop()
+        certs, max_age = await loop.run_in_executor(self._executor, self._fetch)
+        self._certs = certs
+        self._expires_at = time.time() + max_age
+        logger.info("Loaded %d Firebase public keys (max-age %ds).", len(certs), max_age)
+
+    def request_refresh(self) -> None:
+        """Schedule an out-of-band refresh, e.g. after seeing an unknown key id."""
+
+        if self._pending_refresh is None or self._pending_refresh.done():
+            self._pending_refresh = asyncio.create_task(self._refresh_quietly())
+
+    async def _refresh_quietly(self) -> None:
+        try:
+            await self.refresh()
+        except Exception:
+            logger.warning("Firebase public key refresh failed.", exc_info=True)
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            if self._certs:
+                delay = self._expires_at - self._refresh_margin_seconds - time.time()
+                delay = max(delay, self._retry_seconds)
+            else:
+                delay = self._retry_seconds
+            await asyncio.sleep(delay)
+            await self._refresh_quietly()
+
+    def _fetch(self) -> tuple[dict[str, str], int]:
+        response = requests.get(self._url, timeout=10)
+        response.raise_for_status()
+
+        match = _MAX_AGE_PATTERN.search(response.headers.get("Cache-Control", ""))
+        max_age = int(match.group(1)) if match else _DEFAULT_KEYS_MAX_AGE_SECONDS
+        return response.json(), max_age
+
+
+@lru_cache(maxsize=1)
+def get_firebase_public_key_store() -> FirebasePublicKeyStore:
+    """Return the process-wide Firebase public key store."""
+
+    return FirebasePublicKeyStore(
+        settings.firebase_public_keys_url,
+        executor=get_firebase_executor(),
+        refresh_margin_seconds=settings.firebase_public_keys_refresh_margin_seconds,
+        retry_seconds=settings.firebase_public_keys_retry_seconds,
+    )
+
+
+def _verify_with_certs(
+    token: str, certs: dict[str, str], project_id: str
+) -> dict[str, Any]:
+    """Check an ID token's signature and Firebase-specific claims."""
+
+    try:
+        claims = jwt.decode(token, certs=certs, audience=project_id)
+    except ValueError as exc:
+        raise FirebaseTokenVerificationError(str(exc)) from exc
+
+    if claims.get("iss") != ID_TOKEN_ISSUER_PREFIX + project_id:
+        raise FirebaseTokenVerificationError("Firebase ID token has an invalid issuer.")
+
+    subject = claims.get("sub")
+    if not isinstance(subject, str) or not subject or len(subject) > 128:
+        raise FirebaseTokenVerificationError("Firebase ID token has an invalid subject.")
+
+    claims["uid"] = subject
+    return claims
+
+
 class FirebaseAuthClient:
     """Thin wrapper around firebase_admin.auth to aid dependency injection."""
 
-    def __init__(self, app: firebase_admin.App):
+    def __init__(
+        self,
+        app: firebase_admin.App,
+        key_store: FirebasePublicKeyStore | None = None,
+        executor: ThreadPoolExecutor | None = None,
+    ):
         self._app = app
+        self._key_store = key_store or get_firebase_public_key_store()
+        self._executor = executor or get_firebase_executor()
 
     def verify_token(
         self, token: str, *, check_revoked: bool = False
@@ -68,6 +238,45 @@ class FirebaseAuthClient:
 
         return auth.get_user(uid, app=self._app)
 
+    async def verify_token_async(self, token: str) -> dict[str, Any]:
+        """Verify a Firebase ID token without blocking the event loop.
+
+        Uses the preloaded public keys and runs the RSA check on the Firebase
+        thread pool. Revocation checks need a network call per token, so
+        callers that need them should use ``verify_token`` instead.
+        """
+
+        try:
+            key_id = jwt.decode_header(token).get("kid")
+        except ValueError as exc:
+            raise FirebaseTokenVerificationError("Malformed Firebase ID token.") from exc
+
+        certs = self._key_store.certs
+        if key_id not in certs:
+            # Google rotates keys ahead of use, so an unknown kid usually means
+            # our copy is stale; refresh in the background and reject this one.
+            self._key_store.request_refresh()
+            raise FirebaseTokenVerificationError(
+                "Firebase ID token was signed with an unknown key."
+            )
+
+        project_id = self._app.project_id
+        if not project_id:
+            raise FirebaseInitializationError(
+                "Firebase project ID is required to verify ID tokens."
+            )
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, _verify_with_certs, token, certs, project_id
+        )
+
+    async def get_user_async(self, uid: str) -> auth.UserRecord:
+        """Fetch a Firebase user record on the Firebase thread pool."""
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self.get_user, uid)
+
 
 def get_firebase_auth_client() -> FirebaseAuthClient:
     """Return a FirebaseAuthClient suitable for FastAPI dependencies."""
@@ -79,6 +288,11 @@ def get_firebase_auth_client() -> FirebaseAuthClient:
 __all__ = [
     "FirebaseAuthClient",
     "FirebaseInitializationError",
+    "FirebasePublicKeyStore",
+    "FirebasePublicKeysUnavailableError",
+    "FirebaseTokenVerificationError",
     "get_firebase_app",
     "get_firebase_auth_client",
+    "get_firebase_executor",
+    "get_firebase_public_key_store",
 ]
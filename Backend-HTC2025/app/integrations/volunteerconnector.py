@@ -0,0 +1,128 @@
+"""Async client for the volunteerconnector.org opportunity search API."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+from collections.abc import AsyncIterator
+from functools import lru_cache
+from typing import Any
+
+import httpx
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class VolunteerConnectorError(RuntimeError):
+    """Raised when the upstream search API fails or returns garbage."""
+
+
+class VolunteerConnectorClient:
+    """Fetch every page of a volunteerconnector search concurrently.
+
+    The upstream API is page-number paginated and only hands out one ``next``
+    link at a time. The first page tells us the total count and page size, so
+    the remaining pages are requested in parallel (bounded by
+    ``max_concurrency``) over one pooled HTTP client.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        *,
+        http_client: httpx.AsyncClient | None = None,
+        max_concurrency: int = 8,
+        timeout_seconds: float = 10.0,
+    ) -> None:
+        self._base_url = base_url
+        self._http = http_client or httpx.AsyncClient(
+            timeout=timeout_seconds,
+            limits=httpx.Limits(
+                max_connections=max_concurrency,
+                max_keepalive_connections=max_concurrency,
+            ),
+        )
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def search(self, params: dict[str, Any]) -> dict[str, Any]:
+        """Return ``{"count", "results"}`` with the results of every page."""
+
+        first = await self._get_page(params, page=1)
+        results: list[dict[str, Any]] = list(first.get("results") or [])
+        pages = await asyncio.gather(
+            *(
+                self._get_page(params, page=page)
+                for page in self._remaining_pages(first)
+            )
+        )
+        for page in pages:
+            results.extend(page.get("results") or [])
+
+        return {"count": int(first.get("count") or len(results)), "results": results}
+
+    async def iter_pages(
+        self, params: dict[str, Any]
+    ) -> AsyncIterator[list[dict[str, Any]]]:
+        """Yield each page's results as soon as it arrives (in any order)."""
+
+        first = await self._get_page(params, page=1)
+        yield list(first.get("results") or [])
+
+        tasks = [
+            asyncio.ensure_future(self._get_page(params, page=page))
+            for page in self._remaining_pages(first)
+        ]
+        try:
+            for next_page in asyncio.as_completed(tasks):
+                yield list((await next_page).get("results") or [])
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def aclose(self) -> None:
+        await self._http.aclose()
+
+    @staticmethod
+    def _remaining_pages(first: dict[str, Any]) -> range:
+        page_size = len(first.get("results") or [])
+        if not first.get("next") or not page_size:
+            return range(0)
+        count = int(first.get("count") or page_size)
+        return range(2, math.ceil(count / page_size) + 1)
+
+    async def _get_page(self, params: dict[str, Any], *, page: int) -> dict[str, Any]:
+        query = {**params, "page": page} if page > 1 else params
+        async with self._semaphore:
+            try:
+                response = await self._http.get(self._base_url, params=query)
+                response.raise_for_status()
+                payload = response.json()
+            except (httpx.HTTPError, ValueError) as exc:
+                raise VolunteerConnectorError(
+                    f"Volunteer search page {page} failed: {exc}"
+                ) from exc
+
+        if not isinstance(payload, dict):
+            raise VolunteerConnectorError("Volunteer search returned a non-object.")
+        return payload
+
+
+@lru_cache(maxsize=1)
+def get_volunteer_connector_client() -> VolunteerConnectorClient:
+    """Return the worker-wide volunteerconnector client."""
+
+    return VolunteerConnectorClient(
+        settings.volunteer_connector_search_url,
+        max_concurrency=settings.volunteer_connector_max_concurrency,
+        timeout_seconds=settings.volunteer_connector_timeout_seconds,
+    )
+
+
+__all__ = [
+    "VolunteerConnectorClient",
+    "VolunteerConnectorError",
+    "get_volunteer_connector_client",
+]
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from sqlalchemy import BigInteger, PrimaryKeyConstraint, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models import Base
+
+
+class CollectionVersion(Base):
+    """Per-user version stamp of a list the client polls, bumped on writes."""
+
+    __tablename__ = "collection_versions"
+    __table_args__ = (PrimaryKeyConstraint("user_id", "collection"),)
+
+    user_id: Mapped[int] = mapped_column(
+        BigInteger,
+        nullable=False,
+    )
+    collection: Mapped[str] = mapped_column(
+        String(32),
+        nullable=False,
+    )
+    version: Mapped[int] = mapped_column(
+        BigInteger,
+        nullable=False,
+    )
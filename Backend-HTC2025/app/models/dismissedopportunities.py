@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import BigInteger, UniqueConstraint, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models import Base
+
+
+class DismissedOpportunity(Base):
+    """Opportunity a user swiped left on."""
+
+    __tablename__ = "dismissed_opportunities"
+    # Also serves the per-user exclusion lookups of the swipe deck.
+    __table_args__ = (UniqueConstraint("user_id", "opportunity_id"),)
+
+    id: Mapped[int] = mapped_column(
+        BigInteger,
+        primary_key=True,
+        autoincrement=True,
+    )
+    user_id: Mapped[int] = mapped_column(
+        BigInteger,
+        nullable=False,
+    )
+    opportunity_id: Mapped[int] = mapped_column(
+        BigInteger,
+        nullable=False,
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        server_default=func.now(),
+        nullable=False,
+    )
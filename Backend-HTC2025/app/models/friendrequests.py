@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from sqlalchemy import BigInteger, Enum, func
+from sqlalchemy import BigInteger, Enum, Index, UniqueConstraint, func, text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.models import Base
@@ -22,6 +22,25 @@ class FriendRequest(Base):
     """Friend request between users."""
 
     __tablename__ = "friendrequests"
+    __table_args__ = (
+        UniqueConstraint("sender_id", "receiver_id"),
+        # One request per user pair regardless of direction, so crossed sends
+        # conflict instead of both being inserted.
+        Index(
+            "ux_friendrequests_user_pair",
+            func.least(text("sender_id"), text("receiver_id")),
+            func.greatest(text("sender_id"), text("receiver_id")),
+            unique=True,
+        ),
+        # Pages a user's pending requests by (created_at, id).
+        Index(
+            "ix_friendrequests_pending_receiver_id_created_at_id",
+            "receiver_id",
+            "created_at",
+            "id",
+            postgresql_where=text("status = 'pending'"),
+        ),
+    )
 
     id: Mapped[int] = mapped_column(
         BigInteger,
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from sqlalchemy import BigInteger, func
+from sqlalchemy import BigInteger, Index, UniqueConstraint, func
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.models import Base
@@ -12,6 +12,12 @@ class Friendship(Base):
     """Friendship relationship between users."""
 
     __tablename__ = "friendships"
+    __table_args__ = (
+        UniqueConstraint("user_id1", "user_id2"),
+        # Serve each side of the friends-list UNION in (created_at, id) order.
+        Index("ix_friendships_user_id1_created_at_id", "user_id1", "created_at", "id"),
+        Index("ix_friendships_user_id2_created_at_id", "user_id2", "created_at", "id"),
+    )
 
     id: Mapped[int] = mapped_column(
         BigInteger,
@@ -21,12 +27,10 @@ class Friendship(Base):
     user_id1: Mapped[int] = mapped_column(
         BigInteger,
         nullable=False,
-        index=True,
     )
     user_id2: Mapped[int] = mapped_column(
         BigInteger,
         nullable=False,
-        index=True,
     )
     created_at: Mapped[datetime] = mapped_column(
         server_default=func.now(),
@@ -2,16 +2,47 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from sqlalchemy import BigInteger, func
+from sqlalchemy import (
+    BigInteger,
+    Computed,
+    Float,
+    Index,
+    Integer,
+    LargeBinary,
+    String,
+    func,
+    text,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.models import Base
 
+SEARCH_VECTOR_CONFIG = "english"
+SEARCH_VECTOR_EXPRESSION = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(organization, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'C')"
+)
+
 
 class Opportunity(Base):
     """Opportunity available in the system."""
 
     __tablename__ = "opportunities"
+    __table_args__ = (
+        Index(
+            "ix_opportunities_search_vector", "search_vector", postgresql_using="gin"
+        ),
+        # Covers the radius filter and the trending sort, so ranking nearby
+        # opportunities by saves can be answered from the index alone.
+        Index(
+            "ix_opportunities_geohash",
+            "geohash",
+            postgresql_include=["latitude", "longitude", "save_count"],
+        ),
+        Index("ix_opportunities_save_count_id", text("save_count DESC"), "id"),
+    )
 
     id: Mapped[int] = mapped_column(
         BigInteger,
@@ -53,3 +84,49 @@ class Opportunity(Base):
     duration: Mapped[str] = mapped_column(
         nullable=True,
     )
+
+    latitude: Mapped[float | None] = mapped_column(
+        Float,
+        nullable=True,
+    )
+
+    longitude: Mapped[float | None] = mapped_column(
+        Float,
+        nullable=True,
+    )
+
+    # Byte-wise collation so every geohash prefix is one contiguous index range.
+    geohash: Mapped[str | None] = mapped_column(
+        String(12, collation="C"),
+        nullable=True,
+    )
+
+    # Merged from opportunity_save_count_shards periodically, so it may lag
+    # the saves table by up to save_count_merge_interval_seconds.
+    save_count: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        server_default="0",
+    )
+
+    # sha256 of the normalized upstream fields, set by the ingestion worker so
+    # unchanged rows can be skipped; NULL for rows that were only ever saved.
+    content_hash: Mapped[bytes | None] = mapped_column(
+        LargeBinary,
+        nullable=True,
+    )
+
+    # Set on insert and whenever ingestion rewrites the row's content, so each
+    # process's cluster index can reload just the rows that changed.
+    updated_at: Mapped[datetime] = mapped_column(
+        server_default=func.now(),
+        nullable=False,
+        index=True,
+    )
+
+    # Weighted full-text document: title > organization > description.
+    search_vector: Mapped[str | None] = mapped_column(
+        TSVECTOR,
+        Computed(SEARCH_VECTOR_EXPRESSION, persisted=True),
+        deferred=True,
+    )
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from sqlalchemy import BigInteger, Integer, PrimaryKeyConstraint, SmallInteger
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models import Base
+
+
+class SaveCountShard(Base):
+    """Unmerged save-count delta for one opportunity, split across shards."""
+
+    __tablename__ = "opportunity_save_count_shards"
+    __table_args__ = (PrimaryKeyConstraint("opportunity_id", "shard"),)
+
+    opportunity_id: Mapped[int] = mapped_column(
+        BigInteger,
+        nullable=False,
+    )
+    shard: Mapped[int] = mapped_column(
+        SmallInteger,
+        nullable=False,
+    )
+    delta: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+    )
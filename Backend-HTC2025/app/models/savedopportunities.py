@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from sqlalchemy import BigInteger, func
+from sqlalchemy import BigInteger, Index, UniqueConstraint, func
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.models import Base
@@ -12,6 +12,27 @@ class SavedOpportunity(Base):
     """Saved opportunity by users."""
 
     __tablename__ = "saved_opportunities"
+    __table_args__ = (
+        # Also serves lookups by user_id, so that column needs no index of its own.
+        UniqueConstraint("user_id", "opportunity_id"),
+        # Covers delta sync: a user's saves after a (sync_version, id) cursor.
+        Index(
+            "ix_saved_opportunities_user_id_sync_version_id",
+            "user_id",
+            "sync_version",
+            "id",
+            postgresql_include=["opportunity_id"],
+        ),
+        # Pages an opportunity's savers by (created_at, id); also serves plain
+        # lookups by opportunity_id.
+        Index(
+            "ix_saved_opportunities_opportunity_id_created_at_id",
+            "opportunity_id",
+            "created_at",
+            "id",
+            postgresql_include=["user_id"],
+        ),
+    )
 
     id: Mapped[int] = mapped_column(
         BigInteger,
@@ -21,12 +42,17 @@ class SavedOpportunity(Base):
     user_id: Mapped[int] = mapped_column(
         BigInteger,
         nullable=False,
-        index=True,
     )
     opportunity_id: Mapped[int] = mapped_column(
         BigInteger,
         nullable=False,
-        index=True,
+    )
+    # The user's saved-opportunities collection version at the time of the
+    # save. Versions are handed out in commit order, unlike created_at, so
+    # delta sync pages on this; no default, so every writer must stamp it.
+    sync_version: Mapped[int] = mapped_column(
+        BigInteger,
+        nullable=False,
     )
     created_at: Mapped[datetime] = mapped_column(
         server_default=func.now(),
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import BigInteger, Enum, Identity, Index, PrimaryKeyConstraint, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models import Base
+
+import enum
+
+
+class SwipeDirection(enum.Enum):
+    """Enumeration for swipe directions."""
+
+    left = "left"
+    right = "right"
+
+
+class SwipeEvent(Base):
+    """Append-only log of swipes, range-partitioned by month of created_at."""
+
+    __tablename__ = "swipe_events"
+    # Postgres requires the partition key in every unique constraint.
+    __table_args__ = (
+        PrimaryKeyConstraint("id", "created_at"),
+        Index("ix_swipe_events_user_id_created_at", "user_id", "created_at"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
+
+    id: Mapped[int] = mapped_column(
+        BigInteger,
+        Identity(),
+    )
+    user_id: Mapped[int] = mapped_column(
+        BigInteger,
+        nullable=False,
+    )
+    opportunity_id: Mapped[int] = mapped_column(
+        BigInteger,
+        nullable=False,
+    )
+    direction: Mapped[SwipeDirection] = mapped_column(
+        Enum(SwipeDirection, name="swipe_direction"),
+        nullable=False,
+    )
+    swiped_at: Mapped[datetime] = mapped_column(
+        nullable=False,
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        server_default=func.now(),
+        nullable=False,
+    )
@@ -0,0 +1,77 @@
+"""Response classes shared by the API routes."""
+
+from collections.abc import AsyncGenerator, AsyncIterator, Mapping, Sequence
+from contextlib import aclosing
+from typing import Any
+
+from fastapi.responses import Response, StreamingResponse
+from pydantic import BaseModel
+from pydantic_core import to_json
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+class JSONBytesResponse(Response):
+    """JSON response encoded straight to bytes by pydantic-core.
+
+    Returning an instance from a route bypasses FastAPI's response_model
+    handling, so a payload model that the route already validated is not
+    validated again, run through ``jsonable_encoder`` or ``json.dumps``.
+    Keep ``response_model`` on the route for the OpenAPI schema.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return to_json(content)
+
+
+def accepts_ndjson(accept: str | None) -> bool:
+    """Return whether an Accept header lists the NDJSON media type."""
+
+    if not accept:
+        return False
+    return any(
+        media_range.split(";", 1)[0].strip().lower() == NDJSON_MEDIA_TYPE
+        for media_range in accept.split(",")
+    )
+
+
+class NDJSONStreamingResponse(StreamingResponse):
+    """Stream rows as newline-delimited JSON, one schema object per line.
+
+    ``partitions`` yields lists of ORM rows (see ``stream_scalar_partitions``);
+    each list is validated against schema and sent as one chunk, so memory
+    and time to first byte depend on the partition size, not the row count.
+    """
+
+    media_type = NDJSON_MEDIA_TYPE
+
+    def __init__(
+        self,
+        partitions: AsyncGenerator[Sequence[Any], None],
+        schema: type[BaseModel],
+        headers: Mapping[str, str] | None = None,
+    ) -> None:
+        super().__init__(_ndjson_chunks(partitions, schema), headers=headers)
+
+
+async def _ndjson_chunks(
+    partitions: AsyncGenerator[Sequence[Any], None], schema: type[BaseModel]
+) -> AsyncIterator[bytes]:
+    # aclosing ends the cursor (and frees its connection) right away when the
+    # client disconnects mid-stream.
+    async with aclosing(partitions):
+        async for rows in partitions:
+            yield b"".join(
+                to_json(schema.model_validate(row, from_attributes=True)) + b"\n"
+                for row in rows
+            )
+
+
+__all__ = [
+    "JSONBytesResponse",
+    "NDJSONStreamingResponse",
+    "NDJSON_MEDIA_TYPE",
+    "accepts_ndjson",
+]
@@ -3,9 +3,11 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 
 from app.dependencies.auth import get_auth_service
+from app.models.user import User
 from app.schemas.auth import AuthResponse, SignInRequest, SignUpRequest, UserPayload
 from app.services.auth import (
     AuthService,
+    AuthUnavailableError,
     InvalidCredentialsError,
     MissingEmailClaimError,
     UserNotFoundError,
@@ -14,6 +16,18 @@ from app.services.auth import (
 router = APIRouter(prefix="/auth", tags=["Auth"])
 
 
+def _with_session_token(
+    response: AuthResponse, service: AuthService, user: User, requested: bool
+) -> AuthResponse:
+    """Attach a backend session token when the client asked for one."""
+
+    if requested:
+        issued = service.issue_session_token(user)
+        if issued is not None:
+            response.session_token, response.session_expires_at = issued
+    return response
+
+
 @router.post(
     "/signup",
     response_model=AuthResponse,
@@ -38,9 +52,14 @@ async def sign_up(
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)
         ) from exc
+    except AuthUnavailableError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(exc)
+        ) from exc
 
     user_payload = UserPayload.model_validate(user)
-    return AuthResponse(user=user_payload, is_new_user=is_new_user)
+    response = AuthResponse(user=user_payload, is_new_user=is_new_user)
+    return _with_session_token(response, service, user, payload.issue_session)
 
 
 @router.post(
@@ -65,13 +84,18 @@ async def login(
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)
         ) from exc
+    except AuthUnavailableError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(exc)
+        ) from exc
     except UserNotFoundError as exc:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)
         ) from exc
 
     user_payload = UserPayload.model_validate(user)
-    return AuthResponse(user=user_payload, is_new_user=False)
+    response = AuthResponse(user=user_payload, is_new_user=False)
+    return _with_session_token(response, service, user, payload.issue_session)
 
 
 __all__ = ["router"]
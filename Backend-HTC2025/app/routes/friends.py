@@ -1,61 +1,168 @@
 ### FastAPI route for friend-related endpoints
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.dependencies.auth import get_current_user
 from app.database.postgres import get_postgres_session
-from app.services.friends import FriendsService
-from app.dependencies.users import user_lookup_service_dependency
+from app.dependencies.database import get_read_session
+from app.responses import (
+    NDJSON_MEDIA_TYPE,
+    JSONBytesResponse,
+    NDJSONStreamingResponse,
+    accepts_ndjson,
+)
+from app.services.friends import FriendRequestOutcome, FriendsService
+from app.services.pagination import InvalidCursorError
+from app.services.versions import Collection, collection_etag, etag_matches
 from app.schemas.friends import (
+    BatchFriendRequestSchema,
+    BatchManageFriendRequestSchema,
+    FriendRequestResultSchema,
     FriendRequestSchema,
+    FriendSchema,
+    FriendsListResponse,
+    ManageFriendRequestResultSchema,
     ManageFriendRequestSchema,
-    PendingFriendRequestSchema,
+    PendingFriendRequestsResponse,
 )
 from app.models.user import User
 
 router = APIRouter(prefix="/friends", tags=["Friends"])
 
+_SEND_REQUEST_ERRORS = {
+    FriendRequestOutcome.user_not_found: (
+        status.HTTP_404_NOT_FOUND,
+        "User with the given email does not exist.",
+    ),
+    FriendRequestOutcome.self_request: (
+        status.HTTP_400_BAD_REQUEST,
+        "Cannot send friend request to oneself.",
+    ),
+    FriendRequestOutcome.already_friends: (
+        status.HTTP_409_CONFLICT,
+        "Users are already friends.",
+    ),
+    FriendRequestOutcome.already_pending: (
+        status.HTTP_409_CONFLICT,
+        "A friend request already exists between these users.",
+    ),
+}
+
+
+def _etag_headers(etag: str) -> dict[str, str]:
+    # no-cache lets browsers keep the body but revalidate it on every fetch.
+    return {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+
+def _negotiated_etag_headers(etag: str) -> dict[str, str]:
+    return {**_etag_headers(etag), "Vary": "Accept"}
+
 
 def get_friends_service(
     session: AsyncSession = Depends(get_postgres_session),
+    read_session: AsyncSession = Depends(get_read_session),
 ) -> FriendsService:
-    return FriendsService(session)
+    return FriendsService(session, read_session=read_session)
 
 
-@router.get("/", status_code=status.HTTP_200_OK, summary="Get list of friends")
+@router.get(
+    "/",
+    response_model=FriendsListResponse,
+    responses={200: {"content": {NDJSON_MEDIA_TYPE: {}}}},
+    status_code=status.HTTP_200_OK,
+    summary="Get list of friends",
+)
 async def get_friends(
+    cursor: str | None = Query(default=None),
+    limit: int = Query(default=100, ge=1, le=500),
+    if_none_match: str | None = Header(default=None),
+    accept: str | None = Header(default=None),
     friends_service: FriendsService = Depends(get_friends_service),
     user: User = Depends(get_current_user),
 ):
-    """Retrieve the list of friends for the current user."""
-    # Placeholder implementation
-    friends_list = await friends_service.get_friends_list(user)
-    return {"friends": friends_list}
+    """Retrieve a page of friends for the current user, newest first.
+
+    Answers 304 from the list's version stamp alone when If-None-Match holds
+    the current ETag. Without a cursor, clients that accept
+    ``application/x-ndjson`` get every friend streamed one per line.
+    """
+    stream = cursor is None and accepts_ndjson(accept)
+    version = await friends_service.get_collection_version(user, Collection.friends)
+    etag = collection_etag(
+        user.id, Collection.friends, version, variant="ndjson" if stream else None
+    )
+    headers = _negotiated_etag_headers(etag)
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    await friends_service.catch_up_to(user, Collection.friends, version)
+    if stream:
+        return NDJSONStreamingResponse(
+            friends_service.stream_friends(user), FriendSchema, headers=headers
+        )
+    try:
+        friends_list, next_cursor = await friends_service.get_friends_list(
+            user, cursor=cursor, limit=limit
+        )
+    except InvalidCursorError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)
+        ) from exc
+    payload = FriendsListResponse.model_validate(
+        {"friends": friends_list, "next_cursor": next_cursor}, from_attributes=True
+    )
+    return JSONBytesResponse(payload, headers=headers)
 
 
 @router.get(
     "/requests/pending",
+    response_model=PendingFriendRequestsResponse,
     status_code=status.HTTP_200_OK,
     summary="Get pending friend requests",
 )
 async def get_pending_friend_requests(
+    cursor: str | None = Query(default=None),
+    limit: int = Query(default=100, ge=1, le=500),
+    if_none_match: str | None = Header(default=None),
     friends_service: FriendsService = Depends(get_friends_service),
     user: User = Depends(get_current_user),
 ):
-    """Retrieve pending friend requests sent to the current user."""
-    pending_requests = await friends_service.get_pending_friend_requests(user)
-    return {
-        "pending_requests": [
-            PendingFriendRequestSchema(
-                id=request.id,
-                sender_email=sender.email,
-                sender_name=sender.full_name or sender.email,
-                status=request.status.value,
-                created_at=request.created_at.isoformat(),
-            ).model_dump()
-            for request, sender in pending_requests
-        ]
-    }
+    """Retrieve a page of pending friend requests to the current user, newest first."""
+    version = await friends_service.get_collection_version(
+        user, Collection.friend_requests
+    )
+    etag = collection_etag(user.id, Collection.friend_requests, version)
+    if etag_matches(if_none_match, etag):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers=_etag_headers(etag)
+        )
+    await friends_service.catch_up_to(user, Collection.friend_requests, version)
+    try:
+        (
+            pending_requests,
+            next_cursor,
+        ) = await friends_service.get_pending_friend_requests(
+            user, cursor=cursor, limit=limit
+        )
+    except InvalidCursorError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)
+        ) from exc
+    payload = PendingFriendRequestsResponse.model_validate(
+        {
+            "pending_requests": [
+                {
+                    "id": request.id,
+                    "sender_email": sender.email,
+                    "sender_name": sender.full_name or sender.email,
+                    "status": request.status.value,
+                    "created_at": request.created_at.isoformat(),
+                }
+                for request, sender in pending_requests
+            ],
+            "next_cursor": next_cursor,
+        }
+    )
+    return JSONBytesResponse(payload, headers=_etag_headers(etag))
 
 
 @router.post(
@@ -64,24 +171,21 @@ async def get_pending_friend_requests(
 async def send_friend_request(
     friend_request: FriendRequestSchema,
     friends_service: FriendsService = Depends(get_friends_service),
-    user_lookup_service=Depends(user_lookup_service_dependency),
     user: User = Depends(get_current_user),
 ):
     """Send a friend request to another user."""
-    # Placeholder implementation
     if friend_request.friend_email == user.email:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Cannot send friend request to oneself.",
         )
-    friend = await user_lookup_service.get_by_email(friend_request.friend_email)
-    if not friend:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User with the given email does not exist.",
-        )
-    await friends_service.send_friend_request(sender=user, receiver=friend)
-    return {"message": f"Friend request sent to user {friend.email}."}
+    outcome = await friends_service.send_friend_request(
+        sender=user, receiver_email=friend_request.friend_email
+    )
+    if outcome is not FriendRequestOutcome.created:
+        status_code, detail = _SEND_REQUEST_ERRORS[outcome]
+        raise HTTPException(status_code=status_code, detail=detail)
+    return {"message": f"Friend request sent to user {friend_request.friend_email}."}
 
 
 @router.post(
@@ -100,3 +204,52 @@ async def manage_friend_request(
         accept=manage_request.accept,
     )
     return {"message": "Friend request accepted."}
+
+
+@router.post(
+    "/requests/send/batch",
+    status_code=status.HTTP_200_OK,
+    summary="Send friend requests in bulk",
+)
+async def send_friend_requests(
+    batch: BatchFriendRequestSchema,
+    friends_service: FriendsService = Depends(get_friends_service),
+    user: User = Depends(get_current_user),
+):
+    """Send friend requests to several users, reporting a result per email."""
+    outcomes = await friends_service.send_friend_requests(
+        sender=user, receiver_emails=batch.friend_emails
+    )
+    return {
+        "results": [
+            FriendRequestResultSchema(
+                friend_email=email, result=outcome.value
+            ).model_dump()
+            for email, outcome in outcomes.items()
+        ]
+    }
+
+
+@router.post(
+    "/requests/manage/batch",
+    status_code=status.HTTP_200_OK,
+    summary="Accept or reject friend requests in bulk",
+)
+async def manage_friend_requests(
+    batch: BatchManageFriendRequestSchema,
+    friends_service: FriendsService = Depends(get_friends_service),
+    user: User = Depends(get_current_user),
+):
+    """Accept or reject several friend requests, reporting a result per request."""
+    outcomes = await friends_service.manage_friend_requests(
+        reciever=user,
+        decisions={item.request_id: item.accept for item in batch.requests},
+    )
+    return {
+        "results": [
+            ManageFriendRequestResultSchema(
+                request_id=request_id, result=outcome.value
+            ).model_dump()
+            for request_id, outcome in outcomes.items()
+        ]
+    }
@@ -1,10 +1,25 @@
 """FastAPI routes for opportunity endpoints."""
 
-from fastapi import APIRouter, Depends, status
+from operator import attrgetter
+from typing import Any
 
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+
+from app.config import settings
 from app.dependencies.auth import get_current_user
-from app.dependencies.opportunity import opportunity_service_dependency
+from app.dependencies.opportunity import (
+    opportunity_search_service_dependency,
+    opportunity_service_dependency,
+    swipe_deck_service_dependency,
+)
+from app.integrations.volunteerconnector import VolunteerConnectorError
 from app.models.user import User
+from app.responses import (
+    NDJSON_MEDIA_TYPE,
+    JSONBytesResponse,
+    NDJSONStreamingResponse,
+    accepts_ndjson,
+)
 from app.schemas.opportunity import (
     OpportunityCreateSchema,
     OpportunityResponseSchema,
@@ -12,11 +27,48 @@ from app.schemas.opportunity import (
     SavedOpportunitiesResponse,
     OpportunitySavedUserSchema,
     OpportunitySavedUsersResponse,
+    OpportunitySaversBatchResponse,
+    NearbyOpportunitiesResponse,
+    OpportunityClustersResponse,
+    OpportunityTextSearchResponse,
+    SwipeDeckResponse,
+    TrendingOpportunitiesResponse,
+    DismissOpportunityResponse,
+    SaveOpportunitiesBatchResponse,
+    SaveOpportunitiesBatchSchema,
+    SaveOpportunityResultSchema,
+    SwipeEventsAcceptedResponse,
+    SwipeEventsBatchSchema,
 )
+from app.services.clusters import ClusterIndex, get_cluster_index
+from app.services.deck import SwipeDeckService
 from app.services.opportunity import OpportunityService
+from app.services.pagination import InvalidCursorError
+from app.services.swipes import (
+    SwipeBufferFullError,
+    SwipeEventWriter,
+    get_swipe_event_writer,
+    swipe_record,
+)
+from app.services.versions import Collection, collection_etag, etag_matches
+from app.services.opportunity_search import (
+    InvalidSearchLocationError,
+    OpportunitySearchService,
+)
 
 router = APIRouter(prefix="/opportunities", tags=["Opportunities"])
 
+_NDJSON_RESPONSE = {200: {"content": {NDJSON_MEDIA_TYPE: {}}}}
+
+_OPPORTUNITY_FIELDS = tuple(OpportunityResponseSchema.model_fields)
+_opportunity_values = attrgetter(*_OPPORTUNITY_FIELDS)
+
+
+def _opportunity_fields(opportunity: Any) -> dict[str, Any]:
+    """Read the response fields off an ORM row for a schema that extends them."""
+
+    return dict(zip(_OPPORTUNITY_FIELDS, _opportunity_values(opportunity)))
+
 
 @router.post(
     "/save",
@@ -31,55 +83,460 @@ async def save_opportunity(
 ) -> SaveOpportunityResponse:
     """Persist an opportunity and link it to the current user."""
 
-    await service.save_opportunity(user=user, opportunity_data=payload)
+    saved = await service.save_opportunity(user=user, opportunity_data=payload)
+    if not saved:
+        return SaveOpportunityResponse(message="Opportunity already saved.")
     return SaveOpportunityResponse(message="Opportunity saved successfully.")
 
 
+@router.post(
+    "/save/batch",
+    response_model=SaveOpportunitiesBatchResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Save several opportunities for the current user",
+)
+async def save_opportunities(
+    payload: SaveOpportunitiesBatchSchema,
+    user: User = Depends(get_current_user),
+    service: OpportunityService = Depends(opportunity_service_dependency),
+) -> SaveOpportunitiesBatchResponse:
+    """Persist a batch of swiped opportunities, reporting a result per api_id."""
+
+    results = await service.save_opportunities(
+        user=user, opportunities=payload.opportunities
+    )
+    return SaveOpportunitiesBatchResponse(
+        results=[
+            SaveOpportunityResultSchema(api_id=api_id, saved=saved)
+            for api_id, saved in results.items()
+        ]
+    )
+
+
+@router.post(
+    "/swipes",
+    response_model=SwipeEventsAcceptedResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Record a batch of swipes for the current user",
+)
+async def record_swipes(
+    payload: SwipeEventsBatchSchema,
+    user: User = Depends(get_current_user),
+    writer: SwipeEventWriter = Depends(get_swipe_event_writer),
+) -> SwipeEventsAcceptedResponse:
+    """Queue swipes for the event log; swipes on unknown api_ids are dropped."""
+
+    records = [
+        swipe_record(user.id, event.api_id, event.direction, event.swiped_at)
+        for event in payload.events
+    ]
+    try:
+        await writer.submit(records)
+    except SwipeBufferFullError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(exc),
+            headers={"Retry-After": "1"},
+        ) from exc
+    return SwipeEventsAcceptedResponse(accepted=len(records))
+
+
+@router.get(
+    "/search",
+    status_code=status.HTTP_200_OK,
+    summary="Search volunteerconnector opportunities near a location",
+)
+async def search_opportunities(
+    postal_code: str | None = Query(default=None, max_length=10),
+    lat: float | None = Query(default=None, ge=-90, le=90),
+    lng: float | None = Query(default=None, ge=-180, le=180),
+    distance: int = Query(default=10, ge=1, le=500),
+    user: User = Depends(get_current_user),
+    service: OpportunitySearchService = Depends(opportunity_search_service_dependency),
+) -> JSONBytesResponse:
+    """Return every upstream result for the location, served from a shared cache."""
+
+    _ = user  # enforce authentication via dependency
+    try:
+        results = await service.search(
+            distance=distance, postal_code=postal_code, latitude=lat, longitude=lng
+        )
+    except InvalidSearchLocationError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)
+        ) from exc
+    except VolunteerConnectorError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail="Opportunity search is temporarily unavailable.",
+        ) from exc
+    return JSONBytesResponse(results)
+
+
+@router.get(
+    "/search/text",
+    response_model=OpportunityTextSearchResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Keyword search over stored opportunities",
+)
+async def search_opportunities_text(
+    q: str = Query(..., min_length=1, max_length=200),
+    cursor: str | None = Query(default=None),
+    limit: int = Query(default=20, ge=1, le=100),
+    lat: float | None = Query(default=None, ge=-90, le=90),
+    lng: float | None = Query(default=None, ge=-180, le=180),
+    radius_km: float | None = Query(default=None, gt=0, le=500),
+    user: User = Depends(get_current_user),
+    service: OpportunityService = Depends(opportunity_service_dependency),
+) -> JSONBytesResponse:
+    """Return a page of ranked keyword matches, optionally within a radius."""
+
+    _ = user  # enforce authentication via dependency
+    location = (lat, lng, radius_km)
+    if any(value is not None for value in location) and None in location:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="lat, lng and radius_km must be given together.",
+        )
+    try:
+        opportunities, next_cursor = await service.search_opportunities_text(
+            q,
+            cursor=cursor,
+            limit=limit,
+            latitude=lat,
+            longitude=lng,
+            radius_km=radius_km,
+        )
+    except InvalidCursorError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)
+        ) from exc
+    return JSONBytesResponse(
+        OpportunityTextSearchResponse.model_validate(
+            {"opportunities": opportunities, "next_cursor": next_cursor},
+            from_attributes=True,
+        )
+    )
+
+
+@router.get(
+    "/nearby",
+    response_model=NearbyOpportunitiesResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Find stored opportunities near a location",
+)
+async def get_nearby_opportunities(
+    lat: float = Query(..., ge=-90, le=90),
+    lng: float = Query(..., ge=-180, le=180),
+    radius_km: float = Query(default=10, gt=0, le=500),
+    limit: int = Query(default=50, ge=1, le=500),
+    user: User = Depends(get_current_user),
+    service: OpportunityService = Depends(opportunity_service_dependency),
+) -> JSONBytesResponse:
+    """Return the nearest opportunities within radius_km, sorted by distance."""
+
+    _ = user  # enforce authentication via dependency
+    rows = await service.get_nearby_opportunities(
+        latitude=lat, longitude=lng, radius_km=radius_km, limit=limit
+    )
+    return JSONBytesResponse(
+        NearbyOpportunitiesResponse.model_validate(
+            {
+                "opportunities": [
+                    {**_opportunity_fields(opportunity), "distance_km": distance_km}
+                    for opportunity, distance_km in rows
+                ]
+            }
+        )
+    )
+
+
+@router.get(
+    "/trending",
+    response_model=TrendingOpportunitiesResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Get the most saved opportunities, optionally near a location",
+)
+async def get_trending_opportunities(
+    lat: float | None = Query(default=None, ge=-90, le=90),
+    lng: float | None = Query(default=None, ge=-180, le=180),
+    radius_km: float | None = Query(default=None, gt=0, le=500),
+    limit: int = Query(default=20, ge=1, le=100),
+    user: User = Depends(get_current_user),
+    service: OpportunityService = Depends(opportunity_service_dependency),
+) -> JSONBytesResponse:
+    """Return opportunities ordered by save count, most saved first."""
+
+    _ = user  # enforce authentication via dependency
+    location = (lat, lng, radius_km)
+    if any(value is not None for value in location) and None in location:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="lat, lng and radius_km must be given together.",
+        )
+    rows = await service.get_trending_opportunities(
+        limit, latitude=lat, longitude=lng, radius_km=radius_km
+    )
+    return JSONBytesResponse(
+        TrendingOpportunitiesResponse.model_validate(
+            {
+                "opportunities": [
+                    {**_opportunity_fields(opportunity), "distance_km": distance_km}
+                    for opportunity, distance_km in rows
+                ]
+            }
+        )
+    )
+
+
+@router.get(
+    "/clusters",
+    response_model=OpportunityClustersResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Get clustered opportunity markers for a map viewport",
+)
+async def get_opportunity_clusters(
+    min_lat: float = Query(..., ge=-90, le=90),
+    min_lng: float = Query(..., ge=-180, le=180),
+    max_lat: float = Query(..., ge=-90, le=90),
+    max_lng: float = Query(..., ge=-180, le=180),
+    zoom: int = Query(..., ge=0, le=24),
+    user: User = Depends(get_current_user),
+    cluster_index: ClusterIndex = Depends(get_cluster_index),
+) -> JSONBytesResponse:
+    """Return pre-clustered markers with counts for the bounding box."""
+
+    _ = user  # enforce authentication via dependency
+    if min_lat > max_lat:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="min_lat must not exceed max_lat.",
+        )
+    zoom = cluster_index.zoom_for_viewport(
+        min_lat, min_lng, max_lat, max_lng, zoom, settings.cluster_max_cells
+    )
+    clusters = cluster_index.query(min_lat, min_lng, max_lat, max_lng, zoom)
+    return JSONBytesResponse(
+        OpportunityClustersResponse.model_validate(
+            {"zoom": zoom, "clusters": clusters}, from_attributes=True
+        )
+    )
+
+
+@router.get(
+    "/deck",
+    response_model=SwipeDeckResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Get the next swipe cards for the current user",
+)
+async def get_swipe_deck(
+    lat: float = Query(..., ge=-90, le=90),
+    lng: float = Query(..., ge=-180, le=180),
+    radius_km: float = Query(default=50, gt=0, le=500),
+    cursor: str | None = Query(default=None),
+    limit: int = Query(default=20, ge=1, le=100),
+    user: User = Depends(get_current_user),
+    deck: SwipeDeckService = Depends(swipe_deck_service_dependency),
+) -> JSONBytesResponse:
+    """Return nearby opportunities, nearest first, minus saved and dismissed ones."""
+
+    try:
+        cards, next_cursor = await deck.get_page(
+            user,
+            latitude=lat,
+            longitude=lng,
+            radius_km=radius_km,
+            cursor=cursor,
+            limit=limit,
+        )
+    except InvalidCursorError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)
+        ) from exc
+    return JSONBytesResponse(
+        SwipeDeckResponse.model_validate(
+            {
+                "opportunities": [
+                    {**_opportunity_fields(opportunity), "distance_km": distance_km}
+                    for opportunity, distance_km in cards
+                ],
+                "next_cursor": next_cursor,
+            }
+        )
+    )
+
+
+@router.post(
+    "/{api_id}/dismiss",
+    response_model=DismissOpportunityResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Dismiss (swipe left) an opportunity for the current user",
+)
+async def dismiss_opportunity(
+    api_id: int,
+    user: User = Depends(get_current_user),
+    service: OpportunityService = Depends(opportunity_service_dependency),
+) -> DismissOpportunityResponse:
+    """Hide an opportunity from the current user's swipe deck."""
+
+    dismissed = await service.dismiss_opportunity(user=user, api_id=api_id)
+    if dismissed is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Opportunity with the given api_id does not exist.",
+        )
+    if not dismissed:
+        return DismissOpportunityResponse(message="Opportunity already dismissed.")
+    return DismissOpportunityResponse(message="Opportunity dismissed.")
+
+
 @router.get(
     "/saved",
     response_model=SavedOpportunitiesResponse,
+    responses=_NDJSON_RESPONSE,
     status_code=status.HTTP_200_OK,
     summary="Retrieve saved opportunities for the current user",
 )
 async def list_saved_opportunities(
+    since: str | None = Query(default=None),
+    limit: int = Query(default=500, ge=1, le=1000),
+    if_none_match: str | None = Header(default=None),
+    accept: str | None = Header(default=None),
     user: User = Depends(get_current_user),
     service: OpportunityService = Depends(opportunity_service_dependency),
-) -> SavedOpportunitiesResponse:
-    """Return the opportunities saved by the current user."""
-
-    opportunities = await service.get_saved_opportunities(user=user)
-    payload = SavedOpportunitiesResponse(
-        opportunities=[
-            OpportunityResponseSchema.model_validate(opportunity)
-            for opportunity in opportunities
-        ]
+) -> Response:
+    """Return up to ``limit`` opportunities saved by the current user.
+
+    Saves come in commit order, starting after the ``since`` cursor or at the
+    first save. ``next_cursor`` is the ``since`` for the next page (while
+    ``has_more``) or for later deltas. Answers 304 from the list's version
+    stamp alone when If-None-Match holds the current ETag. A request without
+    ``since`` that accepts ``application/x-ndjson`` gets the whole list
+    streamed one opportunity per line instead.
+    """
+
+    stream = since is None and accepts_ndjson(accept)
+    version = await service.get_saved_version(user)
+    etag = collection_etag(
+        user.id,
+        Collection.saved_opportunities,
+        version,
+        variant="ndjson" if stream else None,
+    )
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache", "Vary": "Accept"}
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    await service.catch_up_to(user, version)
+    if stream:
+        return NDJSONStreamingResponse(
+            service.stream_saved_opportunities(user),
+            OpportunityResponseSchema,
+            headers=headers,
+        )
+
+    try:
+        opportunities, next_cursor, has_more = await service.get_saved_opportunities(
+            user=user, since=since, limit=limit
+        )
+    except InvalidCursorError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)
+        ) from exc
+    payload = SavedOpportunitiesResponse.model_validate(
+        {
+            "opportunities": opportunities,
+            "next_cursor": next_cursor,
+            "has_more": has_more,
+        },
+        from_attributes=True,
+    )
+    return JSONBytesResponse(payload, headers=headers)
+
+
+@router.get(
+    "/saved-users",
+    response_model=OpportunitySaversBatchResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Get save counts and savers for several opportunities",
+)
+async def get_users_for_opportunities(
+    api_ids: list[int] = Query(..., min_length=1, max_length=100),
+    users_per_opportunity: int = Query(default=10, ge=0, le=50),
+    user: User = Depends(get_current_user),
+    service: OpportunityService = Depends(opportunity_service_dependency),
+) -> JSONBytesResponse:
+    """Return each opportunity's save count and savers, the caller's friends first."""
+
+    savers = await service.get_saved_users_for_opportunities(
+        user=user, api_ids=api_ids, users_per_opportunity=users_per_opportunity
+    )
+    return JSONBytesResponse(
+        OpportunitySaversBatchResponse.model_validate(
+            {
+                "opportunities": [
+                    {
+                        "api_id": api_id,
+                        "save_count": save_count,
+                        "friend_save_count": friend_save_count,
+                        "users": [
+                            {
+                                "id": saver.id,
+                                "email": saver.email,
+                                "full_name": saver.full_name,
+                                "is_friend": is_friend,
+                            }
+                            for saver, is_friend in users
+                        ],
+                    }
+                    for api_id, (save_count, friend_save_count, users) in savers.items()
+                ]
+            }
+        )
     )
-    return payload
 
 
 @router.get(
     "/{api_id}/saved-users",
     response_model=OpportunitySavedUsersResponse,
+    responses=_NDJSON_RESPONSE,
     status_code=status.HTTP_200_OK,
     summary="Get users who saved an opportunity",
 )
 async def get_users_for_opportunity(
     api_id: int,
+    cursor: str | None = Query(default=None),
+    limit: int = Query(default=100, ge=1, le=500),
+    accept: str | None = Header(default=None),
     user: User = Depends(get_current_user),
     service: OpportunityService = Depends(opportunity_service_dependency),
-) -> OpportunitySavedUsersResponse:
-    """Return the users who saved the specified opportunity."""
+) -> Response:
+    """Return a page of the users who saved the opportunity, newest save first.
+
+    Clients that accept ``application/x-ndjson`` get every saver streamed one
+    per line instead, without the ``api_id`` envelope.
+    """
 
     _ = user  # enforce authentication via dependency
-    users = await service.get_users_for_opportunity(api_id=api_id)
-    payload = OpportunitySavedUsersResponse(
-        api_id=api_id,
-        users=[
-            OpportunitySavedUserSchema.model_validate(saved_user)
-            for saved_user in users
-        ],
+    headers = {"Vary": "Accept"}
+    if cursor is None and accepts_ndjson(accept):
+        return NDJSONStreamingResponse(
+            service.stream_users_for_opportunity(api_id),
+            OpportunitySavedUserSchema,
+            headers=headers,
+        )
+    try:
+        users, next_cursor = await service.get_users_for_opportunity(
+            api_id=api_id, cursor=cursor, limit=limit
+        )
+    except InvalidCursorError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)
+        ) from exc
+    payload = OpportunitySavedUsersResponse.model_validate(
+        {"api_id": api_id, "users": users, "next_cursor": next_cursor},
+        from_attributes=True,
     )
-    return payload
+    return JSONBytesResponse(payload, headers=headers)
 
 
 __all__ = ["router"]
@@ -15,12 +15,18 @@ class SignUpRequest(BaseModel):
         max_length=255,
         description="User's full name collected during onboarding.",
     )
+    issue_session: bool = Field(
+        default=False, description="Also return a short-lived backend session token."
+    )
 
 
 class SignInRequest(BaseModel):
     """Request payload for /auth/login."""
 
     id_token: str = Field(..., min_length=1, description="Firebase ID token.")
+    issue_session: bool = Field(
+        default=False, description="Also return a short-lived backend session token."
+    )
 
 
 class UserPayload(BaseModel):
@@ -39,6 +45,13 @@ class AuthResponse(BaseModel):
 
     user: UserPayload
     is_new_user: bool = False
+    session_token: str | None = Field(
+        default=None,
+        description="Backend bearer token accepted until session_expires_at.",
+    )
+    session_expires_at: int | None = Field(
+        default=None, description="Session token expiry as a Unix timestamp."
+    )
 
 
 __all__ = [
@@ -2,7 +2,12 @@
 
 from __future__ import annotations
 
-from pydantic import BaseModel
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel, ConfigDict, Field, field_serializer
+
+MAX_BATCH_ITEMS = 100
 
 
 class FriendRequestSchema(BaseModel):
@@ -14,9 +19,57 @@ class ManageFriendRequestSchema(BaseModel):
     accept: bool
 
 
+class FriendSchema(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    email: str
+    full_name: Optional[str] = None
+    is_active: bool
+    created_at: datetime
+    updated_at: datetime
+
+    # Keep jsonable_encoder's "+00:00" offsets; pydantic-core writes "Z".
+    @field_serializer("created_at", "updated_at", when_used="json")
+    def _isoformat(self, value: datetime) -> str:
+        return value.isoformat()
+
+
+class FriendsListResponse(BaseModel):
+    friends: list[FriendSchema]
+    next_cursor: Optional[str] = None
+
+
 class PendingFriendRequestSchema(BaseModel):
     id: int
     sender_email: str
     sender_name: str
     status: str
     created_at: str
+
+
+class PendingFriendRequestsResponse(BaseModel):
+    pending_requests: list[PendingFriendRequestSchema]
+    next_cursor: Optional[str] = None
+
+
+class BatchFriendRequestSchema(BaseModel):
+    friend_emails: list[str] = Field(
+        ..., min_length=1, max_length=MAX_BATCH_ITEMS, description="Emails to invite."
+    )
+
+
+class BatchManageFriendRequestSchema(BaseModel):
+    requests: list[ManageFriendRequestSchema] = Field(
+        ..., min_length=1, max_length=MAX_BATCH_ITEMS
+    )
+
+
+class FriendRequestResultSchema(BaseModel):
+    friend_email: str
+    result: str
+
+
+class ManageFriendRequestResultSchema(BaseModel):
+    request_id: int
+    result: str
@@ -1,9 +1,16 @@
-from pydantic import BaseModel
-from typing import Optional, List
+from datetime import datetime
+from pydantic import BaseModel, Field
+from typing import Annotated, Optional, List
+
+from app.models.swipeevents import SwipeDirection
+
+
+# api_id is stored in a bigint column.
+ApiId = Annotated[int, Field(ge=0, le=2**63 - 1)]
 
 
 class OpportunityBase(BaseModel):
-    api_id: int
+    api_id: ApiId
     title: str
     description: str
     url: str
@@ -11,6 +18,8 @@ class OpportunityBase(BaseModel):
     organization_logo: Optional[str] = None
     dates: Optional[str] = None
     duration: Optional[str] = None
+    latitude: Optional[float] = Field(default=None, ge=-90, le=90)
+    longitude: Optional[float] = Field(default=None, ge=-180, le=180)
 
 
 class OpportunityCreateSchema(OpportunityBase):
@@ -19,6 +28,7 @@ class OpportunityCreateSchema(OpportunityBase):
 
 class OpportunityResponseSchema(OpportunityBase):
     id: int
+    save_count: int = 0
 
     class Config:
         from_attributes = True
@@ -30,6 +40,10 @@ class SaveOpportunityResponse(BaseModel):
 
 class SavedOpportunitiesResponse(BaseModel):
     opportunities: List[OpportunityResponseSchema]
+    # api_ids unsaved since the cursor; always empty until unsaving exists.
+    removed: List[int] = Field(default_factory=list)
+    next_cursor: Optional[str] = None
+    has_more: bool = False
 
 
 class OpportunitySavedUserSchema(BaseModel):
@@ -44,6 +58,100 @@ class OpportunitySavedUserSchema(BaseModel):
 class OpportunitySavedUsersResponse(BaseModel):
     api_id: int
     users: List[OpportunitySavedUserSchema]
+    next_cursor: Optional[str] = None
+
+
+class OpportunitySaverSchema(OpportunitySavedUserSchema):
+    is_friend: bool
+
+
+class OpportunitySaversSchema(BaseModel):
+    api_id: int
+    save_count: int
+    friend_save_count: int
+    users: List[OpportunitySaverSchema]
+
+
+class OpportunitySaversBatchResponse(BaseModel):
+    opportunities: List[OpportunitySaversSchema]
+
+
+class NearbyOpportunitySchema(OpportunityResponseSchema):
+    distance_km: float
+
+
+class NearbyOpportunitiesResponse(BaseModel):
+    opportunities: List[NearbyOpportunitySchema]
+
+
+class TrendingOpportunitySchema(OpportunityResponseSchema):
+    distance_km: Optional[float] = None
+
+
+class TrendingOpportunitiesResponse(BaseModel):
+    opportunities: List[TrendingOpportunitySchema]
+
+
+class SwipeDeckResponse(BaseModel):
+    opportunities: List[NearbyOpportunitySchema]
+    next_cursor: Optional[str] = None
+
+
+class DismissOpportunityResponse(BaseModel):
+    message: str
+
+
+class OpportunityTextSearchResponse(BaseModel):
+    opportunities: List[OpportunityResponseSchema]
+    next_cursor: Optional[str] = None
+
+
+class OpportunityClusterSchema(BaseModel):
+    latitude: float
+    longitude: float
+    count: int
+    opportunity_id: Optional[int] = None
+
+    class Config:
+        from_attributes = True
+
+
+class OpportunityClustersResponse(BaseModel):
+    zoom: int
+    clusters: List[OpportunityClusterSchema]
+
+
+class SaveOpportunitiesBatchSchema(BaseModel):
+    """Payload for saving several swiped opportunities at once."""
+
+    opportunities: List[OpportunityCreateSchema] = Field(
+        ..., min_length=1, max_length=100
+    )
+
+
+class SwipeEventSchema(BaseModel):
+    api_id: ApiId
+    direction: SwipeDirection
+    swiped_at: Optional[datetime] = None
+
+
+class SwipeEventsBatchSchema(BaseModel):
+    """Payload for recording swipes made since the last upload."""
+
+    events: List[SwipeEventSchema] = Field(..., min_length=1, max_length=100)
+
+
+class SwipeEventsAcceptedResponse(BaseModel):
+    accepted: int
+
+
+class SaveOpportunityResultSchema(BaseModel):
+    api_id: int
+    saved: bool
+
+
+class SaveOpportunitiesBatchResponse(BaseModel):
+    results: List[SaveOpportunityResultSchema]
 
 
 __all__ = [
@@ -53,4 +161,22 @@ __all__ = [
     "SavedOpportunitiesResponse",
     "OpportunitySavedUserSchema",
     "OpportunitySavedUsersResponse",
+    "OpportunitySaverSchema",
+    "OpportunitySaversSchema",
+    "OpportunitySaversBatchResponse",
+    "NearbyOpportunitySchema",
+    "NearbyOpportunitiesResponse",
+    "TrendingOpportunitySchema",
+    "TrendingOpportunitiesResponse",
+    "SwipeDeckResponse",
+    "DismissOpportunityResponse",
+    "OpportunityTextSearchResponse",
+    "OpportunityClusterSchema",
+    "OpportunityClustersResponse",
+    "SaveOpportunitiesBatchSchema",
+    "SwipeEventSchema",
+    "SwipeEventsBatchSchema",
+    "SwipeEventsAcceptedResponse",
+    "SaveOpportunityResultSchema",
+    "SaveOpportunitiesBatchResponse",
 ]
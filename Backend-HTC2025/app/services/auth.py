@@ -2,13 +2,27 @@
 
 from __future__ import annotations
 
+import hashlib
+from functools import lru_cache
 from typing import Any
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.integrations.firebase import FirebaseAuthClient
+from app.config import settings
+from app.integrations.firebase import (
+    FirebaseAuthClient,
+    FirebasePublicKeysUnavailableError,
+)
 from app.models.user import User
-from app.services.users import UserLookupService
+from app.services.cache import ExpiringLRUCache
+from app.services.session_tokens import (
+    ExpiredSessionTokenError,
+    SessionTokenError,
+    SessionTokenSigner,
+)
+from app.services.users import UserIdentity, UserLookupService
+
+ClaimsCache = ExpiringLRUCache[bytes, dict[str, Any]]
 
 
 class AuthServiceError(Exception):
@@ -27,6 +41,25 @@ class UserNotFoundError(AuthServiceError):
     """Raised when no local user matches the Firebase token."""
 
 
+class AuthUnavailableError(AuthServiceError):
+    """Raised when tokens cannot be verified yet (e.g. keys not loaded)."""
+
+
+class InvalidSessionError(InvalidCredentialsError):
+    """Raised when a backend session token is malformed or tampered with."""
+
+
+class SessionExpiredError(InvalidSessionError):
+    """Raised when a backend session token has expired."""
+
+
+@lru_cache(maxsize=1)
+def get_verified_claims_cache() -> ClaimsCache:
+    """Return the worker-wide cache of verified Firebase token claims."""
+
+    return ExpiringLRUCache(maxsize=settings.auth_claims_cache_size)
+
+
 class AuthService:
     """Encapsulates Firebase-backed sign-up/sign-in operations."""
 
@@ -35,15 +68,19 @@ class AuthService:
         session: AsyncSession,
         firebase_auth: FirebaseAuthClient,
         user_lookup: UserLookupService,
+        claims_cache: ClaimsCache | None = None,
+        session_tokens: SessionTokenSigner | None = None,
     ) -> None:
         self._session = session
         self._firebase_auth = firebase_auth
         self._user_lookup = user_lookup
+        self._claims_cache = claims_cache
+        self._session_tokens = session_tokens
 
     async def sign_up(self, token: str, full_name: str) -> tuple[User, bool]:
         """Create or update a local user for the given Firebase token."""
 
-        claims = self._decode_token(token)
+        claims = await self._decode_token(token)
         email = self._extract_email(claims)
 
         normalized_name = full_name.strip()
@@ -59,6 +96,7 @@ class AuthService:
             is_new_user = True
         else:
             if normalized_name and user.full_name != normalized_name:
+                # The commit evicts this email from the identity cache.
                 user.full_name = normalized_name
                 await self._session.commit()
                 await self._session.refresh(user)
@@ -68,7 +106,7 @@ class AuthService:
     async def sign_in(self, token: str) -> User:
         """Return the existing user that corresponds to the Firebase token."""
 
-        claims = self._decode_token(token)
+        claims = await self._decode_token(token)
         email = self._extract_email(claims)
 
         user = await self._user_lookup.get_by_email(email)
@@ -77,12 +115,70 @@ class AuthService:
 
         return user
 
-    def _decode_token(self, token: str) -> dict[str, Any]:
+    async def authenticate(self, token: str) -> UserIdentity:
+        """Resolve a Firebase or backend session token to the caller's identity.
+
+        Unlike ``sign_in`` this goes through the identity cache, so repeat
+        requests with a known token touch neither Firebase nor the database.
+        Session tokens are checked with a single HMAC and never hit either.
+        """
+
+        if SessionTokenSigner.is_session_token(token):
+            return self._verify_session_token(token)
+
+        claims = await self._decode_token(token)
+        email = self._extract_email(claims)
+
+        identity = await self._user_lookup.get_identity_by_email(email)
+        if identity is None:
+            raise UserNotFoundError(f"No user record found for email '{email}'.")
+
+        return identity
+
+    def issue_session_token(self, user: User) -> tuple[str, int] | None:
+        """Return a backend session token and its expiry, if session mode is on."""
+
+        if self._session_tokens is None:
+            return None
+        return self._session_tokens.issue(UserIdentity.from_user(user))
+
+    def _verify_session_token(self, token: str) -> UserIdentity:
+        if self._session_tokens is None:
+            raise InvalidSessionError("Session tokens are not enabled.")
+
+        try:
+            return self._session_tokens.verify(token)
+        except ExpiredSessionTokenError as exc:
+            raise SessionExpiredError(
+                "Session token expired; sign in again with a Firebase ID token."
+            ) from exc
+        except SessionTokenError as exc:
+            raise InvalidSessionError("Invalid session token.") from exc
+
+    async def _decode_token(self, token: str) -> dict[str, Any]:
+        # The frontend reuses an ID token for up to an hour, so cache the
+        # verified claims until the token's own expiry to skip the RSA check.
+        cache_key = hashlib.sha256(token.encode()).digest()
+        if self._claims_cache is not None:
+            cached_claims = self._claims_cache.get(cache_key)
+            if cached_claims is not None:
+                return cached_claims
+
         try:
-            return self._firebase_auth.verify_token(token)
-        except Exception as exc:  # firebase_admin raises several custom errors
+            claims = await self._firebase_auth.verify_token_async(token)
+        except FirebasePublicKeysUnavailableError as exc:
+            raise AuthUnavailableError(
+                "Token verification is temporarily unavailable."
+            ) from exc
+        except Exception as exc:  # verification raises several error types
             raise InvalidCredentialsError("Invalid Firebase ID token.") from exc
 
+        expires_at = claims.get("exp")
+        if self._claims_cache is not None and isinstance(expires_at, (int, float)):
+            self._claims_cache.set(cache_key, claims, expires_at=float(expires_at))
+
+        return claims
+
     @staticmethod
     def _extract_email(claims: dict[str, Any]) -> str:
         email = claims.get("email")
@@ -94,7 +190,11 @@ class AuthService:
 __all__ = [
     "AuthService",
     "AuthServiceError",
+    "AuthUnavailableError",
     "InvalidCredentialsError",
+    "InvalidSessionError",
     "MissingEmailClaimError",
+    "SessionExpiredError",
     "UserNotFoundError",
+    "get_verified_claims_cache",
 ]
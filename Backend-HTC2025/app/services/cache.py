@@ -0,0 +1,176 @@
+"""Small in-process caches shared across the requests handled by a worker."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Generic, TypeVar
+
+logger = logging.getLogger(__name__)
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class ExpiringLRUCache(Generic[K, V]):
+    """Bounded LRU cache whose entries expire at an absolute timestamp.
+
+    The cache is meant to be used from the event loop only, so it does not
+    take any locks. Hit/miss counters are kept so callers can report how much
+    work the cache saves.
+    """
+
+    def __init__(
+        self, maxsize: int, *, clock: Callable[[], float] = time.time
+    ) -> None:
+        if maxsize < 1:
+            raise ValueError("maxsize must be a positive integer.")
+        self._maxsize = maxsize
+        self._clock = clock
+        self._entries: OrderedDict[K, tuple[V, float]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: K) -> V | None:
+        """Return the cached value for key, or None when missing or expired."""
+
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        value, expires_at = entry
+        if expires_at <= self._clock():
+            del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: K, value: V, *, expires_at: float) -> None:
+        """Store value until the given epoch timestamp, evicting the LRU entry."""
+
+        if expires_at <= self._clock():
+            return
+
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: K) -> None:
+        """Drop key from the cache if present."""
+
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop every entry and reset the counters."""
+
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> dict[str, int | float]:
+        """Return size and hit/miss counters for metrics endpoints."""
+
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self._maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+
+class StaleWhileRevalidateCache(Generic[K, V]):
+    """Bounded async cache that serves stale values while refreshing them.
+
+    Values are fresh for ``ttl_seconds``; for ``stale_seconds`` after that they
+    are still returned immediately while one background task reloads them.
+    Concurrent misses for the same key share a single load (single flight).
+    Like ``ExpiringLRUCache`` it is meant for a single event loop.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        *,
+        ttl_seconds: float,
+        stale_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._entries: ExpiringLRUCache[K, tuple[V, float]] = ExpiringLRUCache(
+            maxsize, clock=clock
+        )
+        self._ttl_seconds = ttl_seconds
+        self._stale_seconds = stale_seconds
+        self._clock = clock
+        self._inflight: dict[K, asyncio.Task[V]] = {}
+        self.stale_hits = 0
+
+    async def get_or_load(self, key: K, loader: Callable[[], Awaitable[V]]) -> V:
+        """Return the value for key, loading it with loader when needed."""
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            value, fresh_until = entry
+            if fresh_until <= self._clock():
+                self.stale_hits += 1
+                self._load(key, loader).add_done_callback(_log_refresh_failure)
+            return value
+
+        return await asyncio.shield(self._load(key, loader))
+
+    def invalidate(self, key: K) -> None:
+        self._entries.invalidate(key)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.stale_hits = 0
+
+    def stats(self) -> dict[str, int | float]:
+        return {
+            **self._entries.stats(),
+            "stale_hits": self.stale_hits,
+            "inflight": len(self._inflight),
+        }
+
+    def _load(self, key: K, loader: Callable[[], Awaitable[V]]) -> asyncio.Task[V]:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._run_loader(key, loader))
+            self._inflight[key] = task
+        return task
+
+    async def _run_loader(self, key: K, loader: Callable[[], Awaitable[V]]) -> V:
+        try:
+            value = await loader()
+            now = self._clock()
+            self._entries.set(
+                key,
+                (value, now + self._ttl_seconds),
+                expires_at=now + self._ttl_seconds + self._stale_seconds,
+            )
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
+
+def _log_refresh_failure(task: asyncio.Task) -> None:
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning(
+            "Background cache refresh failed; serving stale value.",
+            exc_info=task.exception(),
+        )
+
+
+__all__ = ["ExpiringLRUCache", "StaleWhileRevalidateCache"]
@@ -0,0 +1,297 @@
+"""In-memory hierarchical grid for clustering map markers by zoom level."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from functools import lru_cache
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import settings
+from app.database.postgres import async_session_factory
+from app.models.opportunities import Opportunity
+
+logger = logging.getLogger(__name__)
+
+# Grid cells per 360 degrees at zoom 0; at 512px map tiles this is ~64px per
+# cell, roughly one marker's footprint.
+_CELLS_PER_WORLD = 8
+
+# updated_at is the writing transaction's start time, so a row can commit
+# after a reload has read past its stamp; re-reading this far back catches
+# it. Ingestion transactions merge one page and take well under this.
+_REFRESH_OVERLAP = timedelta(minutes=5)
+
+
+@dataclass(frozen=True, slots=True)
+class Cluster:
+    """A group of opportunities rendered as one marker."""
+
+    latitude: float
+    longitude: float
+    count: int
+    opportunity_id: int | None
+
+
+class ClusterIndex:
+    """Per-zoom grids of (count, coordinate sums) over opportunity points.
+
+    Every zoom level keeps its own grid whose cells halve in size per level,
+    so a query only reads the cells inside the viewport and the response size
+    tracks the screen, not the dataset. Points can be added, moved or removed
+    one at a time, which keeps reloads of changed rows incremental.
+    """
+
+    def __init__(self, max_zoom: int) -> None:
+        self._max_zoom = max_zoom
+        self._points: dict[int, tuple[float, float]] = {}
+        # cell -> [count, sum_lat, sum_lng, xor of ids]; with a count of one
+        # the xor is that point's id, which survives removals without a set.
+        self._grids: list[dict[tuple[int, int], list]] = [
+            {} for _ in range(max_zoom + 1)
+        ]
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def upsert(self, opportunity_id: int, latitude: float, longitude: float) -> None:
+        previous = self._points.get(opportunity_id)
+        if previous == (latitude, longitude):
+            return
+        if previous is not None:
+            self._apply(opportunity_id, *previous, sign=-1)
+        self._points[opportunity_id] = (latitude, longitude)
+        self._apply(opportunity_id, latitude, longitude, sign=1)
+
+    def remove(self, opportunity_id: int) -> None:
+        previous = self._points.pop(opportunity_id, None)
+        if previous is not None:
+            self._apply(opportunity_id, *previous, sign=-1)
+
+    def query(
+        self,
+        min_lat: float,
+        min_lng: float,
+        max_lat: float,
+        max_lng: float,
+        zoom: int,
+    ) -> list[Cluster]:
+        """Return the clusters whose cells intersect the bounding box.
+
+        A box with ``min_lng > max_lng`` crosses the antimeridian.
+        """
+
+        zoom = max(0, min(zoom, self._max_zoom))
+        if min_lng > max_lng:
+            return self.query(min_lat, min_lng, max_lat, 180.0, zoom) + self.query(
+                min_lat, -180.0, max_lat, max_lng, zoom
+            )
+
+        grid = self._grids[zoom]
+        min_x, min_y = self._cell(min_lat, min_lng, zoom)
+        max_x, max_y = self._cell(max_lat, max_lng, zoom)
+        if (max_x - min_x + 1) * (max_y - min_y + 1) <= len(grid):
+            cells = (
+                ((x, y), grid.get((x, y)))
+                for x in range(min_x, max_x + 1)
+                for y in range(min_y, max_y + 1)
+            )
+        else:
+            cells = (
+                (cell, stats)
+                for cell, stats in grid.items()
+                if min_x <= cell[0] <= max_x and min_y <= cell[1] <= max_y
+            )
+
+        clusters = []
+        for _, stats in cells:
+            if stats is None:
+                continue
+            count, sum_lat, sum_lng, id_xor = stats
+            clusters.append(
+                Cluster(
+                    latitude=sum_lat / count,
+                    longitude=sum_lng / count,
+                    count=count,
+                    opportunity_id=id_xor if count == 1 else None,
+                )
+            )
+        return clusters
+
+    def zoom_for_viewport(
+        self,
+        min_lat: float,
+        min_lng: float,
+        max_lat: float,
+        max_lng: float,
+        zoom: int,
+        max_cells: int,
+    ) -> int:
+        """Return the finest zoom <= zoom whose grid has at most max_cells in the box.
+
+        Guards against viewports that are far larger than the requested zoom
+        implies, so the response never grows with the dataset.
+        """
+
+        zoom = max(0, min(zoom, self._max_zoom))
+        width = max_lng - min_lng if max_lng >= min_lng else max_lng - min_lng + 360
+        height = max_lat - min_lat
+        while zoom > 0:
+            size = 360.0 / (_CELLS_PER_WORLD * 2**zoom)
+            if (width / size + 1) * (height / size + 1) <= max_cells:
+                break
+            zoom -= 1
+        return zoom
+
+    def _cell(self, latitude: float, longitude: float, zoom: int) -> tuple[int, int]:
+        x, y = self._finest_cell(latitude, longitude)
+        shift = self._max_zoom - zoom
+        return x >> shift, y >> shift
+
+    def _finest_cell(self, latitude: float, longitude: float) -> tuple[int, int]:
+        size = 360.0 / (_CELLS_PER_WORLD * 2**self._max_zoom)
+        return (
+            math.floor((min(longitude, 179.999999) + 180.0) / size),
+            math.floor((min(latitude, 89.999999) + 90.0) / size),
+        )
+
+    def _apply(
+        self, opportunity_id: int, latitude: float, longitude: float, *, sign: int
+    ) -> None:
+        # Cells nest exactly, so each coarser cell is the finer one shifted.
+        x, y = self._finest_cell(latitude, longitude)
+        shift = self._max_zoom
+        for grid in self._grids:
+            cell = (x >> shift, y >> shift)
+            shift -= 1
+            stats = grid.get(cell)
+            if stats is None:
+                grid[cell] = [sign, sign * latitude, sign * longitude, opportunity_id]
+                continue
+            stats[0] += sign
+            stats[1] += sign * latitude
+            stats[2] += sign * longitude
+            stats[3] ^= opportunity_id
+            if stats[0] == 0:
+                del grid[cell]
+
+
+@lru_cache(maxsize=1)
+def get_cluster_index() -> ClusterIndex:
+    """Return the worker-wide opportunity cluster index."""
+
+    return ClusterIndex(max_zoom=settings.cluster_max_zoom)
+
+
+async def load_cluster_index(
+    index: ClusterIndex,
+    session_factory: async_sessionmaker[AsyncSession],
+    since: datetime | None = None,
+) -> datetime | None:
+    """Apply opportunities updated after since (all of them if None) to index.
+
+    Rows that lost their coordinates are removed. Returns the newest
+    ``updated_at`` seen, to pass as since next time.
+    """
+
+    stmt = select(
+        Opportunity.id,
+        Opportunity.latitude,
+        Opportunity.longitude,
+        Opportunity.updated_at,
+    )
+    if since is None:
+        stmt = stmt.where(
+            Opportunity.latitude.is_not(None), Opportunity.longitude.is_not(None)
+        )
+    else:
+        stmt = stmt.where(Opportunity.updated_at > since - _REFRESH_OVERLAP)
+
+    latest = since
+    async with session_factory(info={"route": "cluster-index"}) as session:
+        # Small partitions keep each burst of index work short, so a load
+        # running in the background doesn't stall requests on the event loop.
+        result = await session.stream(stmt.execution_options(yield_per=1000))
+        async for rows in result.partitions():
+            for opportunity_id, latitude, longitude, updated_at in rows:
+                if latitude is None or longitude is None:
+                    index.remove(opportunity_id)
+                else:
+                    index.upsert(opportunity_id, latitude, longitude)
+                if latest is None or updated_at > latest:
+                    latest = updated_at
+    return latest
+
+
+class ClusterIndexRefresher:
+    """Keep a process's cluster index in step with the opportunities table.
+
+    The first run loads every located opportunity; later runs re-read only
+    rows updated since, so crawls and saves made by any process show up in
+    every worker within one interval.
+    """
+
+    def __init__(
+        self,
+        index: ClusterIndex,
+        session_factory: async_sessionmaker[AsyncSession],
+        *,
+        interval_seconds: int,
+    ) -> None:
+        self._index = index
+        self._session_factory = session_factory
+        self._interval_seconds = interval_seconds
+        self._since: datetime | None = None
+        self._loaded = False
+        self._task: asyncio.Task[None] | None = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run_loop())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def run_once(self) -> None:
+        self._since = await load_cluster_index(
+            self._index, self._session_factory, self._since
+        )
+        if not self._loaded:
+            self._loaded = True
+            logger.info("Cluster index loaded with %d opportunities.", len(self._index))
+
+    async def _run_loop(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except Exception:
+                logger.error("Refreshing the cluster index failed.", exc_info=True)
+            await asyncio.sleep(self._interval_seconds)
+
+
+@lru_cache(maxsize=1)
+def get_cluster_index_refresher() -> ClusterIndexRefresher:
+    """Return the process-wide refresher of ``get_cluster_index``."""
+
+    return ClusterIndexRefresher(
+        get_cluster_index(),
+        async_session_factory,
+        interval_seconds=settings.cluster_refresh_interval_seconds,
+    )
+
+
+__all__ = [
+    "Cluster",
+    "ClusterIndex",
+    "ClusterIndexRefresher",
+    "get_cluster_index",
+    "get_cluster_index_refresher",
+    "load_cluster_index",
+]
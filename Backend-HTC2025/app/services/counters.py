@@ -0,0 +1,141 @@
+"""Sharded, periodically merged opportunity save counters."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from functools import lru_cache
+from typing import Any
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import settings
+from app.database.postgres import async_session_factory
+from app.models.opportunities import Opportunity
+from app.models.savecountshards import SaveCountShard
+
+logger = logging.getLogger(__name__)
+
+_MERGE_BATCH_SIZE = 1000
+
+
+def increment_save_counts(saved: Any, name: str = "counted") -> Any:
+    """Return a CTE adding one to the save counter shards per ``saved`` row.
+
+    ``saved`` is a CTE of newly inserted saved-opportunity rows with
+    ``user_id`` and ``opportunity_id`` columns, so the counters change in the
+    same statement (and transaction) as the saves. Spreading users over
+    ``save_count_shards`` rows keeps concurrent saves of one popular
+    opportunity from queueing on a single row lock. The CTE returns one
+    ``opportunity_id`` per touched shard.
+    """
+    shard = (saved.c.user_id % settings.save_count_shards).label("shard")
+    deltas = select(saved.c.opportunity_id, shard, func.count()).group_by(
+        saved.c.opportunity_id, shard
+    )
+    insert = pg_insert(SaveCountShard).from_select(
+        ["opportunity_id", "shard", "delta"], deltas
+    )
+    return (
+        insert.on_conflict_do_update(
+            index_elements=[SaveCountShard.opportunity_id, SaveCountShard.shard],
+            set_={"delta": SaveCountShard.delta + insert.excluded.delta},
+        )
+        .returning(SaveCountShard.opportunity_id)
+        .cte(name)
+    )
+
+
+class SaveCountMerger:
+    """Fold counter shards into ``Opportunity.save_count`` on an interval."""
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        *,
+        interval_seconds: int,
+    ) -> None:
+        self._session_factory = session_factory
+        self._interval_seconds = interval_seconds
+        self._task: asyncio.Task[None] | None = None
+        self.merged = 0
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run_loop())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def run_once(self) -> int:
+        """Merge every pending shard; return how many opportunities changed."""
+
+        merged = 0
+        while True:
+            batch = await self._merge_batch()
+            merged += batch
+            if batch < _MERGE_BATCH_SIZE:
+                break
+        self.merged += merged
+        return merged
+
+    async def _merge_batch(self) -> int:
+        # Saves lock the opportunity row (upsert) before its shard row, so
+        # take the opportunity locks first, in id order, to match them.
+        locked = (
+            select(Opportunity.id)
+            .where(Opportunity.id.in_(select(SaveCountShard.opportunity_id)))
+            .order_by(Opportunity.id)
+            .limit(_MERGE_BATCH_SIZE)
+            .with_for_update()
+        )
+        async with self._session_factory(info={"route": "save-count-merge"}) as session:
+            async with session.begin():
+                ids = (await session.execute(locked)).scalars().all()
+                if not ids:
+                    return 0
+                drained = (
+                    delete(SaveCountShard)
+                    .where(SaveCountShard.opportunity_id.in_(ids))
+                    .returning(SaveCountShard.opportunity_id, SaveCountShard.delta)
+                    .cte("drained")
+                )
+                totals = (
+                    select(
+                        drained.c.opportunity_id,
+                        func.sum(drained.c.delta).label("delta"),
+                    )
+                    .group_by(drained.c.opportunity_id)
+                    .subquery("totals")
+                )
+                await session.execute(
+                    update(Opportunity)
+                    .where(Opportunity.id == totals.c.opportunity_id)
+                    .values(save_count=Opportunity.save_count + totals.c.delta)
+                )
+        return len(ids)
+
+    async def _run_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self._interval_seconds)
+            try:
+                await self.run_once()
+            except Exception:
+                logger.error("Merging save counters failed.", exc_info=True)
+
+
+@lru_cache(maxsize=1)
+def get_save_count_merger() -> SaveCountMerger:
+    """Return the process-wide save counter merger."""
+
+    return SaveCountMerger(
+        async_session_factory,
+        interval_seconds=settings.save_count_merge_interval_seconds,
+    )
+
+
+__all__ = ["SaveCountMerger", "get_save_count_merger", "increment_save_counts"]
@@ -0,0 +1,185 @@
+"""Per-user swipe deck of nearby opportunities the user hasn't seen yet."""
+
+from __future__ import annotations
+
+import asyncio
+import bisect
+import time
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Sequence
+
+from sqlalchemy import exists, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.database.postgres import release_connection
+from app.models.dismissedopportunities import DismissedOpportunity
+from app.models.opportunities import Opportunity
+from app.models.savedopportunities import SavedOpportunity
+from app.models.user import User
+from app.services.cache import ExpiringLRUCache
+from app.services.opportunity import radius_filter
+from app.services.pagination import Keyset, decode_cursor, encode_cursor
+
+DeckKey = tuple[float, int]
+_DECK_KEY_TYPES = (float, int)
+
+# ~100 m; small GPS jitter keeps the same deck.
+_ORIGIN_DECIMALS = 3
+
+
+@dataclass(slots=True)
+class _Deck:
+    """Materialized (distance, id) ordering for one user and location."""
+
+    origin: tuple[float, float, float]
+    # Every entry sorts after start; None means the deck begins at the top.
+    start: DeckKey | None
+    entries: list[DeckKey] = field(default_factory=list)
+    exhausted: bool = False
+    # Held by a request from locating its cursor until its page is read, so
+    # concurrent requests never trim or extend entries under each other.
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+
+DeckCache = ExpiringLRUCache[int, _Deck]
+
+
+@lru_cache(maxsize=1)
+def get_deck_cache() -> DeckCache:
+    """Return the worker-wide user id -> swipe deck cache."""
+
+    return ExpiringLRUCache(maxsize=settings.deck_cache_size)
+
+
+class SwipeDeckService:
+    """Serve a user's deck from a cached, chunk-materialized ordering.
+
+    The exclusion anti-join against saved and dismissed opportunities runs
+    once per chunk of ``chunk_size`` cards, not once per page. Each page then
+    only re-checks its own few ids by primary key, which drops cards saved or
+    dismissed after the chunk was built. Cursors carry the (distance, id) of
+    the last card, so a deck evicted from the cache (or served by another
+    worker) is rebuilt from that position. Requests for the same cached deck
+    take turns, since materializing a chunk trims and extends it in place.
+    """
+
+    def __init__(
+        self, read_session: AsyncSession, cache: DeckCache, chunk_size: int
+    ) -> None:
+        self._read_session = read_session
+        self._cache = cache
+        self._chunk_size = chunk_size
+
+    async def get_page(
+        self,
+        user: User,
+        *,
+        latitude: float,
+        longitude: float,
+        radius_km: float,
+        cursor: str | None = None,
+        limit: int = 20,
+    ) -> tuple[list[tuple[Opportunity, float]], str | None]:
+        """Return the next cards (with distances) and the cursor after them."""
+
+        after = decode_cursor("deck", cursor, _DECK_KEY_TYPES) if cursor else None
+        origin = (
+            round(latitude, _ORIGIN_DECIMALS),
+            round(longitude, _ORIGIN_DECIMALS),
+            radius_km,
+        )
+        deck = self._deck_for(user.id, origin, after)
+        page: list[tuple[Opportunity, float]] = []
+        last_key = after
+        async with deck.lock:
+            position = bisect.bisect_right(deck.entries, after) if after else 0
+            while len(page) < limit:
+                if position >= len(deck.entries):
+                    if deck.exhausted:
+                        break
+                    position = await self._materialize(deck, user, position)
+                    continue
+                batch = deck.entries[position : position + limit - len(page)]
+                position += len(batch)
+                last_key = batch[-1]
+                page.extend(await self._visible_cards(user, batch))
+            has_more = position < len(deck.entries) or not deck.exhausted
+
+        await release_connection(self._read_session)
+        next_cursor = (
+            encode_cursor("deck", last_key) if has_more and last_key else None
+        )
+        return page, next_cursor
+
+    def _deck_for(
+        self, user_id: int, origin: tuple[float, float, float], after: DeckKey | None
+    ) -> _Deck:
+        deck = self._cache.get(user_id)
+        covers_cursor = deck is not None and (
+            deck.start is None or (after is not None and after >= deck.start)
+        )
+        if deck is None or deck.origin != origin or not covers_cursor:
+            deck = _Deck(origin=origin, start=after)
+            self._cache.set(
+                user_id, deck, expires_at=time.time() + settings.deck_cache_ttl_seconds
+            )
+        return deck
+
+    async def _materialize(self, deck: _Deck, user: User, position: int) -> int:
+        """Append the next chunk to deck; return position adjusted for trimming.
+
+        The caller must hold ``deck.lock``.
+        """
+
+        # Cards behind the reader are not needed again; keep memory flat for
+        # users who swipe through thousands of cards.
+        if position:
+            deck.start = deck.entries[position - 1]
+            del deck.entries[:position]
+            position = 0
+
+        latitude, longitude, radius_km = deck.origin
+        distance, within_radius = radius_filter(latitude, longitude, radius_km)
+        keyset = Keyset("deck", distance, Opportunity.id)
+        stmt = keyset.select().where(*within_radius, *_unseen_by(user))
+        resume_from = deck.entries[-1] if deck.entries else deck.start
+        stmt = keyset.seek(stmt, resume_from).limit(self._chunk_size)
+
+        result = await self._read_session.execute(stmt)
+        chunk = [(float(row[0]), int(row[1])) for row in result]
+        deck.entries.extend(chunk)
+        deck.exhausted = len(chunk) < self._chunk_size
+        return position
+
+    async def _visible_cards(
+        self, user: User, batch: Sequence[DeckKey]
+    ) -> list[tuple[Opportunity, float]]:
+        stmt = select(Opportunity).where(
+            Opportunity.id.in_([opportunity_id for _, opportunity_id in batch]),
+            *_unseen_by(user),
+        )
+        result = await self._read_session.execute(stmt)
+        by_id = {opportunity.id: opportunity for opportunity in result.scalars()}
+        return [
+            (by_id[opportunity_id], distance)
+            for distance, opportunity_id in batch
+            if opportunity_id in by_id
+        ]
+
+
+def _unseen_by(user: User) -> list:
+    return [
+        ~exists().where(
+            SavedOpportunity.user_id == user.id,
+            SavedOpportunity.opportunity_id == Opportunity.id,
+        ),
+        ~exists().where(
+            DismissedOpportunity.user_id == user.id,
+            DismissedOpportunity.opportunity_id == Opportunity.id,
+        ),
+    ]
+
+
+__all__ = ["SwipeDeckService", "get_deck_cache"]
@@ -1,56 +1,106 @@
+import enum
+from collections.abc import AsyncGenerator
+from datetime import datetime
+
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.engine import Row
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from typing import Sequence
-from sqlalchemy import select, or_, and_
+from sqlalchemy import (
+    BigInteger,
+    case,
+    and_,
+    exists,
+    func,
+    literal,
+    or_,
+    select,
+    union_all,
+    update,
+)
+from app.config import settings
+from app.database.postgres import (
+    read_your_writes,
+    release_connection,
+    stream_scalar_partitions,
+)
 from app.models.user import User
 from app.models.friendships import Friendship
 from app.models.friendrequests import FriendRequest, Friend_Request_Status
+from app.services.pagination import MAX_PAGE_SIZE, Keyset
+from app.services.versions import (
+    Collection,
+    bump_collection_version,
+    bump_collection_versions,
+    get_collection_version,
+    session_caught_up_to,
+)
 
 
-class FriendsService:
-    def __init__(self, session: AsyncSession) -> None:
-        self._session = session
+# Newest friendship first; each side is backed by ix_friendships_user_idN_created_at_id.
+_FRIENDS_KEYSET = Keyset(
+    "friends", Friendship.created_at, Friendship.id, descending=True
+)
+# Newest request first; backed by ix_friendrequests_pending_receiver_id_created_at_id.
+_PENDING_KEYSET = Keyset(
+    "friend_requests", FriendRequest.created_at, FriendRequest.id, descending=True
+)
 
-    async def _already_friends(self, user1: User, user2: User) -> bool:
-        """Check if two users are already friends."""
-        user1_id, user2_id = sorted([user1.id, user2.id])
 
-        stmt = select(Friendship).where(
-            and_(
-                Friendship.user_id1 == user1_id,
-                Friendship.user_id2 == user2_id,
-            )
-        )
-        result = await self._session.execute(stmt)
-        friendship = result.scalar_one_or_none()
+def _friends_stmt(
+    user: User, after: tuple[datetime, int] | None, limit: int | None
+):
+    """Select (friend, friendship created_at, friendship id), newest first.
 
-        return friendship is not None
+    A UNION ALL over both friendship columns (each branch served by its
+    composite index) joined to users, keyset-filtered to rows after ``after``.
+    """
 
-    async def _validate_friend_request(self, sender: User, receiver: User) -> None:
-        """Validate that a friend request can be sent from sender to receiver."""
-        if sender.id == receiver.id:
-            raise ValueError("Cannot send friend request to oneself.")
+    def _friend_links(own_column, friend_column):
+        stmt = select(
+            friend_column.label("friend_id"),
+            Friendship.created_at.label("created_at"),
+            Friendship.id.label("friendship_id"),
+        ).where(own_column == user.id)
+        return _FRIENDS_KEYSET.seek(stmt, after).limit(limit)
 
-        if await self._already_friends(sender, receiver):
-            raise ValueError("Users are already friends.")
+    links = union_all(
+        _friend_links(Friendship.user_id1, Friendship.user_id2),
+        _friend_links(Friendship.user_id2, Friendship.user_id1),
+    ).subquery("friend_links")
 
-        stmt = select(FriendRequest).where(
-            or_(
-                and_(
-                    FriendRequest.sender_id == sender.id,
-                    FriendRequest.receiver_id == receiver.id,
-                ),
-                and_(
-                    FriendRequest.sender_id == receiver.id,
-                    FriendRequest.receiver_id == sender.id,
-                ),
-            )
-        )
-        result = await self._session.execute(stmt)
-        existing_request = result.scalar_one_or_none()
+    return (
+        select(User, links.c.created_at, links.c.friendship_id)
+        .join(links, links.c.friend_id == User.id)
+        .order_by(*_FRIENDS_KEYSET.order_by(links.c.created_at, links.c.friendship_id))
+        .limit(limit)
+    )
+
+
+class FriendRequestOutcome(enum.Enum):
+    """Result of attempting to send a friend request."""
+
+    created = "created"
+    already_friends = "already_friends"
+    already_pending = "already_pending"
+    user_not_found = "user_not_found"
+    self_request = "self_request"
+
+
+class ManageFriendRequestOutcome(enum.Enum):
+    """Result of accepting or rejecting a friend request."""
+
+    accepted = "accepted"
+    rejected = "rejected"
+    not_found = "not_found"
 
-        if existing_request is not None:
-            raise ValueError("A friend request already exists between these users.")
+
+class FriendsService:
+    def __init__(
+        self, session: AsyncSession, read_session: AsyncSession | None = None
+    ) -> None:
+        self._session = session
+        # Read-only list queries may go to a replica; writes always use session.
+        self._read_session = read_session or session
 
     def _create_friendship_from_request(self, friend_request: FriendRequest):
         """Create a friendship record based on an accepted friend request."""
@@ -65,19 +115,79 @@ class FriendsService:
         )
         self._session.add(friendship)
 
-    async def send_friend_request(self, sender: User, receiver: User) -> None:
-        """Send a friend request from one user to another."""
+    async def send_friend_request(
+        self, sender: User, receiver_email: str
+    ) -> FriendRequestOutcome:
+        """Send a friend request from sender to the user with receiver_email.
 
-        await self._validate_friend_request(sender, receiver)
+        Lookup, validation and insert run as one statement. The insert relies
+        on the unique (sender_id, receiver_id) constraint and the symmetric
+        user-pair index with ON CONFLICT DO NOTHING, so two concurrent sends
+        cannot both create a request.
+        """
 
-        friend_request = FriendRequest(
-            sender_id=sender.id,
-            receiver_id=receiver.id,
-            status=Friend_Request_Status.pending,
+        receiver = select(User.id).where(User.email == receiver_email).cte("receiver")
+        already_friends = exists().where(
+            Friendship.user_id1 == func.least(sender.id, receiver.c.id),
+            Friendship.user_id2 == func.greatest(sender.id, receiver.c.id),
+        )
+        already_requested = exists().where(
+            or_(
+                and_(
+                    FriendRequest.sender_id == sender.id,
+                    FriendRequest.receiver_id == receiver.c.id,
+                ),
+                and_(
+                    FriendRequest.sender_id == receiver.c.id,
+                    FriendRequest.receiver_id == sender.id,
+                ),
+            )
+        )
+        inserted = (
+            pg_insert(FriendRequest)
+            .from_select(
+                ["sender_id", "receiver_id", "status"],
+                select(
+                    literal(sender.id, BigInteger),
+                    receiver.c.id,
+                    literal(
+                        Friend_Request_Status.pending,
+                        FriendRequest.__table__.c.status.type,
+                    ),
+                ).where(
+                    receiver.c.id != sender.id, ~already_friends, ~already_requested
+                ),
+            )
+            .on_conflict_do_nothing()
+            .returning(FriendRequest.id, FriendRequest.receiver_id)
+            .cte("inserted")
+        )
+        stmt = select(
+            receiver.c.id,
+            already_friends.label("already_friends"),
+            select(inserted.c.id).scalar_subquery().label("request_id"),
+        ).add_cte(
+            bump_collection_version(
+                inserted.c.receiver_id, Collection.friend_requests, "requests_version"
+            )
         )
-        self._session.add(friend_request)
+
+        result = await self._session.execute(stmt)
+        row = result.one_or_none()
         await self._session.commit()
 
+        if row is None:
+            return FriendRequestOutcome.user_not_found
+        if row.id == sender.id:
+            return FriendRequestOutcome.self_request
+        if row.request_id is not None:
+            read_your_writes.mark_write(sender.id, row.id)
+            return FriendRequestOutcome.created
+        if row.already_friends:
+            return FriendRequestOutcome.already_friends
+        # Includes earlier rejected requests and lost races with a concurrent send.
+        return FriendRequestOutcome.already_pending
+
     async def manage_friend_request(
         self, reciever: User, request_id: int, accept: bool
     ) -> None:
@@ -101,41 +211,226 @@ class FriendsService:
         else:
             friend_request.status = Friend_Request_Status.rejected
 
+        changes = [(reciever.id, Collection.friend_requests)]
+        if accept:
+            changes += [
+                (reciever.id, Collection.friends),
+                (friend_request.sender_id, Collection.friends),
+            ]
+        await bump_collection_versions(self._session, changes)
         await self._session.commit()
+        read_your_writes.mark_write(
+            friend_request.sender_id, friend_request.receiver_id
+        )
+
+    async def send_friend_requests(
+        self, sender: User, receiver_emails: Sequence[str]
+    ) -> dict[str, FriendRequestOutcome]:
+        """Send friend requests to many users, reporting an outcome per email.
 
-    async def get_friends_list(self, user: User) -> Sequence[User]:
-        """Retrieve the list of friends for a given user."""
-        stmt = select(Friendship).where(
+        Uses two statements regardless of the batch size: one ``IN`` lookup
+        that also flags existing friendships and requests, then one multi-row
+        insert with ON CONFLICT DO NOTHING for the remaining receivers.
+        """
+
+        emails = list(dict.fromkeys(receiver_emails))
+        outcomes = dict.fromkeys(emails, FriendRequestOutcome.user_not_found)
+
+        already_friends = exists().where(
+            Friendship.user_id1 == func.least(sender.id, User.id),
+            Friendship.user_id2 == func.greatest(sender.id, User.id),
+        )
+        already_requested = exists().where(
             or_(
-                Friendship.user_id1 == user.id,
-                Friendship.user_id2 == user.id,
+                and_(
+                    FriendRequest.sender_id == sender.id,
+                    FriendRequest.receiver_id == User.id,
+                ),
+                and_(
+                    FriendRequest.sender_id == User.id,
+                    FriendRequest.receiver_id == sender.id,
+                ),
             )
         )
-        result = await self._session.execute(stmt)
-        friendships = result.scalars().all()
+        lookup = select(
+            User.id,
+            User.email,
+            already_friends.label("already_friends"),
+            already_requested.label("already_requested"),
+        ).where(User.email.in_(emails))
+        result = await self._session.execute(lookup)
 
-        friend_ids = set()
-        for friendship in friendships:
-            if friendship.user_id1 == user.id:
-                friend_ids.add(friendship.user_id2)
+        candidates: dict[int, str] = {}
+        for row in result:
+            if row.id == sender.id:
+                outcomes[row.email] = FriendRequestOutcome.self_request
+            elif row.already_friends:
+                outcomes[row.email] = FriendRequestOutcome.already_friends
+            elif row.already_requested:
+                outcomes[row.email] = FriendRequestOutcome.already_pending
             else:
-                friend_ids.add(friendship.user_id1)
+                candidates[row.id] = row.email
+
+        if candidates:
+            insert_stmt = (
+                pg_insert(FriendRequest)
+                .values(
+                    [
+                        {
+                            "sender_id": sender.id,
+                            "receiver_id": receiver_id,
+                            "status": Friend_Request_Status.pending,
+                        }
+                        for receiver_id in candidates
+                    ]
+                )
+                .on_conflict_do_nothing()
+                .returning(FriendRequest.receiver_id)
+            )
+            created = set((await self._session.execute(insert_stmt)).scalars())
+            for receiver_id, email in candidates.items():
+                # Rows skipped by ON CONFLICT lost a race with another send.
+                outcomes[email] = (
+                    FriendRequestOutcome.created
+                    if receiver_id in created
+                    else FriendRequestOutcome.already_pending
+                )
+            await bump_collection_versions(
+                self._session,
+                ((receiver_id, Collection.friend_requests) for receiver_id in created),
+            )
+            read_your_writes.mark_write(sender.id, *created)
 
-        if not friend_ids:
-            return []
+        await self._session.commit()
+        return outcomes
 
-        stmt = select(User).where(User.id.in_(friend_ids))
-        result = await self._session.execute(stmt)
-        friends = result.scalars().all()
+    async def manage_friend_requests(
+        self, reciever: User, decisions: dict[int, bool]
+    ) -> dict[int, ManageFriendRequestOutcome]:
+        """Accept or reject many pending requests addressed to reciever.
+
+        decisions maps request ids to ``accept``. One ``UPDATE ... RETURNING``
+        resolves every request, then one multi-row insert creates the
+        friendships for the accepted ones. Ids that are unknown, not addressed
+        to reciever or no longer pending come back as ``not_found``.
+        """
 
-        return friends
+        outcomes = dict.fromkeys(decisions, ManageFriendRequestOutcome.not_found)
+        accepted_ids = [
+            request_id for request_id, accept in decisions.items() if accept
+        ]
+        status_type = FriendRequest.__table__.c.status.type
+
+        update_stmt = (
+            update(FriendRequest)
+            .where(
+                FriendRequest.id.in_(list(decisions)),
+                FriendRequest.receiver_id == reciever.id,
+                FriendRequest.status == Friend_Request_Status.pending,
+            )
+            .values(
+                status=case(
+                    (
+                        FriendRequest.id.in_(accepted_ids),
+                        literal(Friend_Request_Status.accepted, status_type),
+                    ),
+                    else_=literal(Friend_Request_Status.rejected, status_type),
+                )
+            )
+            .returning(FriendRequest.id, FriendRequest.sender_id, FriendRequest.status)
+        )
+        result = await self._session.execute(update_stmt)
+        updated = result.all()
+
+        new_friend_ids = []
+        for request_id, sender_id, request_status in updated:
+            if request_status == Friend_Request_Status.accepted:
+                outcomes[request_id] = ManageFriendRequestOutcome.accepted
+                new_friend_ids.append(sender_id)
+            else:
+                outcomes[request_id] = ManageFriendRequestOutcome.rejected
+
+        if new_friend_ids:
+            await self._session.execute(
+                pg_insert(Friendship)
+                .values(
+                    [
+                        {
+                            "user_id1": min(reciever.id, sender_id),
+                            "user_id2": max(reciever.id, sender_id),
+                        }
+                        for sender_id in new_friend_ids
+                    ]
+                )
+                .on_conflict_do_nothing()
+            )
+
+        if updated:
+            changes = [(reciever.id, Collection.friend_requests)]
+            if new_friend_ids:
+                changes += [
+                    (user_id, Collection.friends)
+                    for user_id in (reciever.id, *new_friend_ids)
+                ]
+            await bump_collection_versions(self._session, changes)
+        await self._session.commit()
+        if updated:
+            read_your_writes.mark_write(
+                reciever.id, *(sender_id for _, sender_id, _ in updated)
+            )
+        return outcomes
+
+    async def get_collection_version(self, user: User, collection: Collection) -> int:
+        """Return the version stamp of one of the user's friend lists.
+
+        Read from the primary so a lagging replica never answers 304 for a
+        list that has changed; call ``catch_up_to`` before reading the list.
+        """
+        version = await get_collection_version(self._session, user.id, collection)
+        await release_connection(self._session)
+        return version
+
+    async def catch_up_to(
+        self, user: User, collection: Collection, version: int
+    ) -> None:
+        """Read the list from the primary if the replica hasn't reached version."""
+        self._read_session = await session_caught_up_to(
+            self._read_session, self._session, user.id, collection, version
+        )
+
+    async def get_friends_list(
+        self, user: User, *, cursor: str | None = None, limit: int = 100
+    ) -> tuple[Sequence[User], str | None]:
+        """Return one page of a user's friends, newest friendship first.
+
+        Friend rows come back in a single statement: a UNION ALL over both
+        friendship columns (each branch served by its composite index) joined
+        to users. Pages are keyset-paginated on the friendship
+        (created_at, id), so the cost stays flat no matter how deep the
+        client pages.
+        """
+
+        after = _FRIENDS_KEYSET.decode(cursor) if cursor else None
+        stmt = _friends_stmt(user, after, min(limit, MAX_PAGE_SIZE) + 1)
+        result = await self._read_session.execute(stmt)
+        rows, next_cursor = _FRIENDS_KEYSET.page(result.all(), limit)
+        await release_connection(self._read_session)
+
+        return [friend for friend, _, _ in rows], next_cursor
+
+    def stream_friends(self, user: User) -> AsyncGenerator[Sequence[User], None]:
+        """Yield all of a user's friends, newest friendship first, in partitions."""
+        stmt = _friends_stmt(user, None, None)
+        return stream_scalar_partitions(
+            self._read_session, stmt, settings.stream_batch_size
+        )
 
     async def get_pending_friend_requests(
-        self, user: User
-    ) -> Sequence[Row[tuple[FriendRequest, User]]]:
-        """Return pending friend requests with sender metadata."""
+        self, user: User, *, cursor: str | None = None, limit: int = 100
+    ) -> tuple[list[tuple[FriendRequest, User]], str | None]:
+        """Return a page of pending friend requests with senders, newest first."""
         stmt = (
-            select(FriendRequest, User)
+            _PENDING_KEYSET.select(FriendRequest, User)
             .join(User, FriendRequest.sender_id == User.id)
             .where(
                 and_(
@@ -144,7 +439,10 @@ class FriendsService:
                 )
             )
         )
-        result = await self._session.execute(stmt)
-        pending_requests = result.all()
+        result = await self._read_session.execute(
+            _PENDING_KEYSET.paginate(stmt, cursor, limit)
+        )
+        rows, next_cursor = _PENDING_KEYSET.page(result.all(), limit)
+        await release_connection(self._read_session)
 
-        return pending_requests
+        return [(request, sender) for request, sender, _, _ in rows], next_cursor
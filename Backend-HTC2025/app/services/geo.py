@@ -0,0 +1,127 @@
+"""Geohash helpers for radius searches without PostGIS.
+
+A geohash prefix is a lat/lng rectangle, and with the "C" collation every
+point inside it sorts into one contiguous B-tree range. A radius search picks
+the finest precision whose cells are at least as large as the search box, so
+the box touches at most 2x2 cells. It scans those ranges and then applies an
+exact Haversine filter.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Any
+
+from sqlalchemy import func
+
+EARTH_RADIUS_KM = 6371.0088
+GEOHASH_PRECISION = 12
+_KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+# Sorts after every geohash character in the "C" collation.
+_RANGE_END = "{"
+
+
+def encode_geohash(
+    latitude: float, longitude: float, precision: int = GEOHASH_PRECISION
+) -> str:
+    """Return the geohash of a point."""
+
+    lat_range, lng_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars = []
+    bits = bit_count = 0
+    even = True
+    while len(chars) < precision:
+        interval, value = (lng_range, longitude) if even else (lat_range, latitude)
+        middle = (interval[0] + interval[1]) / 2
+        bits <<= 1
+        if value >= middle:
+            bits |= 1
+            interval[0] = middle
+        else:
+            interval[1] = middle
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(_BASE32[bits])
+            bits = bit_count = 0
+    return "".join(chars)
+
+
+def _cell_size_degrees(precision: int) -> tuple[float, float]:
+    """Return (lat, lng) size in degrees of a geohash cell."""
+
+    lng_bits = (5 * precision + 1) // 2
+    lat_bits = 5 * precision // 2
+    return 180 / 2**lat_bits, 360 / 2**lng_bits
+
+
+def bounding_box(
+    latitude: float, longitude: float, radius_km: float
+) -> tuple[float, float, float, float]:
+    """Return (min_lat, min_lng, max_lat, max_lng) enclosing the radius."""
+
+    lat_delta = radius_km / _KM_PER_DEGREE
+    min_lat, max_lat = max(latitude - lat_delta, -90.0), min(latitude + lat_delta, 90.0)
+    widest = math.cos(math.radians(max(abs(min_lat), abs(max_lat))))
+    if widest <= 0 or radius_km / (_KM_PER_DEGREE * widest) >= 180:
+        return min_lat, -180.0, max_lat, 180.0
+    lng_delta = radius_km / (_KM_PER_DEGREE * widest)
+    return min_lat, longitude - lng_delta, max_lat, longitude + lng_delta
+
+
+def _wrap_longitude(longitude: float) -> float:
+    return (longitude + 180.0) % 360.0 - 180.0
+
+
+def covering_prefixes(latitude: float, longitude: float, radius_km: float) -> list[str]:
+    """Return at most four geohash prefixes whose cells cover the radius.
+
+    An empty list means the radius is too large to narrow down (the caller
+    should fall back to scanning everything with coordinates).
+    """
+
+    min_lat, min_lng, max_lat, max_lng = bounding_box(latitude, longitude, radius_km)
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        lat_size, lng_size = _cell_size_degrees(precision)
+        if lat_size >= max_lat - min_lat and lng_size >= max_lng - min_lng:
+            break
+    else:
+        return []
+
+    corners = {
+        encode_geohash(
+            min(max(lat, -90.0), 90.0), _wrap_longitude(lng), precision
+        )
+        for lat in (min_lat, max_lat)
+        for lng in (min_lng, max_lng)
+    }
+    return sorted(corners)
+
+
+def prefix_range(column: Any, prefix: str) -> Any:
+    """Return a B-tree friendly ``column`` range for a geohash prefix."""
+
+    return column.between(prefix, prefix + _RANGE_END)
+
+
+def haversine_km(lat1: Any, lng1: Any, lat2: Any, lng2: Any) -> Any:
+    """Return a SQL expression for the great-circle distance in km."""
+
+    dlat = func.radians(lat2 - lat1)
+    dlng = func.radians(lng2 - lng1)
+    a = func.power(func.sin(dlat / 2), 2) + func.cos(func.radians(lat1)) * func.cos(
+        func.radians(lat2)
+    ) * func.power(func.sin(dlng / 2), 2)
+    return 2 * EARTH_RADIUS_KM * func.asin(func.least(1.0, func.sqrt(a)))
+
+
+__all__ = [
+    "EARTH_RADIUS_KM",
+    "GEOHASH_PRECISION",
+    "bounding_box",
+    "covering_prefixes",
+    "encode_geohash",
+    "haversine_km",
+    "prefix_range",
+]
@@ -0,0 +1,351 @@
+"""Mirror upstream volunteer opportunities into Postgres."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from collections.abc import AsyncIterator, Iterable
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from typing import Any
+
+from sqlalchemy import column, func, literal_column, select, table, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from app.config import settings
+from app.database.postgres import async_session_factory, engine
+from app.integrations.volunteerconnector import (
+    VolunteerConnectorClient,
+    get_volunteer_connector_client,
+)
+from app.models.opportunities import Opportunity
+from app.services.geo import encode_geohash
+from app.services.opportunity_search import (
+    normalize_postal_code,
+    postal_code_search_params,
+)
+
+logger = logging.getLogger(__name__)
+
+_STAGING_TABLE = "opportunity_staging"
+_CONTENT_COLUMNS = (
+    "title",
+    "description",
+    "url",
+    "organization",
+    "organization_logo",
+    "dates",
+    "duration",
+    "latitude",
+    "longitude",
+)
+_STAGED_COLUMNS = ("api_id", *_CONTENT_COLUMNS, "geohash", "content_hash")
+
+# Rows are cleared by the commit that merges them, so one temp table per
+# pooled connection is reused by every batch.
+_CREATE_STAGING_TABLE = text(
+    f"""
+    CREATE TEMP TABLE IF NOT EXISTS {_STAGING_TABLE} (
+        api_id bigint NOT NULL,
+        title varchar NOT NULL,
+        description varchar NOT NULL,
+        url varchar NOT NULL,
+        organization varchar NOT NULL,
+        organization_logo varchar,
+        dates varchar,
+        duration varchar,
+        latitude double precision,
+        longitude double precision,
+        geohash varchar(12) COLLATE "C",
+        content_hash bytea NOT NULL
+    ) ON COMMIT DELETE ROWS
+    """
+)
+_staging = table(_STAGING_TABLE, *(column(name) for name in _STAGED_COLUMNS))
+
+# Advisory lock key shared by every process that ingests into this database.
+_INGESTION_LOCK_KEY = int.from_bytes(
+    hashlib.sha256(b"opportunity-ingestion").digest()[:8], "big", signed=True
+)
+
+
+@dataclass(slots=True)
+class IngestionStats:
+    """Counters for one ingestion run.
+
+    ``changed`` counts existing rows whose content was updated and
+    ``inserted`` counts new rows; the rest of ``seen`` was skipped unchanged.
+    """
+
+    regions: int = 0
+    seen: int = 0
+    changed: int = 0
+    inserted: int = 0
+    duration_seconds: float = 0.0
+
+    def as_dict(self) -> dict[str, int | float]:
+        return asdict(self)
+
+
+def _text(value: Any) -> str:
+    return str(value).strip() if value is not None else ""
+
+
+def _coordinate(value: Any, bound: float) -> float | None:
+    try:
+        coordinate = float(value)
+    except (TypeError, ValueError):
+        return None
+    return coordinate if -bound <= coordinate <= bound else None
+
+
+def normalize_opportunity(raw: dict[str, Any]) -> dict[str, Any] | None:
+    """Map an upstream search result onto opportunity columns.
+
+    Returns None for results without a usable id or title. Dates become the
+    ``"start - end"`` string the frontend already parses for saved rows, and
+    the audience coordinates are geohashed for radius searches.
+    """
+
+    try:
+        api_id = int(raw["id"])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+    title = _text(raw.get("title"))
+    if not title:
+        return None
+
+    organization = raw.get("organization")
+    if isinstance(organization, dict):
+        organization_name = _text(organization.get("name"))
+        organization_logo = _text(organization.get("logo")) or None
+    else:
+        organization_name, organization_logo = _text(organization), None
+
+    dates = raw.get("dates")
+    if isinstance(dates, dict):
+        start, end = _text(dates.get("start")), _text(dates.get("end"))
+        dates = start if start == end else " - ".join(filter(None, (start, end)))
+    else:
+        dates = _text(dates)
+
+    audience = raw.get("audience")
+    if not isinstance(audience, dict):
+        audience = {}
+    latitude = _coordinate(audience.get("latitude"), 90)
+    longitude = _coordinate(audience.get("longitude"), 180)
+    if latitude is None or longitude is None:
+        latitude = longitude = None
+
+    return {
+        "api_id": api_id,
+        "title": title,
+        "description": _text(raw.get("description")),
+        "url": _text(raw.get("url")),
+        "organization": organization_name,
+        "organization_logo": organization_logo,
+        "dates": dates or None,
+        "duration": _text(raw.get("duration")) or None,
+        "latitude": latitude,
+        "longitude": longitude,
+        "geohash": (
+            encode_geohash(latitude, longitude) if latitude is not None else None
+        ),
+    }
+
+
+def content_hash(row: dict[str, Any]) -> bytes:
+    """Return a stable digest of the row's content columns."""
+
+    payload = json.dumps([row[name] for name in _CONTENT_COLUMNS], separators=(",", ":"))
+    return hashlib.sha256(payload.encode()).digest()
+
+
+@asynccontextmanager
+async def ingestion_lock(bind: AsyncEngine) -> AsyncIterator[bool]:
+    """Try to take the database-wide ingestion lock; yield whether it is held.
+
+    Only the holder should crawl, so API workers and the ingestion script
+    never hit upstream or merge the same rows at the same time. The session
+    lock lives on its own autocommit connection for the whole run, and
+    Postgres drops it if the process dies.
+    """
+
+    async with bind.connect() as connection:
+        await connection.execution_options(isolation_level="AUTOCOMMIT")
+        acquired = await connection.scalar(
+            select(func.pg_try_advisory_lock(_INGESTION_LOCK_KEY))
+        )
+        try:
+            yield bool(acquired)
+        finally:
+            if acquired:
+                await connection.execute(
+                    select(func.pg_advisory_unlock(_INGESTION_LOCK_KEY))
+                )
+
+
+class OpportunityIngestionService:
+    """Crawl regions upstream and bulk-upsert the results.
+
+    Each page flows through parse -> normalize -> content hash, is COPYed into
+    a temp staging table and merged with a single ``INSERT ... ON CONFLICT
+    (api_id)`` that only rewrites rows whose content hash changed and
+    stamps them with a fresh ``updated_at``, which cluster indexes reload from.
+    """
+
+    def __init__(
+        self,
+        client: VolunteerConnectorClient,
+        session_factory: async_sessionmaker[AsyncSession],
+    ) -> None:
+        self._client = client
+        self._session_factory = session_factory
+
+    async def ingest(self, postal_codes: Iterable[str], distance: int) -> IngestionStats:
+        """Crawl every region and return the run's counters."""
+
+        stats = IngestionStats()
+        started = time.perf_counter()
+        for postal_code in postal_codes:
+            code = normalize_postal_code(postal_code)
+            if not code:
+                continue
+            stats.regions += 1
+            params = postal_code_search_params(code, distance)
+            async for page in self._client.iter_pages(params):
+                await self._ingest_page(page, stats)
+
+        stats.duration_seconds = time.perf_counter() - started
+        return stats
+
+    async def _ingest_page(
+        self, results: list[dict[str, Any]], stats: IngestionStats
+    ) -> None:
+        stats.seen += len(results)
+        # Keyed by api_id: ON CONFLICT cannot update the same row twice.
+        rows: dict[int, dict[str, Any]] = {}
+        for raw in results:
+            row = normalize_opportunity(raw)
+            if row is not None:
+                rows[row["api_id"]] = row
+        if not rows:
+            return
+
+        records = [
+            (*(row[name] for name in _STAGED_COLUMNS[:-1]), content_hash(row))
+            for row in rows.values()
+        ]
+        merge = pg_insert(Opportunity).from_select(
+            list(_STAGED_COLUMNS), select(*_staging.c)
+        )
+        merge = merge.on_conflict_do_update(
+            index_elements=[Opportunity.api_id],
+            set_={
+                **{name: merge.excluded[name] for name in _STAGED_COLUMNS[1:]},
+                "updated_at": func.now(),
+            },
+            where=Opportunity.content_hash.is_distinct_from(
+                merge.excluded.content_hash
+            ),
+        ).returning(literal_column("xmax = 0"))
+
+        async with self._session_factory(info={"route": "ingestion"}) as session:
+            async with session.begin():
+                connection = await session.connection()
+                await connection.execute(_CREATE_STAGING_TABLE)
+                raw_connection = await connection.get_raw_connection()
+                await raw_connection.driver_connection.copy_records_to_table(
+                    _STAGING_TABLE, records=records, columns=list(_STAGED_COLUMNS)
+                )
+                written = (await connection.scalars(merge)).all()
+
+        inserted = sum(written)
+        stats.inserted += inserted
+        stats.changed += len(written) - inserted
+
+
+class OpportunityIngestionWorker:
+    """Run ingestion on a fixed interval in the background.
+
+    Every API process may run a worker; each interval only the one holding
+    ``ingestion_lock`` crawls and the others skip the run.
+    """
+
+    def __init__(
+        self,
+        service: OpportunityIngestionService,
+        lock_bind: AsyncEngine,
+        *,
+        postal_codes: list[str],
+        distance: int,
+        interval_seconds: int,
+    ) -> None:
+        self._service = service
+        self._lock_bind = lock_bind
+        self._postal_codes = postal_codes
+        self._distance = distance
+        self._interval_seconds = interval_seconds
+        self._task: asyncio.Task[None] | None = None
+        self.last_stats: IngestionStats | None = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run_loop())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def run_once(self) -> IngestionStats | None:
+        """Ingest once; return None if another process is already ingesting."""
+
+        async with ingestion_lock(self._lock_bind) as acquired:
+            if not acquired:
+                logger.info("Skipping ingestion run: another process holds the lock.")
+                return None
+            stats = await self._service.ingest(self._postal_codes, self._distance)
+        self.last_stats = stats
+        logger.info("Opportunity ingestion finished: %s", stats.as_dict())
+        return stats
+
+    async def _run_loop(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except Exception:
+                logger.error("Opportunity ingestion run failed.", exc_info=True)
+            await asyncio.sleep(self._interval_seconds)
+
+
+@lru_cache(maxsize=1)
+def get_opportunity_ingestion_worker() -> OpportunityIngestionWorker:
+    """Return the process-wide ingestion worker."""
+
+    return OpportunityIngestionWorker(
+        OpportunityIngestionService(
+            get_volunteer_connector_client(), async_session_factory
+        ),
+        engine,
+        postal_codes=settings.ingestion_postal_codes,
+        distance=settings.ingestion_distance_km,
+        interval_seconds=settings.ingestion_interval_seconds,
+    )
+
+
+__all__ = [
+    "IngestionStats",
+    "OpportunityIngestionService",
+    "OpportunityIngestionWorker",
+    "content_hash",
+    "get_opportunity_ingestion_worker",
+    "ingestion_lock",
+    "normalize_opportunity",
+]
@@ -1,55 +1,461 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import Sequence
-from sqlalchemy import select
+from collections.abc import AsyncGenerator
+from typing import Any, Sequence
+from sqlalchemy import BigInteger, and_, exists, func, literal, null, or_, select
+from sqlalchemy.dialects.postgresql import REAL, insert as pg_insert
+from app.config import settings
+from app.database.postgres import (
+    read_your_writes,
+    release_connection,
+    stream_scalar_partitions,
+)
 from app.models.user import User
-from app.models.opportunities import Opportunity
+from app.models.opportunities import SEARCH_VECTOR_CONFIG, Opportunity
+from app.models.dismissedopportunities import DismissedOpportunity
+from app.models.friendships import Friendship
 from app.models.savedopportunities import SavedOpportunity
 from app.schemas.opportunity import OpportunityCreateSchema
+from app.services.counters import increment_save_counts
+from app.services.geo import (
+    covering_prefixes,
+    encode_geohash,
+    haversine_km,
+    prefix_range,
+)
+from app.services.pagination import Keyset
+from app.services.versions import (
+    Collection,
+    bump_collection_version,
+    get_collection_version,
+    session_caught_up_to,
+)
+
+
+def _opportunity_row(opportunity: OpportunityCreateSchema) -> dict[str, Any]:
+    row = opportunity.model_dump()
+    has_coordinates = row["latitude"] is not None and row["longitude"] is not None
+    row["geohash"] = (
+        encode_geohash(row["latitude"], row["longitude"]) if has_coordinates else None
+    )
+    return row
+
+
+def insert_saved_opportunities(pairs: Any) -> Any:
+    """Return a CTE saving the (user_id, opportunity_id) rows of pairs.
+
+    pairs is a CTE of distinct pairs written by the same statement. Users
+    with a pair not saved yet get their saved-opportunities version bumped,
+    and their new rows are stamped with it as ``sync_version``. The bump
+    holds the user's version row until commit, so ``sync_version`` follows
+    commit order and delta sync cannot skip a save that commits late. The
+    CTE returns the ``user_id`` and ``opportunity_id`` of each new save.
+    """
+    unsaved = (
+        select(pairs.c.user_id, pairs.c.opportunity_id)
+        .where(
+            ~exists().where(
+                SavedOpportunity.user_id == pairs.c.user_id,
+                SavedOpportunity.opportunity_id == pairs.c.opportunity_id,
+            )
+        )
+        .cte("unsaved")
+    )
+    version = bump_collection_version(
+        unsaved.c.user_id, Collection.saved_opportunities, "saved_version"
+    )
+    return (
+        pg_insert(SavedOpportunity)
+        .from_select(
+            ["user_id", "opportunity_id", "sync_version"],
+            select(
+                unsaved.c.user_id, unsaved.c.opportunity_id, version.c.version
+            ).join(version, version.c.user_id == unsaved.c.user_id),
+        )
+        .on_conflict_do_nothing(
+            index_elements=[SavedOpportunity.user_id, SavedOpportunity.opportunity_id]
+        )
+        .returning(SavedOpportunity.user_id, SavedOpportunity.opportunity_id)
+        .cte("saved")
+    )
+
+
+def radius_filter(
+    latitude: float, longitude: float, radius_km: float
+) -> tuple[Any, list[Any]]:
+    """Return the Haversine distance and the conditions for a radius search.
+
+    Candidates come from at most four geohash prefix ranges on the B-tree
+    index; the exact distance then filters them.
+    """
+    distance = haversine_km(
+        latitude, longitude, Opportunity.latitude, Opportunity.longitude
+    )
+    prefixes = covering_prefixes(latitude, longitude, radius_km)
+    candidates = (
+        or_(*(prefix_range(Opportunity.geohash, prefix) for prefix in prefixes))
+        if prefixes
+        else Opportunity.geohash.is_not(None)
+    )
+    return distance, [candidates, distance <= radius_km]
+
+
+# A user's saves in commit order; backed by
+# ix_saved_opportunities_user_id_sync_version_id.
+_SAVED_KEYSET = Keyset("saved", SavedOpportunity.sync_version, SavedOpportunity.id)
+# An opportunity's savers, newest first; backed by
+# ix_saved_opportunities_opportunity_id_created_at_id.
+_SAVERS_KEYSET = Keyset(
+    "savers", SavedOpportunity.created_at, SavedOpportunity.id, descending=True
+)
+
+
+def _saved_by(user: User) -> Any:
+    return (
+        _SAVED_KEYSET.select(Opportunity)
+        .join(SavedOpportunity, SavedOpportunity.opportunity_id == Opportunity.id)
+        .where(SavedOpportunity.user_id == user.id)
+    )
+
+
+def _savers_of(api_id: int) -> Any:
+    return (
+        _SAVERS_KEYSET.select(User)
+        .join(SavedOpportunity, SavedOpportunity.user_id == User.id)
+        .join(Opportunity, Opportunity.id == SavedOpportunity.opportunity_id)
+        .where(Opportunity.api_id == api_id)
+    )
 
 
 class OpportunityService:
-    def __init__(self, session: AsyncSession) -> None:
+    def __init__(
+        self, session: AsyncSession, read_session: AsyncSession | None = None
+    ) -> None:
         self._session = session
+        # Read-only list queries may go to a replica; writes always use session.
+        self._read_session = read_session or session
 
     async def save_opportunity(
         self, user: User, opportunity_data: OpportunityCreateSchema
-    ) -> None:
-        """Save a new opportunity to the database."""
-        stmt = select(Opportunity).where(
-            Opportunity.api_id == opportunity_data.api_id
+    ) -> bool:
+        """Save an opportunity for a user; return False if it was already saved."""
+        results = await self.save_opportunities(user, [opportunity_data])
+        return results[opportunity_data.api_id]
+
+    async def save_opportunities(
+        self, user: User, opportunities: Sequence[OpportunityCreateSchema]
+    ) -> dict[int, bool]:
+        """Save several opportunities for a user in a single statement.
+
+        Missing opportunities are inserted from the payload (existing rows are
+        left untouched) in one multi-row insert whose returned ids feed
+        ``insert_saved_opportunities``, which skips existing (user,
+        opportunity) pairs, so concurrent or retried saves are safe. New
+        saves bump the sharded save counters in the same statement. Returns,
+        per ``api_id``, whether it was newly saved.
+        """
+        # ON CONFLICT DO UPDATE cannot touch the same row twice in one
+        # statement, so keep only the last payload for each api_id. Sorted so
+        # concurrent batches lock existing rows in the same order.
+        payloads = {
+            opportunity.api_id: _opportunity_row(opportunity)
+            for opportunity in opportunities
+        }
+        rows = [payloads[api_id] for api_id in sorted(payloads)]
+        upsert = pg_insert(Opportunity).values(rows)
+        upserted = (
+            # Opportunities are shared, so a client payload only fills in rows
+            # that do not exist yet; the no-op update is there so RETURNING
+            # also yields the ids of existing rows.
+            upsert.on_conflict_do_update(
+                index_elements=[Opportunity.api_id],
+                set_={"api_id": upsert.excluded.api_id},
+            )
+            .returning(Opportunity.id, Opportunity.api_id)
+            .cte("upserted")
         )
+        pairs = select(
+            literal(user.id, BigInteger).label("user_id"),
+            upserted.c.id.label("opportunity_id"),
+        ).cte("pairs")
+        counted = increment_save_counts(insert_saved_opportunities(pairs))
+        stmt = select(
+            upserted.c.api_id, counted.c.opportunity_id.is_not(None)
+        ).outerjoin(counted, counted.c.opportunity_id == upserted.c.id)
+
         result = await self._session.execute(stmt)
-        opportunity = result.scalar_one_or_none()
+        results = {api_id: newly_saved for api_id, newly_saved in result}
+        await self._session.commit()
+        if any(results.values()):
+            read_your_writes.mark_write(user.id)
+        return results
 
-        if opportunity is None:
-            opportunity = Opportunity(**opportunity_data.model_dump())
-            self._session.add(opportunity)
-            await self._session.flush()  # ensure id for SavedOpportunity FK
+    async def get_saved_version(self, user: User) -> int:
+        """Return the version stamp of the user's saved opportunities.
 
-        saved_opportunity = SavedOpportunity(
-            user_id=user.id,
-            opportunity_id=opportunity.id,
+        Read from the primary so a lagging replica never answers 304 for a
+        list that has changed; call ``catch_up_to`` before reading the list.
+        """
+        version = await get_collection_version(
+            self._session, user.id, Collection.saved_opportunities
         )
-        self._session.add(saved_opportunity)
-        await self._session.commit()
+        await release_connection(self._session)
+        return version
 
-    async def get_saved_opportunities(self, user: User) -> Sequence[Opportunity]:
-        """Return all opportunities saved by the given user."""
-        stmt = (
-            select(Opportunity)
+    async def catch_up_to(self, user: User, version: int) -> None:
+        """Read saves from the primary if the replica hasn't reached version."""
+        self._read_session = await session_caught_up_to(
+            self._read_session,
+            self._session,
+            user.id,
+            Collection.saved_opportunities,
+            version,
+        )
+
+    async def get_saved_opportunities(
+        self, user: User, *, since: str | None = None, limit: int = 500
+    ) -> tuple[list[Opportunity], str | None, bool]:
+        """Return up to limit of the user's saves after since, in commit order.
+
+        Without since the list starts at the first save. Also returns the
+        cursor to pass as since next time, whether for the next page or for
+        later deltas, and whether more saves are waiting. Reads walk the
+        user's (sync_version, id) index, so the cost tracks the page, not the
+        list size.
+        """
+        stmt = _SAVED_KEYSET.paginate(_saved_by(user), since, limit)
+        result = await self._read_session.execute(stmt)
+        rows, next_cursor = _SAVED_KEYSET.page(result.all(), limit)
+        await release_connection(self._read_session)
+
+        has_more = next_cursor is not None
+        if rows and not has_more:
+            next_cursor = _SAVED_KEYSET.encode(*rows[-1][1:])
+        return [row[0] for row in rows], next_cursor or since, has_more
+
+    def stream_saved_opportunities(
+        self, user: User
+    ) -> AsyncGenerator[Sequence[Opportunity], None]:
+        """Yield the user's saved opportunities, in commit order, in partitions."""
+        return stream_scalar_partitions(
+            self._read_session,
+            _SAVED_KEYSET.seek(_saved_by(user), None),
+            settings.stream_batch_size,
+        )
+
+    async def get_users_for_opportunity(
+        self, api_id: int, *, cursor: str | None = None, limit: int = 100
+    ) -> tuple[list[User], str | None]:
+        """Return a page of the users who saved the opportunity, newest save first."""
+        stmt = _SAVERS_KEYSET.paginate(_savers_of(api_id), cursor, limit)
+        result = await self._read_session.execute(stmt)
+        rows, next_cursor = _SAVERS_KEYSET.page(result.all(), limit)
+        await release_connection(self._read_session)
+        return [row[0] for row in rows], next_cursor
+
+    def stream_users_for_opportunity(
+        self, api_id: int
+    ) -> AsyncGenerator[Sequence[User], None]:
+        """Yield the users who saved the given opportunity, in partitions."""
+        return stream_scalar_partitions(
+            self._read_session,
+            _SAVERS_KEYSET.seek(_savers_of(api_id), None),
+            settings.stream_batch_size,
+        )
+
+    async def get_saved_users_for_opportunities(
+        self, user: User, api_ids: Sequence[int], users_per_opportunity: int
+    ) -> dict[int, tuple[int, int, list[tuple[User, bool]]]]:
+        """Return api_id -> (save_count, friend_save_count, [(user, is_friend)]).
+
+        One grouped query over every api_id. Savers are listed friends of
+        ``user`` first, most recent save first, capped per opportunity.
+        """
+        is_friend = Friendship.id.is_not(None)
+        ranked = (
+            select(
+                Opportunity.api_id.label("api_id"),
+                SavedOpportunity.user_id.label("user_id"),
+                is_friend.label("is_friend"),
+                func.row_number()
+                .over(
+                    partition_by=Opportunity.api_id,
+                    order_by=(
+                        is_friend.desc(),
+                        SavedOpportunity.created_at.desc(),
+                        SavedOpportunity.user_id,
+                    ),
+                )
+                .label("position"),
+                func.count()
+                .over(partition_by=Opportunity.api_id)
+                .label("save_count"),
+                func.count(Friendship.id)
+                .over(partition_by=Opportunity.api_id)
+                .label("friend_save_count"),
+            )
             .join(SavedOpportunity, SavedOpportunity.opportunity_id == Opportunity.id)
-            .where(SavedOpportunity.user_id == user.id)
+            .outerjoin(
+                Friendship,
+                and_(
+                    Friendship.user_id1 == func.least(user.id, SavedOpportunity.user_id),
+                    Friendship.user_id2
+                    == func.greatest(user.id, SavedOpportunity.user_id),
+                ),
+            )
+            .where(Opportunity.api_id.in_(set(api_ids)))
+            .subquery("ranked")
         )
-        result = await self._session.execute(stmt)
-        return result.scalars().all()
+        # Zero users per opportunity still needs one row for the counts.
+        stmt = (
+            select(
+                ranked.c.api_id,
+                ranked.c.save_count,
+                ranked.c.friend_save_count,
+                ranked.c.is_friend,
+                User,
+            )
+            .join(User, User.id == ranked.c.user_id)
+            .where(ranked.c.position <= max(users_per_opportunity, 1))
+            .order_by(ranked.c.api_id, ranked.c.position)
+        )
+        result = await self._read_session.execute(stmt)
+        rows = result.tuples().all()
+        await release_connection(self._read_session)
 
-    async def get_users_for_opportunity(self, api_id: int) -> Sequence[User]:
-        """Return all users who have saved the given opportunity."""
+        savers: dict[int, tuple[int, int, list[tuple[User, bool]]]] = {
+            api_id: (0, 0, []) for api_id in api_ids
+        }
+        for api_id, save_count, friend_save_count, friend, saver in rows:
+            users = savers[api_id][2]
+            if len(users) < users_per_opportunity:
+                users.append((saver, friend))
+            savers[api_id] = (save_count, friend_save_count, users)
+        return savers
+
+    async def get_nearby_opportunities(
+        self, latitude: float, longitude: float, radius_km: float, limit: int
+    ) -> Sequence[tuple[Opportunity, float]]:
+        """Return opportunities within radius_km, nearest first, with distances."""
+        distance, within_radius = radius_filter(latitude, longitude, radius_km)
         stmt = (
-            select(User)
-            .join(SavedOpportunity, SavedOpportunity.user_id == User.id)
-            .join(Opportunity, Opportunity.id == SavedOpportunity.opportunity_id)
-            .where(Opportunity.api_id == api_id)
+            select(Opportunity, distance.label("distance_km"))
+            .where(*within_radius)
+            .order_by(distance, Opportunity.id)
+            .limit(limit)
+        )
+        result = await self._read_session.execute(stmt)
+        rows = result.tuples().all()
+        await release_connection(self._read_session)
+        return rows
+
+    async def get_trending_opportunities(
+        self,
+        limit: int,
+        *,
+        latitude: float | None = None,
+        longitude: float | None = None,
+        radius_km: float | None = None,
+    ) -> Sequence[tuple[Opportunity, float | None]]:
+        """Return the most saved opportunities, optionally within a radius.
+
+        Ranks by the merged ``save_count``, never the saves table: globally
+        by walking the (save_count DESC, id) index, nearby from the covering
+        geohash index, fetching full rows only for the winners.
+        """
+        if latitude is None or longitude is None or radius_km is None:
+            stmt = (
+                select(Opportunity, null())
+                .order_by(Opportunity.save_count.desc(), Opportunity.id)
+                .limit(limit)
+            )
+        else:
+            distance, within_radius = radius_filter(latitude, longitude, radius_km)
+            top = (
+                select(
+                    Opportunity.id,
+                    Opportunity.save_count,
+                    distance.label("distance_km"),
+                )
+                .where(*within_radius)
+                .order_by(Opportunity.save_count.desc(), Opportunity.id)
+                .limit(limit)
+                .subquery("top")
+            )
+            stmt = (
+                select(Opportunity, top.c.distance_km)
+                .join(top, top.c.id == Opportunity.id)
+                .order_by(top.c.save_count.desc(), top.c.id)
+            )
+        result = await self._read_session.execute(stmt)
+        rows = result.tuples().all()
+        await release_connection(self._read_session)
+        return rows
+
+    async def search_opportunities_text(
+        self,
+        query: str,
+        *,
+        cursor: str | None = None,
+        limit: int = 20,
+        latitude: float | None = None,
+        longitude: float | None = None,
+        radius_km: float | None = None,
+    ) -> tuple[Sequence[Opportunity], str | None]:
+        """Return one page of opportunities matching query, best match first.
+
+        Matches use the GIN-indexed ``search_vector`` and are ranked with
+        ``ts_rank_cd``; pages are keyset-paginated on (rank, id). Passing a
+        location and radius also restricts results to that radius.
+        """
+        ts_query = func.websearch_to_tsquery(SEARCH_VECTOR_CONFIG, query)
+        rank = func.ts_rank_cd(Opportunity.search_vector, ts_query, type_=REAL)
+        ranked = (
+            select(Opportunity.id, rank.label("rank"))
+            .where(Opportunity.search_vector.op("@@")(ts_query))
+        )
+        if latitude is not None and longitude is not None and radius_km is not None:
+            _, within_radius = radius_filter(latitude, longitude, radius_km)
+            ranked = ranked.where(*within_radius)
+        ranked = ranked.subquery("ranked")
+        keyset = Keyset("search", ranked.c.rank, ranked.c.id, descending=True)
+
+        stmt = keyset.select(Opportunity).join(ranked, ranked.c.id == Opportunity.id)
+        result = await self._read_session.execute(
+            keyset.paginate(stmt, cursor, limit)
+        )
+        rows, next_cursor = keyset.page(result.all(), limit)
+        await release_connection(self._read_session)
+        return [row[0] for row in rows], next_cursor
+
+    async def dismiss_opportunity(self, user: User, api_id: int) -> bool | None:
+        """Record a swipe-left; None if api_id is unknown, False if repeated."""
+        opportunity = (
+            select(Opportunity.id).where(Opportunity.api_id == api_id).cte("opportunity")
+        )
+        dismissed = (
+            pg_insert(DismissedOpportunity)
+            .from_select(
+                ["user_id", "opportunity_id"],
+                select(literal(user.id, BigInteger), opportunity.c.id),
+            )
+            .on_conflict_do_nothing(
+                index_elements=[
+                    DismissedOpportunity.user_id,
+                    DismissedOpportunity.opportunity_id,
+                ]
+            )
+            .returning(DismissedOpportunity.id)
+            .cte("dismissed")
+        )
+        stmt = select(
+            opportunity.c.id,
+            select(dismissed.c.id).scalar_subquery().label("dismissed_id"),
         )
         result = await self._session.execute(stmt)
-        return result.scalars().all()
+        row = result.one_or_none()
+        await self._session.commit()
+        if row is None:
+            return None
+        if row.dismissed_id is not None:
+            read_your_writes.mark_write(user.id)
+        return row.dismissed_id is not None
@@ -0,0 +1,94 @@
+"""Cached, server-side search over the volunteerconnector API."""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Any
+
+from app.config import settings
+from app.integrations.volunteerconnector import VolunteerConnectorClient
+from app.services.cache import StaleWhileRevalidateCache
+
+SearchKey = tuple[str, str, int]
+SearchCache = StaleWhileRevalidateCache[SearchKey, dict[str, Any]]
+
+# ~100 m; nearby map clicks share a cache entry.
+_COORDINATE_DECIMALS = 3
+
+
+class InvalidSearchLocationError(ValueError):
+    """Raised when a search has neither a postal code nor a lat/lng pair."""
+
+
+def normalize_postal_code(postal_code: str) -> str:
+    """Return the postal code lowercased with whitespace removed."""
+
+    return "".join(postal_code.split()).lower()
+
+
+def postal_code_search_params(code: str, distance: int) -> dict[str, Any]:
+    """Return upstream query params for a normalized postal code search."""
+
+    # Upstream expects the FSA and LDU separated, e.g. "t3a 5k9".
+    return {"pc": f"{code[:3]} {code[3:]}".strip(), "md": distance, "so": "Proximity"}
+
+
+@lru_cache(maxsize=1)
+def get_opportunity_search_cache() -> SearchCache:
+    """Return the worker-wide search result cache."""
+
+    return StaleWhileRevalidateCache(
+        maxsize=settings.opportunity_search_cache_size,
+        ttl_seconds=settings.opportunity_search_cache_ttl_seconds,
+        stale_seconds=settings.opportunity_search_stale_seconds,
+    )
+
+
+class OpportunitySearchService:
+    """Proxy volunteerconnector searches through a shared result cache.
+
+    Every user searching the same postal code and distance is served from one
+    cached, fully paginated result set instead of paging through the upstream
+    API from their browser.
+    """
+
+    def __init__(self, client: VolunteerConnectorClient, cache: SearchCache) -> None:
+        self._client = client
+        self._cache = cache
+
+    async def search(
+        self,
+        *,
+        distance: int,
+        postal_code: str | None = None,
+        latitude: float | None = None,
+        longitude: float | None = None,
+    ) -> dict[str, Any]:
+        """Return ``{"count", "results"}`` for a postal code or lat/lng search."""
+
+        code = normalize_postal_code(postal_code or "")
+        if code:
+            key: SearchKey = ("pc", code, distance)
+            params = postal_code_search_params(code, distance)
+        elif latitude is not None and longitude is not None:
+            lat = round(latitude, _COORDINATE_DECIMALS)
+            lng = round(longitude, _COORDINATE_DECIMALS)
+            key = ("ll", f"{lat},{lng}", distance)
+            params = {"lat": lat, "lng": lng, "max_distance": distance}
+        else:
+            raise InvalidSearchLocationError(
+                "Provide either postal_code or both lat and lng."
+            )
+
+        return await self._cache.get_or_load(
+            key, lambda: self._client.search(params)
+        )
+
+
+__all__ = [
+    "InvalidSearchLocationError",
+    "OpportunitySearchService",
+    "get_opportunity_search_cache",
+    "normalize_postal_code",
+    "postal_code_search_params",
+]
@@ -0,0 +1,167 @@
+"""Signed, opaque cursors and declarative keyset (seek) pagination."""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import hmac
+import json
+from collections.abc import Sequence
+from datetime import datetime
+from functools import lru_cache
+from typing import Any
+
+from sqlalchemy import Select, literal, select, tuple_
+from sqlalchemy.engine import Row
+
+from app.config import settings
+
+# Services never serve pages larger than this, whatever limit they are given.
+MAX_PAGE_SIZE = 1000
+
+# 128 bits is plenty to stop forged cursors and keeps them short in URLs.
+_SIGNATURE_BYTES = 16
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded or is not ours."""
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+@lru_cache(maxsize=1)
+def _signing_key() -> bytes:
+    # Every worker must share the key; without a dedicated secret, derive one
+    # from the (required) Firebase credentials rather than a per-process key.
+    secret = (
+        settings.pagination_cursor_secret or settings.firebase_service_account_json
+    )
+    return hmac.new(b"pagination-cursor", secret.encode(), hashlib.sha256).digest()
+
+
+def _sign(scope: str, body: str) -> str:
+    message = f"{scope}.{body}".encode()
+    digest = hmac.new(_signing_key(), message, hashlib.sha256).digest()
+    return _b64encode(digest[:_SIGNATURE_BYTES])
+
+
+def encode_cursor(scope: str, values: Sequence[Any]) -> str:
+    """Return a signed cursor for the key values of the last row on a page.
+
+    scope names the ordering, so a cursor from one list is rejected by another.
+    """
+
+    raw = [
+        value.isoformat() if isinstance(value, datetime) else value for value in values
+    ]
+    body = _b64encode(json.dumps(raw, separators=(",", ":")).encode())
+    return f"{body}.{_sign(scope, body)}"
+
+
+def decode_cursor(scope: str, cursor: str, types: Sequence[type]) -> tuple[Any, ...]:
+    """Verify a cursor from ``encode_cursor`` and convert its values to types."""
+
+    body, _, signature = cursor.partition(".")
+    expected = _sign(scope, body)
+    if not body or not hmac.compare_digest(signature.encode(), expected.encode()):
+        raise InvalidCursorError("Invalid pagination cursor.")
+    try:
+        values = json.loads(_b64decode(body))
+        if not isinstance(values, list) or len(values) != len(types):
+            raise ValueError("Cursor does not match the ordering.")
+        return tuple(
+            datetime.fromisoformat(value) if type_ is datetime else type_(value)
+            for type_, value in zip(types, values)
+        )
+    except (ValueError, TypeError) as exc:
+        raise InvalidCursorError("Malformed pagination cursor.") from exc
+
+
+def _python_type(column: Any) -> type:
+    try:
+        return column.type.python_type
+    except NotImplementedError:
+        return str
+
+
+class Keyset:
+    """A declared total ordering that list queries page through by seeking.
+
+    columns are the sort key, most significant first, ending in a unique
+    column (usually the primary key) so ties cannot straddle pages; they all
+    sort in the same direction. Declare one per list next to the query it
+    orders and back it with an index on (filter columns, *columns), so each
+    page is a range scan whose cost does not grow with the page number.
+    Queries select the key columns last (see ``select``) and the last row's
+    key becomes a signed cursor scoped to name.
+    """
+
+    def __init__(self, name: str, *columns: Any, descending: bool = False) -> None:
+        self.name = name
+        self.columns = columns
+        self.descending = descending
+        self._types = tuple(_python_type(column) for column in columns)
+
+    def encode(self, *values: Any) -> str:
+        return encode_cursor(self.name, values)
+
+    def decode(self, cursor: str) -> tuple[Any, ...]:
+        return decode_cursor(self.name, cursor, self._types)
+
+    def select(self, *entities: Any) -> Select:
+        """Start a query for entities with the key columns appended."""
+
+        return select(*entities, *self.columns)
+
+    def order_by(self, *columns: Any) -> list[Any]:
+        """Return ORDER BY clauses for the key, or for columns standing in for it.
+
+        Pass columns when the key is re-exposed through a subquery.
+        """
+
+        columns = columns or self.columns
+        return [column.desc() if self.descending else column for column in columns]
+
+    def seek(self, stmt: Select, after: tuple[Any, ...] | None) -> Select:
+        """Order stmt by the key and keep only rows past after, if given."""
+
+        if after is not None:
+            key = tuple_(*self.columns)
+            bound = tuple_(
+                *(
+                    literal(value, column.type)
+                    for value, column in zip(after, self.columns)
+                )
+            )
+            stmt = stmt.where(key < bound if self.descending else key > bound)
+        return stmt.order_by(*self.order_by())
+
+    def paginate(self, stmt: Select, cursor: str | None, limit: int) -> Select:
+        """Return stmt seeked past cursor, fetching one extra row for ``page``."""
+
+        after = self.decode(cursor) if cursor else None
+        return self.seek(stmt, after).limit(min(limit, MAX_PAGE_SIZE) + 1)
+
+    def page(self, rows: Sequence[Row], limit: int) -> tuple[list[Row], str | None]:
+        """Trim rows from ``paginate`` to limit; return them and the next cursor."""
+
+        limit = min(limit, MAX_PAGE_SIZE)
+        if len(rows) <= limit:
+            return list(rows), None
+        rows = rows[:limit]
+        return list(rows), self.encode(*rows[-1][-len(self.columns) :])
+
+
+__all__ = [
+    "InvalidCursorError",
+    "Keyset",
+    "MAX_PAGE_SIZE",
+    "decode_cursor",
+    "encode_cursor",
+]
@@ -0,0 +1,119 @@
+"""Short-lived, HMAC-signed backend session tokens."""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import hmac
+import json
+import time
+from functools import lru_cache
+
+from app.config import settings
+from app.services.users import UserIdentity
+
+SESSION_TOKEN_PREFIX = "vs1."
+
+
+class SessionTokenError(Exception):
+    """Base error for session tokens that cannot be accepted."""
+
+
+class InvalidSessionTokenError(SessionTokenError):
+    """Raised when a session token is malformed or its signature is wrong."""
+
+
+class ExpiredSessionTokenError(SessionTokenError):
+    """Raised when a correctly signed session token has expired."""
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+class SessionTokenSigner:
+    """Issue and verify tokens that carry a UserIdentity.
+
+    Verifying one costs a single HMAC-SHA256, so requests presenting a session
+    token skip both the Firebase RSA check and the users-table lookup. Tokens
+    are not revocable; keep the TTL short so deactivations take effect soon.
+    """
+
+    def __init__(self, secret: str, ttl_seconds: int) -> None:
+        self._key = secret.encode()
+        self._ttl_seconds = ttl_seconds
+
+    @staticmethod
+    def is_session_token(token: str) -> bool:
+        return token.startswith(SESSION_TOKEN_PREFIX)
+
+    def issue(self, identity: UserIdentity) -> tuple[str, int]:
+        """Return a signed token for identity and its expiry (epoch seconds)."""
+
+        expires_at = int(time.time()) + self._ttl_seconds
+        claims = {
+            "uid": identity.id,
+            "email": identity.email,
+            "name": identity.full_name,
+            "act": identity.is_active,
+            "exp": expires_at,
+        }
+        body = _b64encode(json.dumps(claims, separators=(",", ":")).encode())
+        return f"{SESSION_TOKEN_PREFIX}{body}.{self._sign(body)}", expires_at
+
+    def verify(self, token: str) -> UserIdentity:
+        """Return the identity carried by token after checking signature and expiry."""
+
+        if not self.is_session_token(token):
+            raise InvalidSessionTokenError("Not a session token.")
+
+        body, _, signature = token[len(SESSION_TOKEN_PREFIX) :].partition(".")
+        expected = self._sign(body)
+        if not body or not hmac.compare_digest(signature.encode(), expected.encode()):
+            raise InvalidSessionTokenError("Session token signature mismatch.")
+
+        try:
+            claims = json.loads(_b64decode(body))
+            identity = UserIdentity(
+                id=int(claims["uid"]),
+                email=str(claims["email"]),
+                full_name=claims.get("name"),
+                is_active=bool(claims["act"]),
+            )
+            expires_at = int(claims["exp"])
+        except (ValueError, KeyError, TypeError) as exc:
+            raise InvalidSessionTokenError("Malformed session token.") from exc
+
+        if expires_at <= time.time():
+            raise ExpiredSessionTokenError("Session token has expired.")
+
+        return identity
+
+    def _sign(self, body: str) -> str:
+        digest = hmac.new(self._key, body.encode(), hashlib.sha256).digest()
+        return _b64encode(digest)
+
+
+@lru_cache(maxsize=1)
+def get_session_token_signer() -> SessionTokenSigner | None:
+    """Return the configured signer, or None when session mode is disabled."""
+
+    if not settings.session_token_secret:
+        return None
+    return SessionTokenSigner(
+        settings.session_token_secret, settings.session_token_ttl_seconds
+    )
+
+
+__all__ = [
+    "ExpiredSessionTokenError",
+    "InvalidSessionTokenError",
+    "SESSION_TOKEN_PREFIX",
+    "SessionTokenError",
+    "SessionTokenSigner",
+    "get_session_token_signer",
+]
@@ -0,0 +1,376 @@
+"""Buffered, group-committed writer for the swipe event log."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import itertools
+import logging
+from collections import deque
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
+from typing import NamedTuple
+
+from sqlalchemy import column, func, select, table, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import settings
+from app.database.postgres import async_session_factory, read_your_writes
+from app.models.dismissedopportunities import DismissedOpportunity
+from app.models.opportunities import Opportunity
+from app.models.swipeevents import SwipeDirection, SwipeEvent
+from app.services.counters import increment_save_counts
+from app.services.opportunity import insert_saved_opportunities
+
+logger = logging.getLogger(__name__)
+
+_STAGING_TABLE = "swipe_event_staging"
+_STAGED_COLUMNS = ("user_id", "api_id", "direction", "swiped_at")
+_CREATE_STAGING_TABLE = text(
+    f"""
+    CREATE TEMP TABLE IF NOT EXISTS {_STAGING_TABLE} (
+        user_id bigint NOT NULL,
+        api_id bigint NOT NULL,
+        direction swipe_direction NOT NULL,
+        swiped_at timestamp NOT NULL
+    ) ON COMMIT DELETE ROWS
+    """
+)
+_staging = table(_STAGING_TABLE, *(column(name) for name in _STAGED_COLUMNS))
+
+
+class SwipeBufferFullError(RuntimeError):
+    """Raised when the buffer stays full past the enqueue timeout."""
+
+
+class SwipeRecord(NamedTuple):
+    user_id: int
+    api_id: int
+    direction: str
+    swiped_at: datetime
+
+
+def swipe_record(
+    user_id: int, api_id: int, direction: SwipeDirection, swiped_at: datetime | None
+) -> SwipeRecord:
+    """Build a buffer record, storing swiped_at as naive UTC like created_at."""
+
+    if swiped_at is None:
+        swiped_at = datetime.now(timezone.utc)
+    if swiped_at.tzinfo is not None:
+        swiped_at = swiped_at.astimezone(timezone.utc).replace(tzinfo=None)
+    return SwipeRecord(user_id, api_id, direction.value, swiped_at)
+
+
+def _build_flush_statement():
+    logged = (
+        pg_insert(SwipeEvent)
+        .from_select(
+            ["user_id", "opportunity_id", "direction", "swiped_at"],
+            select(
+                _staging.c.user_id,
+                Opportunity.id,
+                _staging.c.direction,
+                _staging.c.swiped_at,
+            ).join(Opportunity, Opportunity.api_id == _staging.c.api_id),
+        )
+        .returning(SwipeEvent.user_id, SwipeEvent.opportunity_id, SwipeEvent.direction)
+        .cte("logged")
+    )
+
+    def swiped(direction: SwipeDirection):
+        return (
+            select(logged.c.user_id, logged.c.opportunity_id)
+            .where(logged.c.direction == direction)
+            .distinct()
+        )
+
+    dismissed = (
+        pg_insert(DismissedOpportunity)
+        .from_select(["user_id", "opportunity_id"], swiped(SwipeDirection.left))
+        .on_conflict_do_nothing(
+            index_elements=[
+                DismissedOpportunity.user_id,
+                DismissedOpportunity.opportunity_id,
+            ]
+        )
+        .returning(DismissedOpportunity.user_id)
+        .cte("dismissed")
+    )
+    saved = insert_saved_opportunities(swiped(SwipeDirection.right).cte("liked"))
+    counted = increment_save_counts(saved)
+    return select(
+        *(
+            select(func.count()).select_from(cte).scalar_subquery()
+            for cte in (logged, dismissed, counted)
+        )
+    )
+
+
+# Logs the batch and projects left swipes into dismissed_opportunities and
+# right swipes into saved_opportunities (stamped and versioned like explicit
+# saves) and the save counters, all in one statement.
+_FLUSH = _build_flush_statement()
+
+
+class SwipeEventWriter:
+    """Accept swipes into a bounded buffer and write them in batches.
+
+    A background task flushes every ``flush_interval_seconds`` or as soon as
+    ``batch_size`` events are waiting, whichever comes first: the batch is
+    COPYed into a temp staging table and moved into ``swipe_events`` by a
+    single statement. When the buffer holds ``capacity`` events, producers
+    wait for a flush to free room and give up after ``enqueue_timeout_seconds``.
+    Events leave the buffer only once their batch has committed, so a failed
+    flush is retried and ``stop`` drains what is left. Flushes that fail while
+    the database is unreachable are retried indefinitely; any other failure is
+    retried ``max_flush_attempts`` times, then the batch is halved until the
+    bad events are isolated and dropped (logged as a dead letter), so one
+    unwritable event cannot wedge the buffer.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        *,
+        capacity: int,
+        batch_size: int,
+        flush_interval_seconds: float,
+        enqueue_timeout_seconds: float,
+        drain_timeout_seconds: float,
+        max_flush_attempts: int,
+    ) -> None:
+        self._session_factory = session_factory
+        self._capacity = capacity
+        self._batch_size = batch_size
+        self._flush_interval_seconds = flush_interval_seconds
+        self._enqueue_timeout_seconds = enqueue_timeout_seconds
+        self._drain_timeout_seconds = drain_timeout_seconds
+        self._max_flush_attempts = max_flush_attempts
+        # Shrinks below batch_size while isolating an event that fails to write.
+        self._batch_limit = batch_size
+        self._failed_attempts = 0
+        self._unreachable = False
+        self._pending: deque[SwipeRecord] = deque()
+        self._space = asyncio.Condition()
+        self._flush_now = asyncio.Event()
+        self._closing = False
+        self._task: asyncio.Task[None] | None = None
+        self._partitions_month: date | None = None
+        self.accepted = 0
+        self.rejected = 0
+        self.written = 0
+        self.flushes = 0
+        self.failed_flushes = 0
+        self.dead_lettered = 0
+
+    def start(self) -> None:
+        if self._task is None:
+            self._closing = False
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Flush everything still buffered, waiting at most the drain timeout."""
+
+        if self._task is None:
+            return
+        self._closing = True
+        self._flush_now.set()
+        try:
+            await asyncio.wait_for(self._task, self._drain_timeout_seconds)
+        except asyncio.TimeoutError:
+            pass
+        self._task = None
+        if self._pending:
+            logger.error(
+                "Dropped %d buffered swipe events on shutdown.", len(self._pending)
+            )
+
+    async def submit(self, records: list[SwipeRecord]) -> None:
+        """Buffer records, waiting for room; raise SwipeBufferFullError on timeout."""
+
+        needed = len(records)
+        async with self._space:
+            if self._closing or needed > self._capacity:
+                self.rejected += needed
+                raise SwipeBufferFullError("Swipe event buffer is not accepting events.")
+            try:
+                await asyncio.wait_for(
+                    self._space.wait_for(
+                        lambda: self._capacity - len(self._pending) >= needed
+                    ),
+                    self._enqueue_timeout_seconds,
+                )
+            except asyncio.TimeoutError:
+                self.rejected += needed
+                raise SwipeBufferFullError("Swipe event buffer is full.") from None
+            self._pending.extend(records)
+            self.accepted += needed
+        # The batch lands within a flush interval, well inside the window.
+        read_your_writes.mark_write(*{record.user_id for record in records})
+        if len(self._pending) >= self._batch_size:
+            self._flush_now.set()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "pending": len(self._pending),
+            "capacity": self._capacity,
+            "accepted": self.accepted,
+            "rejected": self.rejected,
+            "written": self.written,
+            "flushes": self.flushes,
+            "failed_flushes": self.failed_flushes,
+            "dead_lettered": self.dead_lettered,
+        }
+
+    async def _run(self) -> None:
+        while not (self._closing and not self._pending):
+            if not self._closing and len(self._pending) < self._batch_size:
+                with contextlib.suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(
+                        self._flush_now.wait(), self._flush_interval_seconds
+                    )
+                self._flush_now.clear()
+            if self._pending and not await self._flush():
+                if self._closing and self._unreachable:
+                    return
+                await asyncio.sleep(self._flush_interval_seconds)
+
+    async def _flush(self) -> bool:
+        # Submitters only append, so the head of the deque is stable until
+        # this batch is popped after its commit.
+        batch = list(itertools.islice(self._pending, self._batch_limit))
+        # created_at, the partition key, is stamped in UTC.
+        today = datetime.now(timezone.utc).date()
+        try:
+            if self._partitions_month != today.replace(day=1):
+                await self._ensure_partitions(today)
+            async with self._session_factory(info={"route": "swipe-events"}) as session:
+                async with session.begin():
+                    connection = await session.connection()
+                    await connection.execute(_CREATE_STAGING_TABLE)
+                    raw_connection = await connection.get_raw_connection()
+                    await raw_connection.driver_connection.copy_records_to_table(
+                        _STAGING_TABLE, records=batch, columns=list(_STAGED_COLUMNS)
+                    )
+                    logged, _, _ = (await connection.execute(_FLUSH)).one()
+        except Exception as exc:
+            self.failed_flushes += 1
+            self._unreachable = _is_unreachable(exc)
+            if self._unreachable:
+                logger.error(
+                    "Writing %d swipe events failed; will retry.",
+                    len(batch),
+                    exc_info=True,
+                )
+                return False
+            return await self._handle_failed_batch(batch)
+
+        await self._pop(batch)
+        self._failed_attempts = 0
+        self._batch_limit = min(self._batch_limit * 2, self._batch_size)
+        self.flushes += 1
+        self.written += logged
+        return True
+
+    async def _handle_failed_batch(self, batch: list[SwipeRecord]) -> bool:
+        """Retry, split or dead-letter a batch the database rejected.
+
+        Returns True when the buffer moved on, so the next flush need not wait.
+        """
+
+        self._failed_attempts += 1
+        if self._failed_attempts < self._max_flush_attempts:
+            logger.error(
+                "Writing %d swipe events failed; will retry.", len(batch), exc_info=True
+            )
+            return False
+
+        self._failed_attempts = 0
+        if len(batch) > 1:
+            self._batch_limit = len(batch) // 2
+            logger.error(
+                "Writing %d swipe events failed %d times; retrying in batches of %d.",
+                len(batch),
+                self._max_flush_attempts,
+                self._batch_limit,
+                exc_info=True,
+            )
+            return False
+
+        logger.error(
+            "Dropping swipe event after %d failed writes: %r",
+            self._max_flush_attempts,
+            batch[0],
+            exc_info=True,
+        )
+        await self._pop(batch)
+        self.dead_lettered += 1
+        return True
+
+    async def _pop(self, batch: list[SwipeRecord]) -> None:
+        async with self._space:
+            for _ in batch:
+                self._pending.popleft()
+            self._space.notify_all()
+
+    async def _ensure_partitions(self, today: date) -> None:
+        """Create this month's and next month's partitions if missing."""
+
+        this_month = today.replace(day=1)
+        next_month = _next_month(this_month)
+        after_next = _next_month(next_month)
+        for start, end in ((this_month, next_month), (next_month, after_next)):
+            name = f"swipe_events_y{start.year}m{start.month:02d}"
+            try:
+                async with self._session_factory() as session:
+                    async with session.begin():
+                        await session.execute(
+                            text(
+                                f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF "
+                                f"swipe_events FOR VALUES FROM ('{start}') TO ('{end}')"
+                            )
+                        )
+            except DBAPIError:
+                # Usually rows for that month already sit in the default
+                # partition; they stay there and new rows keep going there.
+                logger.warning("Could not create partition %s.", name, exc_info=True)
+        self._partitions_month = this_month
+
+
+def _is_unreachable(exc: Exception) -> bool:
+    """Whether a flush failed for lack of a database rather than bad events."""
+
+    return isinstance(exc, OSError) or (
+        isinstance(exc, DBAPIError) and exc.connection_invalidated
+    )
+
+
+def _next_month(month: date) -> date:
+    return (month.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+@lru_cache(maxsize=1)
+def get_swipe_event_writer() -> SwipeEventWriter:
+    """Return the worker-wide swipe event writer."""
+
+    return SwipeEventWriter(
+        async_session_factory,
+        capacity=settings.swipe_buffer_capacity,
+        batch_size=settings.swipe_flush_batch_size,
+        flush_interval_seconds=settings.swipe_flush_interval_ms / 1000,
+        enqueue_timeout_seconds=settings.swipe_enqueue_timeout_seconds,
+        drain_timeout_seconds=settings.swipe_drain_timeout_seconds,
+        max_flush_attempts=settings.swipe_flush_max_attempts,
+    )
+
+
+__all__ = [
+    "SwipeBufferFullError",
+    "SwipeEventWriter",
+    "SwipeRecord",
+    "get_swipe_event_writer",
+    "swipe_record",
+]
@@ -2,17 +2,103 @@
 
 from __future__ import annotations
 
-from sqlalchemy import select
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any
+
+from sqlalchemy import event, inspect, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
 
+from app.config import settings
+from app.database.postgres import release_connection
 from app.models.user import User
+from app.services.cache import ExpiringLRUCache
+
+_CHANGED_USER_EMAILS_KEY = "changed_user_emails"
+
+
+@dataclass(frozen=True, slots=True)
+class UserIdentity:
+    """The user columns needed to authorize a request."""
+
+    id: int
+    email: str
+    full_name: str | None
+    is_active: bool
+
+    @classmethod
+    def from_user(cls, user: User) -> UserIdentity:
+        return cls(
+            id=user.id,
+            email=user.email,
+            full_name=user.full_name,
+            is_active=user.is_active,
+        )
+
+    def to_user(self) -> User:
+        """Build a transient User carrying only the identity columns."""
+
+        return User(
+            id=self.id,
+            email=self.email,
+            full_name=self.full_name,
+            is_active=self.is_active,
+        )
+
+
+IdentityCache = ExpiringLRUCache[str, UserIdentity]
+
+
+@lru_cache(maxsize=1)
+def get_user_identity_cache() -> IdentityCache:
+    """Return the worker-wide email -> UserIdentity cache."""
+
+    return ExpiringLRUCache(maxsize=settings.user_identity_cache_size)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changed_user_emails(session: Session, _flush_context: Any) -> None:
+    """Remember which users were updated or deleted in this transaction."""
+
+    emails: set[str] = session.info.setdefault(_CHANGED_USER_EMAILS_KEY, set())
+    for instance in (*session.dirty, *session.deleted):
+        if isinstance(instance, User):
+            emails.add(instance.email)
+            emails.update(inspect(instance).attrs.email.history.deleted or ())
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_user_identities(session: Session) -> None:
+    """Drop cached identities once name/active changes are committed.
+
+    Covers sign-up name updates and any deactivation done through the ORM,
+    so no write path has to remember to invalidate the cache itself.
+    """
+
+    emails = session.info.pop(_CHANGED_USER_EMAILS_KEY, None)
+    if not emails:
+        return
+
+    cache = get_user_identity_cache()
+    for email in emails:
+        cache.invalidate(email)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_changed_user_emails(session: Session, _previous_transaction: Any) -> None:
+    session.info.pop(_CHANGED_USER_EMAILS_KEY, None)
 
 
 class UserLookupService:
     """Expose simple read-only helpers for locating users."""
 
-    def __init__(self, session: AsyncSession) -> None:
+    def __init__(
+        self, session: AsyncSession, identity_cache: IdentityCache | None = None
+    ) -> None:
         self._session = session
+        self._identity_cache = identity_cache
 
     async def get_by_email(self, email: str) -> User | None:
         """Return the user that matches the given email (if any)."""
@@ -20,5 +106,31 @@ class UserLookupService:
         result = await self._session.execute(select(User).where(User.email == email))
         return result.scalar_one_or_none()
 
+    async def get_identity_by_email(self, email: str) -> UserIdentity | None:
+        """Return the identity for email, served from cache when possible."""
+
+        if self._identity_cache is not None:
+            identity = self._identity_cache.get(email)
+            if identity is not None:
+                return identity
+
+        user = await self.get_by_email(email)
+        await release_connection(self._session)
+        if user is None:
+            return None
+
+        identity = UserIdentity.from_user(user)
+        if self._identity_cache is not None:
+            self._identity_cache.set(
+                email,
+                identity,
+                expires_at=time.time() + settings.user_identity_cache_ttl_seconds,
+            )
+        return identity
+
 
-__all__ = ["UserLookupService"]
+__all__ = [
+    "UserIdentity",
+    "UserLookupService",
+    "get_user_identity_cache",
+]
@@ -0,0 +1,140 @@
+"""Per-user collection version stamps backing conditional GETs."""
+
+from __future__ import annotations
+
+import enum
+from collections.abc import Iterable
+from typing import Any
+
+from sqlalchemy import BigInteger, literal, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.collectionversions import CollectionVersion
+
+
+class Collection(str, enum.Enum):
+    """Lists whose membership changes bump a version stamp."""
+
+    saved_opportunities = "saved_opportunities"
+    friends = "friends"
+    friend_requests = "friend_requests"
+
+
+def _on_conflict_bump(insert: Any) -> Any:
+    return insert.on_conflict_do_update(
+        index_elements=[CollectionVersion.user_id, CollectionVersion.collection],
+        set_={"version": CollectionVersion.version + 1},
+    )
+
+
+def bump_collection_version(user_id: Any, collection: Collection, name: str) -> Any:
+    """Return a CTE bumping collection for every user in the user_id column.
+
+    user_id is a column of a CTE written by the same statement; attach the
+    result with ``add_cte`` so the stamp changes in the write's transaction.
+    No rows means no bump. The CTE returns each user's new ``version``; the
+    bumped row stays locked until commit, so a user's versions are handed
+    out in commit order.
+    """
+    # Sorted so concurrent bumps lock rows in the same order.
+    rows = (
+        select(user_id, literal(collection.value), literal(1, BigInteger))
+        .distinct()
+        .order_by(user_id)
+    )
+    insert = pg_insert(CollectionVersion).from_select(
+        ["user_id", "collection", "version"], rows
+    )
+    return (
+        _on_conflict_bump(insert)
+        .returning(CollectionVersion.user_id, CollectionVersion.version)
+        .cte(name)
+    )
+
+
+async def bump_collection_versions(
+    session: AsyncSession, changes: Iterable[tuple[int, Collection]]
+) -> None:
+    """Bump each (user_id, collection) in the session's open transaction."""
+
+    # Sorted so concurrent bumps lock rows in the same order.
+    pairs = sorted({(user_id, collection.value) for user_id, collection in changes})
+    if not pairs:
+        return
+    insert = pg_insert(CollectionVersion).values(
+        [
+            {"user_id": user_id, "collection": collection, "version": 1}
+            for user_id, collection in pairs
+        ]
+    )
+    await session.execute(_on_conflict_bump(insert))
+
+
+async def get_collection_version(
+    session: AsyncSession, user_id: int, collection: Collection
+) -> int:
+    """Return the collection's version for user_id; 0 if never written."""
+
+    stmt = select(CollectionVersion.version).where(
+        CollectionVersion.user_id == user_id,
+        CollectionVersion.collection == collection.value,
+    )
+    version = (await session.execute(stmt)).scalar_one_or_none()
+    return version or 0
+
+
+async def session_caught_up_to(
+    read_session: AsyncSession,
+    primary_session: AsyncSession,
+    user_id: int,
+    collection: Collection,
+    version: int,
+) -> AsyncSession:
+    """Return read_session if it has seen version of the collection, else the primary.
+
+    Versions are read from the primary; a list served under a version's ETag
+    must not come from a replica still behind it, or the client would cache
+    the stale list as current.
+    """
+
+    if read_session is primary_session:
+        return read_session
+    if await get_collection_version(read_session, user_id, collection) >= version:
+        return read_session
+    return primary_session
+
+
+def collection_etag(
+    user_id: int, collection: Collection, version: int, variant: str | None = None
+) -> str:
+    """Return the strong ETag for a collection version.
+
+    variant tells apart other representations of the same list, which must
+    not share its ETag.
+    """
+
+    suffix = f".{variant}" if variant else ""
+    return f'"{collection.value}.{user_id}.{version}{suffix}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Return whether an If-None-Match header value matches etag."""
+
+    if not if_none_match:
+        return False
+    candidates = {
+        candidate.strip().removeprefix("W/") for candidate in if_none_match.split(",")
+    }
+    return "*" in candidates or etag in candidates
+
+
+__all__ = [
+    "Collection",
+    "bump_collection_version",
+    "bump_collection_versions",
+    "collection_etag",
+    "etag_matches",
+    "get_collection_version",
+    "session_caught_up_to",
+]
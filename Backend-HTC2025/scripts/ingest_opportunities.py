@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""Run one opportunity ingestion pass and print its stats."""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.config import settings  # noqa: E402
+from app.database.postgres import async_session_factory, engine  # noqa: E402
+from app.integrations.volunteerconnector import (  # noqa: E402
+    get_volunteer_connector_client,
+)
+from app.services.ingestion import (  # noqa: E402
+    OpportunityIngestionService,
+    ingestion_lock,
+)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Mirror volunteerconnector opportunities into Postgres once."
+    )
+    parser.add_argument(
+        "--postal-code",
+        action="append",
+        dest="postal_codes",
+        help="Region to crawl; repeatable. Defaults to INGESTION_POSTAL_CODES.",
+    )
+    parser.add_argument(
+        "--distance",
+        type=int,
+        default=settings.ingestion_distance_km,
+        help="Search radius in km around each postal code (default: %(default)s).",
+    )
+    return parser.parse_args()
+
+
+async def run(postal_codes: list[str], distance: int) -> None:
+    client = get_volunteer_connector_client()
+    service = OpportunityIngestionService(client, async_session_factory)
+    try:
+        async with ingestion_lock(engine) as acquired:
+            if not acquired:
+                print("Another process is already ingesting; skipped.", file=sys.stderr)
+                return
+            stats = await service.ingest(postal_codes, distance)
+    finally:
+        await client.aclose()
+    print(json.dumps(stats.as_dict(), indent=2))
+
+
+def main() -> int:
+    args = parse_args()
+    postal_codes = args.postal_codes or settings.ingestion_postal_codes
+    if not postal_codes:
+        print("No postal codes given.", file=sys.stderr)
+        return 1
+    asyncio.run(run(postal_codes, args.distance))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
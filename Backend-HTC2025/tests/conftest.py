@@ -0,0 +1,200 @@
+"""Shared fixtures: a signing key and stub Firebase and search servers."""
+
+from __future__ import annotations
+
+import datetime
+import json
+import os
+import threading
+import time
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+# app.config reads these at import time; tests never open a connection.
+os.environ.setdefault("DATABASE_URL", "postgresql+asyncpg://localhost/test")
+os.environ.setdefault("FIREBASE_SERVICE_ACCOUNT_JSON", "{}")
+
+from cryptography import x509  # noqa: E402
+from cryptography.hazmat.primitives import hashes, serialization  # noqa: E402
+from cryptography.hazmat.primitives.asymmetric import rsa  # noqa: E402
+from cryptography.x509.oid import NameOID  # noqa: E402
+from google.auth import crypt, jwt  # noqa: E402
+
+PROJECT_ID = "demo-project"
+
+
+class SigningKey:
+    """An RSA key with the self-signed certificate Firebase would publish."""
+
+    def __init__(self, kid: str) -> None:
+        self.kid = kid
+        key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, kid)])
+        now = datetime.datetime.now(datetime.timezone.utc)
+        self.certificate = (
+            x509.CertificateBuilder()
+            .subject_name(name)
+            .issuer_name(name)
+            .public_key(key.public_key())
+            .serial_number(x509.random_serial_number())
+            .not_valid_before(now - datetime.timedelta(days=1))
+            .not_valid_after(now + datetime.timedelta(days=1))
+            .sign(key, hashes.SHA256())
+            .public_bytes(serialization.Encoding.PEM)
+            .decode()
+        )
+        private_pem = key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        ).decode()
+        self._signer = crypt.RSASigner.from_string(private_pem, kid)
+
+    def mint(self, **overrides: Any) -> str:
+        """Return an ID token signed by this key; overrides replace claims."""
+
+        issued_at = int(time.time())
+        claims = {
+            "iss": f"https://securetoken.google.com/{PROJECT_ID}",
+            "aud": PROJECT_ID,
+            "sub": "uid-ada",
+            "email": "ada@example.com",
+            "iat": issued_at,
+            "exp": issued_at + 3600,
+            **overrides,
+        }
+        return jwt.encode(self._signer, claims).decode()
+
+
+class KeyServer:
+    """Serves certificates like Google's x509 endpoint, or 503s when down."""
+
+    def __init__(self) -> None:
+        self.certs: dict[str, str] = {}
+        self.available = True
+        self.fetches = 0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                server.fetches += 1
+                if not server.available:
+                    self.send_error(503)
+                    return
+                body = json.dumps(server.certs).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Cache-Control", "public, max-age=3600")
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self._httpd.server_address[1]}/certs"
+
+    def publish(self, *keys: SigningKey) -> None:
+        self.certs = {key.kid: key.certificate for key in keys}
+
+    def serve(self) -> None:
+        threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+
+    def close(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+class SearchServer:
+    """Serves volunteerconnector-style pages, tracking concurrent requests."""
+
+    def __init__(
+        self, total: int, page_size: int, delay_seconds: float = 0.05
+    ) -> None:
+        self.total = total
+        self.page_size = page_size
+        self.delay_seconds = delay_seconds
+        self.failing_pages: set[int] = set()
+        self.requested_pages: list[int] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                query = parse_qs(urlparse(self.path).query)
+                page = int(query.get("page", ["1"])[0])
+                with lock:
+                    server.requested_pages.append(page)
+                    server.in_flight += 1
+                    server.max_in_flight = max(server.max_in_flight, server.in_flight)
+                try:
+                    time.sleep(server.delay_seconds)
+                    if page in server.failing_pages:
+                        self.send_error(500)
+                        return
+                    body = json.dumps(server.page(page)).encode()
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/json")
+                    self.end_headers()
+                    self.wfile.write(body)
+                finally:
+                    with lock:
+                        server.in_flight -= 1
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self._httpd.server_address[1]}/api/search/"
+
+    def page(self, page: int) -> dict[str, Any]:
+        start = (page - 1) * self.page_size
+        end = min(start + self.page_size, self.total)
+        return {
+            "count": self.total,
+            "next": f"{self.url}?page={page + 1}" if end < self.total else None,
+            "results": [
+                {"id": index, "title": f"Opportunity {index}"}
+                for index in range(start, end)
+            ],
+        }
+
+    def serve(self) -> None:
+        threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+
+    def close(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+@pytest.fixture(scope="session")
+def signing_key() -> SigningKey:
+    return SigningKey("key-1")
+
+
+@pytest.fixture
+def key_server(signing_key: SigningKey) -> Iterator[KeyServer]:
+    server = KeyServer()
+    server.publish(signing_key)
+    server.serve()
+    yield server
+    server.close()
+
+
+@pytest.fixture
+def search_server() -> Iterator[SearchServer]:
+    server = SearchServer(total=23, page_size=5)
+    server.serve()
+    yield server
+    server.close()
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    return "asyncio"
@@ -0,0 +1,189 @@
+"""Local Firebase ID token verification against a stub key server."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import AsyncIterator
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from fastapi import Depends, FastAPI
+
+from app.dependencies.auth import get_auth_service, get_current_identity
+from app.integrations.firebase import (
+    FirebaseAuthClient,
+    FirebasePublicKeyStore,
+    FirebasePublicKeysUnavailableError,
+    FirebaseTokenVerificationError,
+)
+from app.services.auth import AuthService, AuthUnavailableError
+from app.services.users import UserIdentity
+
+from .conftest import PROJECT_ID, KeyServer, SigningKey
+
+pytestmark = pytest.mark.anyio
+
+
+class StubUserLookup:
+    async def get_identity_by_email(self, email: str) -> UserIdentity:
+        return UserIdentity(id=1, email=email, full_name="Ada", is_active=True)
+
+
+@pytest.fixture
+async def key_store(key_server: KeyServer) -> AsyncIterator[FirebasePublicKeyStore]:
+    executor = ThreadPoolExecutor(max_workers=2)
+    store = FirebasePublicKeyStore(
+        key_server.url,
+        executor=executor,
+        refresh_margin_seconds=300,
+        retry_seconds=30,
+    )
+    await store.start()
+    yield store
+    await store.stop()
+    executor.shutdown()
+
+
+@pytest.fixture
+def client(key_store: FirebasePublicKeyStore) -> FirebaseAuthClient:
+    return FirebaseAuthClient(
+        SimpleNamespace(project_id=PROJECT_ID),  # type: ignore[arg-type]
+        key_store=key_store,
+        executor=ThreadPoolExecutor(max_workers=2),
+    )
+
+
+async def _wait_for_fetches(key_server: KeyServer, count: int) -> None:
+    deadline = time.monotonic() + 5
+    while key_server.fetches < count:
+        assert time.monotonic() < deadline, "key store never refreshed"
+        await asyncio.sleep(0.01)
+
+
+async def test_valid_token_returns_claims(
+    client: FirebaseAuthClient, signing_key: SigningKey
+) -> None:
+    claims = await client.verify_token_async(signing_key.mint())
+
+    assert claims["email"] == "ada@example.com"
+    assert claims["uid"] == "uid-ada"
+
+
+@pytest.mark.parametrize(
+    "claims",
+    [
+        {"aud": "other-project"},
+        {"iss": "https://securetoken.google.com/other-project"},
+        {"iss": "https://accounts.google.com"},
+        {"sub": ""},
+    ],
+    ids=["wrong-aud", "wrong-iss-project", "wrong-iss", "empty-sub"],
+)
+async def test_token_for_another_project_is_rejected(
+    client: FirebaseAuthClient, signing_key: SigningKey, claims: dict[str, str]
+) -> None:
+    with pytest.raises(FirebaseTokenVerificationError):
+        await client.verify_token_async(signing_key.mint(**claims))
+
+
+async def test_expired_token_is_rejected(
+    client: FirebaseAuthClient, signing_key: SigningKey
+) -> None:
+    issued_at = int(time.time()) - 7200
+    token = signing_key.mint(iat=issued_at, exp=issued_at + 3600)
+
+    with pytest.raises(FirebaseTokenVerificationError):
+        await client.verify_token_async(token)
+
+
+async def test_token_signed_by_another_key_is_rejected(
+    client: FirebaseAuthClient, signing_key: SigningKey
+) -> None:
+    forged = SigningKey(signing_key.kid).mint()
+
+    with pytest.raises(FirebaseTokenVerificationError):
+        await client.verify_token_async(forged)
+
+
+async def test_unknown_kid_triggers_refresh(
+    client: FirebaseAuthClient, key_server: KeyServer, signing_key: SigningKey
+) -> None:
+    rotated = SigningKey("key-2")
+    key_server.publish(signing_key, rotated)
+    fetches = key_server.fetches
+
+    with pytest.raises(FirebaseTokenVerificationError):
+        await client.verify_token_async(rotated.mint())
+    await _wait_for_fetches(key_server, fetches + 1)
+
+    claims = await client.verify_token_async(rotated.mint())
+    assert claims["uid"] == "uid-ada"
+
+
+async def test_key_server_down_at_startup(
+    key_server: KeyServer, signing_key: SigningKey
+) -> None:
+    key_server.available = False
+    store = FirebasePublicKeyStore(
+        key_server.url,
+        executor=ThreadPoolExecutor(max_workers=1),
+        refresh_margin_seconds=300,
+        retry_seconds=30,
+    )
+    await store.start()
+    try:
+        client = FirebaseAuthClient(
+            SimpleNamespace(project_id=PROJECT_ID),  # type: ignore[arg-type]
+            key_store=store,
+        )
+        with pytest.raises(FirebasePublicKeysUnavailableError):
+            await client.verify_token_async(signing_key.mint())
+
+        service = AuthService(
+            session=None,  # type: ignore[arg-type]
+            firebase_auth=client,
+            user_lookup=StubUserLookup(),  # type: ignore[arg-type]
+        )
+        with pytest.raises(AuthUnavailableError):
+            await service.authenticate(signing_key.mint())
+
+        app = FastAPI()
+
+        @app.get("/me")
+        async def me(identity: UserIdentity = Depends(get_current_identity)) -> dict:
+            return {"email": identity.email}
+
+        app.dependency_overrides[get_auth_service] = lambda: service
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://test"
+        ) as http:
+            response = await http.get(
+                "/me", headers={"Authorization": f"Bearer {signing_key.mint()}"}
+            )
+            assert response.status_code == 503
+
+            # Once the keys load, the same token is accepted.
+            key_server.available = True
+            await store.refresh()
+            response = await http.get(
+                "/me", headers={"Authorization": f"Bearer {signing_key.mint()}"}
+            )
+            assert response.status_code == 200
+            assert response.json() == {"email": "ada@example.com"}
+    finally:
+        await store.stop()
+
+
+async def test_stop_leaves_no_refresh_tasks_running(
+    key_store: FirebasePublicKeyStore, client: FirebaseAuthClient
+) -> None:
+    client._key_store.request_refresh()
+    tasks = [key_store._refresh_task, key_store._pending_refresh]
+
+    await key_store.stop()
+
+    assert all(task is not None and task.done() for task in tasks)
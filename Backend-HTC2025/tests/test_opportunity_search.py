@@ -0,0 +1,195 @@
+"""Upstream search fan-out and the stale-while-revalidate result cache."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from app.dependencies.auth import get_current_user
+from app.dependencies.opportunity import opportunity_search_service_dependency
+from app.integrations.volunteerconnector import (
+    VolunteerConnectorClient,
+    VolunteerConnectorError,
+)
+from app.routes import opportunity_router
+from app.services.cache import StaleWhileRevalidateCache
+from app.services.opportunity_search import OpportunitySearchService
+
+from .conftest import SearchServer
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def client(
+    search_server: SearchServer,
+) -> AsyncIterator[VolunteerConnectorClient]:
+    client = VolunteerConnectorClient(search_server.url, max_concurrency=3)
+    yield client
+    await client.aclose()
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class CountingLoader:
+    def __init__(self) -> None:
+        self.calls = 0
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def __call__(self) -> str:
+        self.calls += 1
+        await self.release.wait()
+        return f"value-{self.calls}"
+
+
+async def _wait_for_refresh(cache: StaleWhileRevalidateCache) -> None:
+    while cache.stats()["inflight"]:
+        await asyncio.sleep(0)
+
+
+async def test_search_merges_every_page(
+    client: VolunteerConnectorClient, search_server: SearchServer
+) -> None:
+    result = await client.search({"pc": "t3a 5k9"})
+
+    assert result["count"] == 23
+    assert sorted(item["id"] for item in result["results"]) == list(range(23))
+    assert sorted(search_server.requested_pages) == [1, 2, 3, 4, 5]
+
+
+async def test_remaining_pages_are_fetched_concurrently_within_the_limit(
+    client: VolunteerConnectorClient, search_server: SearchServer
+) -> None:
+    await client.search({"pc": "t3a 5k9"})
+
+    assert search_server.max_in_flight == 3
+
+
+async def test_iter_pages_yields_every_page(
+    client: VolunteerConnectorClient,
+) -> None:
+    pages = [page async for page in client.iter_pages({"pc": "t3a 5k9"})]
+
+    assert len(pages) == 5
+    assert sorted(item["id"] for page in pages for item in page) == list(range(23))
+
+
+async def test_failed_page_raises(
+    client: VolunteerConnectorClient, search_server: SearchServer
+) -> None:
+    search_server.failing_pages.add(4)
+
+    with pytest.raises(VolunteerConnectorError, match="page 4"):
+        await client.search({"pc": "t3a 5k9"})
+
+
+async def test_upstream_failure_is_a_bad_gateway(
+    client: VolunteerConnectorClient, search_server: SearchServer
+) -> None:
+    search_server.failing_pages.add(1)
+    service = OpportunitySearchService(
+        client,
+        StaleWhileRevalidateCache(8, ttl_seconds=300, stale_seconds=1800),
+    )
+    app = FastAPI()
+    app.include_router(opportunity_router)
+    app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(id=1)
+    app.dependency_overrides[opportunity_search_service_dependency] = lambda: service
+
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test"
+    ) as http:
+        response = await http.get(
+            "/opportunities/search", params={"postal_code": "T3A 5K9"}
+        )
+        assert response.status_code == 502
+
+        search_server.failing_pages.clear()
+        response = await http.get(
+            "/opportunities/search", params={"postal_code": "T3A 5K9"}
+        )
+        assert response.status_code == 200
+        assert response.json()["count"] == 23
+
+
+async def test_fresh_entry_is_served_from_cache() -> None:
+    clock = Clock()
+    cache = StaleWhileRevalidateCache(8, ttl_seconds=10, stale_seconds=60, clock=clock)
+    loader = CountingLoader()
+
+    assert await cache.get_or_load("key", loader) == "value-1"
+    clock.now = 9
+    assert await cache.get_or_load("key", loader) == "value-1"
+
+    assert loader.calls == 1
+    assert cache.stats()["hits"] == 1
+
+
+async def test_stale_entry_is_served_while_refreshing() -> None:
+    clock = Clock()
+    cache = StaleWhileRevalidateCache(8, ttl_seconds=10, stale_seconds=60, clock=clock)
+    loader = CountingLoader()
+    await cache.get_or_load("key", loader)
+
+    clock.now = 30
+    loader.release.clear()
+    assert await cache.get_or_load("key", loader) == "value-1"
+    assert cache.stats()["stale_hits"] == 1
+    assert cache.stats()["inflight"] == 1
+
+    loader.release.set()
+    await _wait_for_refresh(cache)
+    assert await cache.get_or_load("key", loader) == "value-2"
+    assert loader.calls == 2
+
+
+async def test_entry_past_the_stale_window_is_reloaded() -> None:
+    clock = Clock()
+    cache = StaleWhileRevalidateCache(8, ttl_seconds=10, stale_seconds=60, clock=clock)
+    loader = CountingLoader()
+    await cache.get_or_load("key", loader)
+
+    clock.now = 71
+    assert await cache.get_or_load("key", loader) == "value-2"
+    assert cache.stats()["stale_hits"] == 0
+
+
+async def test_concurrent_misses_share_one_load() -> None:
+    cache = StaleWhileRevalidateCache(8, ttl_seconds=10, stale_seconds=60)
+    loader = CountingLoader()
+    loader.release.clear()
+
+    waiters = [
+        asyncio.ensure_future(cache.get_or_load("key", loader)) for _ in range(5)
+    ]
+    await asyncio.sleep(0)
+    loader.release.set()
+
+    assert await asyncio.gather(*waiters) == ["value-1"] * 5
+    assert loader.calls == 1
+
+
+async def test_failed_refresh_keeps_serving_the_stale_value() -> None:
+    clock = Clock()
+    cache = StaleWhileRevalidateCache(8, ttl_seconds=10, stale_seconds=60, clock=clock)
+    await cache.get_or_load("key", CountingLoader())
+
+    async def failing_loader() -> str:
+        raise VolunteerConnectorError("upstream down")
+
+    clock.now = 30
+    assert await cache.get_or_load("key", failing_loader) == "value-1"
+    await _wait_for_refresh(cache)
+    assert await cache.get_or_load("key", failing_loader) == "value-1"
@@ -0,0 +1,78 @@
+"""The read-your-writes cookie pins a writer's reads on every worker."""
+
+from __future__ import annotations
+
+import httpx
+import pytest
+from fastapi import FastAPI, Request
+
+from app.database.postgres import ReadYourWritesGuard, ReadYourWritesMiddleware
+
+pytestmark = pytest.mark.anyio
+
+
+def _worker(guard: ReadYourWritesGuard) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(ReadYourWritesMiddleware, guard=guard)
+
+    @app.post("/write/{user_id}")
+    async def write(user_id: int) -> dict:
+        guard.mark_write(user_id)
+        return {}
+
+    @app.get("/read/{user_id}")
+    async def read(user_id: int, request: Request) -> dict:
+        return {"primary": guard.requires_primary(request, user_id)}
+
+    return app
+
+
+async def test_write_on_one_worker_pins_reads_on_another() -> None:
+    writer = _worker(ReadYourWritesGuard(5, "secret"))
+    reader = _worker(ReadYourWritesGuard(5, "secret"))
+
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=writer), base_url="http://test"
+    ) as http:
+        response = await http.post("/write/7")
+        cookie = response.cookies[ReadYourWritesGuard.cookie_name]
+        assert (await http.get("/read/7")).json() == {"primary": True}
+
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=reader),
+        base_url="http://test",
+        cookies={ReadYourWritesGuard.cookie_name: cookie},
+    ) as http:
+        assert (await http.get("/read/7")).json() == {"primary": True}
+        assert (await http.get("/read/8")).json() == {"primary": False}
+
+
+def _expired_cookie() -> str:
+    # Signed correctly, but its expiry is long past.
+    return f"1-7.{ReadYourWritesGuard(5, 'secret')._sign('1-7')}"
+
+
+@pytest.mark.parametrize(
+    "cookie",
+    ["", "9999999999-7", "9999999999-7.forged", _expired_cookie()],
+    ids=["empty", "unsigned", "forged", "expired"],
+)
+async def test_invalid_cookie_reads_from_replica(cookie: str) -> None:
+    guard = ReadYourWritesGuard(5, "secret")
+
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=_worker(guard)),
+        base_url="http://test",
+        cookies={ReadYourWritesGuard.cookie_name: cookie},
+    ) as http:
+        assert (await http.get("/read/7")).json() == {"primary": False}
+
+
+async def test_requests_that_do_not_write_set_no_cookie() -> None:
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=_worker(ReadYourWritesGuard(5, "secret"))),
+        base_url="http://test",
+    ) as http:
+        response = await http.get("/read/7")
+
+    assert "set-cookie" not in response.headers
@@ -0,0 +1,146 @@
+"""Swipe event writer retries, splits and dead-letters failing batches."""
+
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from app.schemas.opportunity import SwipeEventSchema
+from app.services.swipes import SwipeEventWriter, SwipeRecord
+
+pytestmark = pytest.mark.anyio
+
+POISON = 13
+
+
+class FakeDatabase:
+    """Session factory whose COPY rejects any batch holding the poison api_id.
+
+    Set ``down`` to fail every flush as if the server were unreachable.
+    """
+
+    def __init__(self) -> None:
+        self.down = False
+        self.written: list[int] = []
+        self.batch_sizes: list[int] = []
+
+    def __call__(self, **_kwargs: Any) -> Any:
+        return self._session()
+
+    @asynccontextmanager
+    async def _session(self):
+        if self.down:
+            raise ConnectionRefusedError("database is down")
+        staged: list[SwipeRecord] = []
+
+        async def copy_records_to_table(_table, *, records, columns):
+            self.batch_sizes.append(len(records))
+            if any(record.api_id == POISON for record in records):
+                raise ValueError("invalid swipe")
+            staged.extend(records)
+
+        async def execute(_statement):
+            return SimpleNamespace(one=lambda: (len(staged), 0, 0))
+
+        async def get_raw_connection():
+            return SimpleNamespace(
+                driver_connection=SimpleNamespace(
+                    copy_records_to_table=copy_records_to_table
+                )
+            )
+
+        connection = SimpleNamespace(
+            execute=execute, get_raw_connection=get_raw_connection
+        )
+
+        async def get_connection():
+            return connection
+
+        @asynccontextmanager
+        async def begin():
+            yield
+            self.written.extend(record.api_id for record in staged)
+
+        yield SimpleNamespace(connection=get_connection, begin=begin, execute=execute)
+
+
+def _writer(database: FakeDatabase) -> SwipeEventWriter:
+    return SwipeEventWriter(
+        database,  # type: ignore[arg-type]
+        capacity=100,
+        batch_size=8,
+        flush_interval_seconds=0.001,
+        enqueue_timeout_seconds=1,
+        drain_timeout_seconds=5,
+        max_flush_attempts=2,
+    )
+
+
+def _records(*api_ids: int) -> list[SwipeRecord]:
+    return [SwipeRecord(1, api_id, "left", datetime(2026, 1, 1)) for api_id in api_ids]
+
+
+async def test_bad_event_is_dead_lettered_and_the_rest_are_written() -> None:
+    database = FakeDatabase()
+    writer = _writer(database)
+    writer.start()
+
+    await writer.submit(_records(*range(1, 21)))
+    await writer.stop()
+
+    assert sorted(database.written) == [n for n in range(1, 21) if n != POISON]
+    assert writer.stats()["dead_lettered"] == 1
+    assert writer.stats()["pending"] == 0
+    assert 1 in database.batch_sizes
+
+
+async def test_batches_grow_back_after_the_bad_event_is_dropped() -> None:
+    database = FakeDatabase()
+    writer = _writer(database)
+    await writer.submit(_records(POISON, *range(20, 36)))
+
+    while writer.stats()["pending"]:
+        await writer._flush()
+
+    # Halved 8 -> 4 -> 2 -> 1 to isolate it, then doubled back after each write.
+    assert database.batch_sizes[-5:] == [1, 2, 4, 8, 1]
+
+
+async def test_unreachable_database_never_drops_events() -> None:
+    database = FakeDatabase()
+    database.down = True
+    writer = _writer(database)
+    await writer.submit(_records(1, 2, 3))
+
+    for _ in range(10):
+        assert not await writer._flush()
+    assert writer.stats()["pending"] == 3
+    assert writer.stats()["dead_lettered"] == 0
+
+    database.down = False
+    assert await writer._flush()
+    assert database.written == [1, 2, 3]
+
+
+@pytest.mark.parametrize("api_id", [-1, 2**63])
+def test_api_id_outside_bigint_is_rejected(api_id: int) -> None:
+    with pytest.raises(ValueError):
+        SwipeEventSchema(api_id=api_id, direction="left")
+
+
+async def test_submit_does_not_block_while_a_batch_is_retried() -> None:
+    database = FakeDatabase()
+    writer = _writer(database)
+    writer.start()
+    await writer.submit(_records(POISON))
+    await asyncio.sleep(0.05)
+
+    await asyncio.wait_for(writer.submit(_records(1)), timeout=1)
+    await writer.stop()
+
+    assert database.written == [1]
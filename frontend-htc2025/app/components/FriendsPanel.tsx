@@ -28,6 +28,7 @@ interface PendingFriendRequest {
 
 interface PendingRequestsResponse {
   pending_requests: PendingFriendRequest | PendingFriendRequest[] | null;
+  next_cursor?: string | null;
 }
 
 async function extractMessageFromResponse(
@@ -61,47 +62,54 @@ async function fetchFriendsFromBackend(user: User): Promise<Friend[]> {
   }
 
   const idToken = await user.getIdToken();
+  const friends: Friend[] = [];
+  let cursor: string | null = null;
+
+  // The backend pages friends; keep following next_cursor until it is null.
+  do {
+    const query: string = cursor ? `?cursor=${encodeURIComponent(cursor)}` : "";
+    const response = await fetch(`${backendBaseUrl}/friends${query}`, {
+      method: "GET",
+      credentials: "include",
+      headers: {
+        Accept: "application/json",
+        Authorization: `Bearer ${idToken}`,
+      },
+    });
 
-  const response = await fetch(`${backendBaseUrl}/friends`, {
-    method: "GET",
-    credentials: "include",
-    headers: {
-      Accept: "application/json",
-      Authorization: `Bearer ${idToken}`,
-    },
-  });
-
-  if (!response.ok) {
-    let message = "Unable to load friends.";
-    try {
-      const data = await response.json();
-      if (typeof data?.message === "string") {
-        message = data.message;
-      }
-    } catch {
-      const fallback = await response.text();
-      if (fallback) {
-        message = fallback;
+    if (!response.ok) {
+      let message = "Unable to load friends.";
+      try {
+        const data = await response.json();
+        if (typeof data?.message === "string") {
+          message = data.message;
+        }
+      } catch {
+        const fallback = await response.text();
+        if (fallback) {
+          message = fallback;
+        }
       }
+      throw new Error(message);
     }
-    throw new Error(message);
-  }
 
-  try {
-    const data = (await response.json()) as FriendsResponse;
-    const friends = data?.friends;
-    if (!friends) {
-      return [];
+    try {
+      const data = (await response.json()) as FriendsResponse;
+      const page = data?.friends;
+      if (page) {
+        friends.push(...(Array.isArray(page) ? page : [page]));
+      }
+      cursor = data?.next_cursor ?? null;
+    } catch (error) {
+      throw new Error(
+        error instanceof Error
+          ? error.message
+          : "Unable to parse friends response."
+      );
     }
+  } while (cursor);
 
-    return Array.isArray(friends) ? friends : [friends];
-  } catch (error) {
-    throw new Error(
-      error instanceof Error
-        ? error.message
-        : "Unable to parse friends response."
-    );
-  }
+  return friends;
 }
 
 async function fetchPendingRequestsFromBackend(user: User): Promise<PendingFriendRequest[]> {
@@ -110,34 +118,41 @@ async function fetchPendingRequestsFromBackend(user: User): Promise<PendingFrien
   }
 
   const idToken = await user.getIdToken();
+  const pending: PendingFriendRequest[] = [];
+  let cursor: string | null = null;
+
+  // The backend pages pending requests; follow next_cursor until it is null.
+  do {
+    const query: string = cursor ? `?cursor=${encodeURIComponent(cursor)}` : "";
+    const response = await fetch(`${backendBaseUrl}/friends/requests/pending${query}`, {
+      method: "GET",
+      credentials: "include",
+      headers: {
+        Accept: "application/json",
+        Authorization: `Bearer ${idToken}`,
+      },
+    });
 
-  const response = await fetch(`${backendBaseUrl}/friends/requests/pending`, {
-    method: "GET",
-    credentials: "include",
-    headers: {
-      Accept: "application/json",
-      Authorization: `Bearer ${idToken}`,
-    },
-  });
-
-  if (!response.ok) {
-    const message = await extractMessageFromResponse(response, "Unable to load pending requests.");
-    throw new Error(message);
-  }
+    if (!response.ok) {
+      const message = await extractMessageFromResponse(response, "Unable to load pending requests.");
+      throw new Error(message);
+    }
 
-  try {
-    const data = (await response.json()) as PendingRequestsResponse;
-    const pending = data?.pending_requests;
-    if (!pending) {
-      return [];
+    try {
+      const data = (await response.json()) as PendingRequestsResponse;
+      const page = data?.pending_requests;
+      if (page) {
+        pending.push(...(Array.isArray(page) ? page : [page]));
+      }
+      cursor = data?.next_cursor ?? null;
+    } catch (error) {
+      throw new Error(
+        error instanceof Error ? error.message : "Unable to parse pending requests response.",
+      );
     }
+  } while (cursor);
 
-    return Array.isArray(pending) ? pending : [pending];
-  } catch (error) {
-    throw new Error(
-      error instanceof Error ? error.message : "Unable to parse pending requests response.",
-    );
-  }
+  return pending;
 }
 
 export function FriendsPanel() {
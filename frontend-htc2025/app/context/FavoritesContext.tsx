@@ -39,6 +39,8 @@ interface SavedOpportunityPayload {
 
 interface SavedOpportunitiesResponse {
   opportunities: SavedOpportunityPayload | SavedOpportunityPayload[] | null;
+  next_cursor?: string | null;
+  has_more?: boolean;
 }
 
 async function extractMessageFromResponse(response: Response, fallback: string) {
@@ -104,30 +106,37 @@ async function fetchSavedOpportunities(user: User): Promise<VolunteerOpportunity
   }
 
   const idToken = await user.getIdToken();
-  const response = await fetch(`${backendBaseUrl}/opportunities/saved`, {
-    method: "GET",
-    headers: {
-      Accept: "application/json",
-      Authorization: `Bearer ${idToken}`,
-    },
-    credentials: "include",
-  });
+  const list: SavedOpportunityPayload[] = [];
+  let since: string | null = null;
+
+  // The backend pages saves; keep following next_cursor until has_more is false.
+  do {
+    const query: string = since ? `?since=${encodeURIComponent(since)}` : "";
+    const response = await fetch(`${backendBaseUrl}/opportunities/saved${query}`, {
+      method: "GET",
+      headers: {
+        Accept: "application/json",
+        Authorization: `Bearer ${idToken}`,
+      },
+      credentials: "include",
+    });
 
-  if (!response.ok) {
-    const message = await extractMessageFromResponse(
-      response,
-      "Unable to load saved opportunities.",
-    );
-    throw new Error(message);
-  }
+    if (!response.ok) {
+      const message = await extractMessageFromResponse(
+        response,
+        "Unable to load saved opportunities.",
+      );
+      throw new Error(message);
+    }
 
-  const data = (await response.json()) as SavedOpportunitiesResponse;
-  const saved = data?.opportunities;
-  if (!saved) {
-    return [];
-  }
+    const data = (await response.json()) as SavedOpportunitiesResponse;
+    const saved = data?.opportunities;
+    if (saved) {
+      list.push(...(Array.isArray(saved) ? saved : [saved]));
+    }
+    since = data?.has_more ? data.next_cursor ?? null : null;
+  } while (since);
 
-  const list = Array.isArray(saved) ? saved : [saved];
   return list.map(mapSavedOpportunityToVolunteerOpportunity);
 }
 
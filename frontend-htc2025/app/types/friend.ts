@@ -7,4 +7,5 @@ export interface Friend {
 
 export interface FriendsResponse {
   friends: Friend | Friend[] | null;
+  next_cursor?: string | null;
 }